@@ -0,0 +1,195 @@
+import argparse
+import itertools
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import mlflow
+import numpy as np
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+from cache_preprocesamiento import obtener_preprocesado
+from datos_compartidos import ArraysCompartidos, abrir_arrays_compartidos
+from metricas_streaming import AcumuladorMetricas
+from mlflow_regression_example import PARAMETROS_SPLIT
+
+FAMILIAS_MODELOS = {
+    'LinearRegression': LinearRegression,
+    'Ridge': Ridge,
+    'Lasso': Lasso
+}
+
+# Arrays compartidos abiertos en cada proceso worker (ver _inicializar_worker)
+_datos_worker = None
+
+def generar_grid(familias=('LinearRegression', 'Ridge', 'Lasso'), alphas=(0.1, 1.0, 10.0, 100.0),
+                 positive=(False, True), escalado=(True, False)):
+    """
+    Genera todas las combinaciones de familia de modelo, alpha, positive y escalado
+    """
+    pruebas = []
+    for familia, es_positivo, con_escalado in itertools.product(familias, positive, escalado):
+        # LinearRegression no tiene alpha
+        alphas_familia = [None] if familia == 'LinearRegression' else alphas
+        for alpha in alphas_familia:
+            pruebas.append({
+                'familia': familia,
+                'alpha': alpha,
+                'positive': es_positivo,
+                'escalado': con_escalado
+            })
+    return pruebas
+
+def generar_aleatorio(n_pruebas, familias=('LinearRegression', 'Ridge', 'Lasso'), alpha_min=1e-3,
+                      alpha_max=1e3, semilla=42):
+    """
+    Genera pruebas aleatorias con alpha muestreado en escala logarítmica
+    """
+    rng = np.random.default_rng(semilla)
+    pruebas = []
+    for _ in range(n_pruebas):
+        familia = familias[rng.integers(len(familias))]
+        alpha = None
+        if familia != 'LinearRegression':
+            alpha = float(10 ** rng.uniform(np.log10(alpha_min), np.log10(alpha_max)))
+        pruebas.append({
+            'familia': familia,
+            'alpha': alpha,
+            'positive': bool(rng.integers(2)),
+            'escalado': bool(rng.integers(2))
+        })
+    return pruebas
+
+def _inicializar_worker(descriptor):
+    global _datos_worker
+    warnings.filterwarnings('ignore')
+    _datos_worker = abrir_arrays_compartidos(descriptor)
+
+def _crear_modelo(prueba):
+    parametros = {'positive': prueba['positive']}
+    if prueba['alpha'] is not None:
+        parametros['alpha'] = prueba['alpha']
+    return FAMILIAS_MODELOS[prueba['familia']](**parametros)
+
+def _evaluar_prueba(indice, prueba):
+    """
+    Entrena y evalúa una prueba sobre los arrays compartidos (se ejecuta en un worker)
+    """
+    sufijo = "_scaled" if prueba['escalado'] else ""
+    X_train = _datos_worker["X_train" + sufijo]
+    X_test = _datos_worker["X_test" + sufijo]
+    y_train = _datos_worker["y_train"]
+    y_test = _datos_worker["y_test"]
+
+    inicio = time.perf_counter()
+    modelo = _crear_modelo(prueba)
+    modelo.fit(X_train, y_train)
+    duracion = time.perf_counter() - inicio
+
+    y_pred = modelo.predict(X_test)
+    metricas = AcumuladorMetricas(semilla=42).actualizar(y_test, y_pred).metricas()
+    metricas['tiempo_entrenamiento_s'] = duracion
+    return indice, metricas
+
+def _nombre_prueba(prueba):
+    nombre = prueba['familia']
+    if prueba['alpha'] is not None:
+        nombre += f"_alpha={prueba['alpha']:.4g}"
+    if prueba['positive']:
+        nombre += "_positive"
+    if not prueba['escalado']:
+        nombre += "_sin_escalado"
+    return nombre
+
+def ejecutar_barrido(pruebas, n_procesos=None, ruta_datos=None, metrica_objetivo='rmse'):
+    """
+    Ejecuta las pruebas en un pool de procesos y registra cada una como run hijo en MLflow
+
+    El split (escalado y sin escalar) de los experimentos se calcula una sola vez, o se toma de
+    la cache de preprocesamiento, y se comparte con los workers como arrays mapeados en memoria.
+
+    Returns:
+        (mejor prueba, sus métricas)
+    """
+    if not pruebas:
+        raise ValueError("El barrido necesita al menos una prueba")
+
+    mlflow.set_experiment("Prediccion_Salarios_Regresion_Lineal")
+
+    entrada = obtener_preprocesado(ruta_datos, **PARAMETROS_SPLIT)
+    arrays = {
+        nombre: entrada[nombre]
+        for nombre in ('X_train_scaled', 'X_test_scaled', 'X_train', 'X_test', 'y_train', 'y_test')
+    }
+    X_train_scaled, X_test_scaled = arrays['X_train_scaled'], arrays['X_test_scaled']
+
+    mejor = None
+    with ArraysCompartidos(arrays) as compartidos, \
+            mlflow.start_run(run_name="barrido_hiperparametros"):
+        mlflow.log_params({
+            'n_pruebas': len(pruebas),
+            'metrica_objetivo': metrica_objetivo,
+            'n_samples_train': X_train_scaled.shape[0],
+            'n_samples_test': X_test_scaled.shape[0]
+        })
+
+        with ProcessPoolExecutor(
+            max_workers=n_procesos,
+            initializer=_inicializar_worker,
+            initargs=(compartidos.descriptor,)
+        ) as pool:
+            futuros = [pool.submit(_evaluar_prueba, i, prueba) for i, prueba in enumerate(pruebas)]
+
+            for futuro in as_completed(futuros):
+                indice, metricas = futuro.result()
+                prueba = pruebas[indice]
+
+                with mlflow.start_run(run_name=_nombre_prueba(prueba), nested=True):
+                    mlflow.log_params(prueba)
+                    mlflow.log_metrics(metricas)
+
+                print(f"{_nombre_prueba(prueba)}: RMSE={metricas['rmse']:.2f} R²={metricas['r2']:.4f}")
+
+                # r2 se maximiza, las métricas de error se minimizan
+                signo = -1 if metrica_objetivo == 'r2' else 1
+                if mejor is None or signo * metricas[metrica_objetivo] < signo * mejor[1][metrica_objetivo]:
+                    mejor = (prueba, metricas)
+
+        mlflow.log_params({f"mejor_{clave}": valor for clave, valor in mejor[0].items()})
+        mlflow.log_metrics({f"mejor_{clave}": valor for clave, valor in mejor[1].items()})
+
+    return mejor
+
+def _entero_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero mayor o igual que 1: {texto}")
+    return valor
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido paralelo de hiperparámetros con runs hijos en MLflow")
+    parser.add_argument("--modo", choices=["grid", "aleatorio"], default="grid", help="Tipo de búsqueda")
+    parser.add_argument("--n-pruebas", type=_entero_positivo, default=20, help="Número de pruebas en modo aleatorio")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos worker (por defecto, todos)")
+    parser.add_argument("--datos", default=None, help="Dataset (CSV o binario); por defecto datos sintéticos")
+    parser.add_argument("--metrica", choices=["rmse", "mse", "mae", "r2"], default="rmse",
+                        help="Métrica para elegir la mejor prueba")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del modo aleatorio")
+    args = parser.parse_args()
+
+    if args.modo == "grid":
+        pruebas = generar_grid()
+    else:
+        pruebas = generar_aleatorio(args.n_pruebas, semilla=args.semilla)
+
+    print(f"=== BARRIDO DE HIPERPARÁMETROS: {len(pruebas)} pruebas en {args.procesos or os.cpu_count()} procesos ===")
+    prueba, metricas = ejecutar_barrido(pruebas, args.procesos, args.datos, args.metrica)
+
+    print("\n=== MEJOR PRUEBA ===")
+    print(_nombre_prueba(prueba))
+    print(f"RMSE: {metricas['rmse']:.2f}")
+    print(f"R²: {metricas['r2']:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import sklearn
+
+from cache_predicciones import CachePredicciones
+from cache_preprocesamiento import preprocesar_datos
+from dataset_binario import guardar_dataset_binario
+from ejemplo_uso_modelo import predecir_salario_empleado
+from generate_synthetic_data import generate_synthetic_salary_data
+from mlflow_regression_example import (
+    cargar_y_preprocesar_datos,
+    entrenar_modelo_regresion_lineal,
+    evaluar_modelo
+)
+from prediccion_lote import COLUMNAS_FEATURES, predecir_salarios_lote
+from predictor_fusionado import PredictorFusionado
+
+TAMANOS_DATASET = [1000, 10000, 100000, 1000000, 10000000]
+TAMANOS_LOTE = [1, 10, 100, 1000, 10000, 100000]
+
+# El camino fila a fila es muy lento: solo se mide hasta este número de filas
+MAX_FILAS_POR_FILA = 10000
+
+def _medir(funcion, repeticiones):
+    """
+    Ejecuta la función varias veces (silenciando su salida) y devuelve los tiempos en segundos
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+def _resultado(benchmark, parametros, tiempos, filas=None):
+    mediana = float(np.median(tiempos))
+    resultado = {
+        'benchmark': benchmark,
+        'parametros': parametros,
+        'segundos': tiempos,
+        'mediana_s': mediana,
+        'min_s': float(np.min(tiempos))
+    }
+    if filas is not None:
+        resultado['filas_por_s'] = filas / mediana if mediana > 0 else None
+    print(f"{benchmark:<28} {json.dumps(parametros):<40} mediana={mediana * 1000:10.3f} ms")
+    return resultado
+
+def _metadatos(repeticiones):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor(),
+        'repeticiones': repeticiones
+    }
+
+def benchmark_datos_y_entrenamiento(tamanos, repeticiones):
+    """
+    Generación, preprocesamiento, entrenamiento y evaluación para cada tamaño de dataset
+    """
+    resultados = []
+    for n in tamanos:
+        tiempos = _medir(lambda: generate_synthetic_salary_data(n), repeticiones)
+        resultados.append(_resultado('generacion_datos', {'n_filas': n}, tiempos, n))
+
+        with tempfile.TemporaryDirectory() as directorio:
+            guardar_dataset_binario(generate_synthetic_salary_data(n), directorio)
+
+            tiempos = _medir(lambda: cargar_y_preprocesar_datos(directorio, usar_cache=False), repeticiones)
+            resultados.append(_resultado('preprocesamiento', {'n_filas': n}, tiempos, n))
+
+            # Aciertos en la cache de preprocesamiento (en un directorio temporal propio)
+            with tempfile.TemporaryDirectory() as directorio_cache:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    preprocesar_datos(directorio, directorio_cache=directorio_cache)
+                tiempos = _medir(
+                    lambda: preprocesar_datos(directorio, directorio_cache=directorio_cache), repeticiones
+                )
+                resultados.append(_resultado('preprocesamiento_cache', {'n_filas': n}, tiempos, n))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                X_train, X_test, y_train, y_test, _ = cargar_y_preprocesar_datos(directorio, usar_cache=False)
+
+        tiempos = _medir(lambda: entrenar_modelo_regresion_lineal(X_train, y_train), repeticiones)
+        resultados.append(_resultado('entrenamiento', {'n_filas': n}, tiempos, len(X_train)))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            modelo, _ = entrenar_modelo_regresion_lineal(X_train, y_train)
+        tiempos = _medir(lambda: evaluar_modelo(modelo, X_test, y_test), repeticiones)
+        resultados.append(_resultado('evaluacion', {'n_filas': n}, tiempos, len(X_test)))
+
+    return resultados
+
+def benchmark_prediccion(tamanos_lote, repeticiones):
+    """
+    Predicción fila a fila frente a lote vectorizado y predictor fusionado
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, _, y_train, _, scaler = cargar_y_preprocesar_datos()
+        modelo, _ = entrenar_modelo_regresion_lineal(X_train, y_train)
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+
+    datos = generate_synthetic_salary_data(max(tamanos_lote))[COLUMNAS_FEATURES].to_numpy(dtype=np.float64)
+
+    resultados = []
+    for tamano in tamanos_lote:
+        lote = datos[:tamano]
+
+        if tamano <= MAX_FILAS_POR_FILA:
+            tiempos = _medir(
+                lambda: [predecir_salario_empleado(modelo, scaler, fila, usar_cache=False) for fila in lote],
+                repeticiones
+            )
+            resultados.append(_resultado('prediccion_por_fila', {'tamano_lote': tamano}, tiempos, tamano))
+
+        tiempos = _medir(lambda: predecir_salarios_lote(modelo, scaler, lote), repeticiones)
+        resultados.append(_resultado('prediccion_lote', {'tamano_lote': tamano}, tiempos, tamano))
+
+        tiempos = _medir(lambda: fusionado.predecir(lote), repeticiones)
+        resultados.append(_resultado('prediccion_fusionada', {'tamano_lote': tamano}, tiempos, tamano))
+
+        # Perfiles repetidos: tras la primera pasada todas las filas son aciertos de la cache
+        cache = CachePredicciones(max_entradas=max(tamanos_lote))
+        cache.predecir(lote, 'benchmark', fusionado.predecir)
+        tiempos = _medir(lambda: cache.predecir(lote, 'benchmark', fusionado.predecir), repeticiones)
+        resultados.append(_resultado('prediccion_cache', {'tamano_lote': tamano}, tiempos, tamano))
+
+    return resultados
+
+def benchmark_carga_modelo(run_id, repeticiones):
+    """
+    Carga del (modelo, scaler) de un run: directa desde MLflow sin ninguna cache, desde la
+    cache de artefactos en disco y con acierto en la cache en proceso
+    """
+    import mlflow.sklearn
+    from mlflow.tracking import MlflowClient
+
+    from cache_artefactos import ARTEFACTO_MODELO, ARTEFACTO_PIPELINE, ARTEFACTO_SCALER
+    from cache_modelos import CacheModelos, cargar_par_desde_mlflow
+
+    # Línea base: load_model de cada artefacto desde el almacén de MLflow, como el código original
+    existentes = {artefacto.path for artefacto in MlflowClient().list_artifacts(run_id)}
+    artefactos = [ARTEFACTO_PIPELINE] if ARTEFACTO_PIPELINE in existentes else [ARTEFACTO_MODELO, ARTEFACTO_SCALER]
+    tiempos = _medir(
+        lambda: [mlflow.sklearn.load_model(f"runs:/{run_id}/{artefacto}") for artefacto in artefactos],
+        repeticiones
+    )
+    resultados = [_resultado('carga_modelo_mlflow', {'run_id': run_id}, tiempos)]
+
+    # Cache de artefactos en un directorio propio, calentada antes de medir
+    with tempfile.TemporaryDirectory() as directorio_cache:
+        cargar_par_desde_mlflow(run_id, directorio_cache)
+        tiempos = _medir(lambda: cargar_par_desde_mlflow(run_id, directorio_cache), repeticiones)
+        resultados.append(_resultado('carga_modelo_cache_disco', {'run_id': run_id}, tiempos))
+
+        cache = CacheModelos(cargador=lambda run: cargar_par_desde_mlflow(run, directorio_cache))
+        cache.obtener(run_id)
+        tiempos = _medir(lambda: cache.obtener(run_id), repeticiones)
+        resultados.append(_resultado('carga_modelo_cache', {'run_id': run_id}, tiempos))
+
+    return resultados
+
+def comparar(resultados, ruta_anterior):
+    """
+    Muestra la relación de tiempos (mediana) frente a un archivo de resultados anterior
+    """
+    with open(ruta_anterior) as archivo:
+        anteriores = json.load(archivo)['resultados']
+
+    clave = lambda resultado: (resultado['benchmark'], json.dumps(resultado['parametros'], sort_keys=True))
+    indice_anterior = {clave(resultado): resultado for resultado in anteriores}
+
+    print(f"\n=== COMPARACIÓN CON {ruta_anterior} (>1 = más rápido ahora) ===")
+    for resultado in resultados:
+        anterior = indice_anterior.get(clave(resultado))
+        if anterior is None or resultado['mediana_s'] == 0:
+            continue
+        aceleracion = anterior['mediana_s'] / resultado['mediana_s']
+        print(f"{resultado['benchmark']:<28} {json.dumps(resultado['parametros']):<40} x{aceleracion:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de entrenamiento, carga y predicción")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_DATASET,
+                        help="Tamaños de dataset (filas)")
+    parser.add_argument("--tamanos-lote", type=int, nargs="+", default=TAMANOS_LOTE,
+                        help="Tamaños de lote para predicción")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por medición")
+    parser.add_argument("--run-id", default=None, help="Run de MLflow para medir la carga del modelo")
+    parser.add_argument("--rapido", action="store_true", help="Solo tamaños pequeños (1k-10k filas, lotes hasta 1k)")
+    parser.add_argument("--salida", default="resultados_benchmark.json", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    if args.rapido:
+        args.tamanos = [n for n in args.tamanos if n <= 10000]
+        args.tamanos_lote = [n for n in args.tamanos_lote if n <= 1000]
+
+    print("=== BENCHMARKS DE RENDIMIENTO ===")
+    resultados = benchmark_datos_y_entrenamiento(args.tamanos, args.repeticiones)
+    resultados += benchmark_prediccion(args.tamanos_lote, args.repeticiones)
+    if args.run_id:
+        resultados += benchmark_carga_modelo(args.run_id, args.repeticiones)
+
+    with open(args.salida, 'w') as archivo:
+        json.dump({'metadatos': _metadatos(args.repeticiones), 'resultados': resultados}, archivo, indent=2)
+    print(f"\nResultados guardados en '{args.salida}'")
+
+    if args.comparar:
+        comparar(resultados, args.comparar)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import mlflow.artifacts
+
+# Rutas de los artefactos dentro de cada run (ver experimento_mlflow)
+ARTEFACTO_MODELO = "modelo_regresion_lineal"
+ARTEFACTO_SCALER = "scaler"
+ARTEFACTO_PIPELINE = "pipeline_salarios"
+
+# Nombres de los pasos del pipeline combinado (scaler + modelo)
+PASO_SCALER = "scaler"
+PASO_MODELO = "modelo"
+
+# Directorio de la cache local; se puede cambiar con la variable de entorno SALARIOS_CACHE_ARTEFACTOS
+DIRECTORIO_CACHE = os.environ.get(
+    "SALARIOS_CACHE_ARTEFACTOS",
+    os.path.join(os.path.expanduser("~"), ".cache", "prediccion_salarios", "artefactos")
+)
+
+SUFIJO_MANIFIESTO = ".manifiesto.json"
+
+def _sha256(ruta):
+    resumen = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for trozo in iter(lambda: archivo.read(1 << 20), b''):
+            resumen.update(trozo)
+    return resumen.hexdigest()
+
+def _archivos(ruta):
+    """
+    Devuelve {ruta relativa: ruta absoluta} de cada archivo bajo ruta (un archivo o un directorio)
+    """
+    if os.path.isfile(ruta):
+        return {'.': ruta}
+    return {
+        os.path.relpath(os.path.join(raiz, nombre), ruta): os.path.join(raiz, nombre)
+        for raiz, _, archivos in os.walk(ruta)
+        for nombre in archivos
+    }
+
+def _calcular_sumas(ruta):
+    """
+    Calcula el sha256 de cada archivo bajo ruta
+    """
+    return {relativa: _sha256(absoluta) for relativa, absoluta in _archivos(ruta).items()}
+
+def _calcular_estados(ruta):
+    """
+    Tamaño y fecha de modificación (ns) de cada archivo bajo ruta: comprobación rápida sin leerlos
+    """
+    estados = {}
+    for relativa, absoluta in _archivos(ruta).items():
+        estado = os.stat(absoluta)
+        estados[relativa] = [estado.st_size, estado.st_mtime_ns]
+    return estados
+
+def _rutas_cache(run_id, ruta_artefacto, directorio_cache):
+    destino = os.path.join(directorio_cache, run_id, *ruta_artefacto.strip('/').split('/'))
+    return destino, destino + SUFIJO_MANIFIESTO
+
+def _verificar(destino, manifiesto, sumas=False):
+    """
+    Comprueba la copia local contra el manifiesto: tamaño y fecha de cada archivo o, con
+    sumas=True, su sha256 completo
+    """
+    try:
+        with open(manifiesto) as archivo:
+            contenido = json.load(archivo)
+        if sumas:
+            return _calcular_sumas(destino) == contenido['sumas']
+        return _calcular_estados(destino) == contenido['estados']
+    except (OSError, ValueError, KeyError):
+        return False
+
+def _escribir_manifiesto(manifiesto, contenido):
+    descriptor, temporal = tempfile.mkstemp(prefix=".manifiesto-", dir=os.path.dirname(manifiesto))
+    with os.fdopen(descriptor, 'w') as archivo:
+        json.dump(contenido, archivo, indent=2)
+    os.replace(temporal, manifiesto)
+
+def obtener_artefacto_local(run_id, ruta_artefacto, directorio_cache=None, verificar=True, verificar_sumas=False):
+    """
+    Devuelve la ruta local de un artefacto de un run, descargándolo solo la primera vez
+
+    Los artefactos de un run no cambian, así que la clave es run_id + ruta del artefacto.
+    Junto a cada artefacto se guarda un manifiesto con el tamaño, la fecha de modificación y
+    el sha256 de sus archivos; si la copia local no coincide con el manifiesto se descarga de
+    nuevo. Si otro proceso descarga el mismo artefacto a la vez, se usa su copia.
+
+    Args:
+        run_id: Run de MLflow
+        ruta_artefacto: Ruta del artefacto dentro del run (p. ej. "modelo_regresion_lineal")
+        directorio_cache: Directorio de la cache (por defecto DIRECTORIO_CACHE)
+        verificar: Comprobar tamaño y fecha de los archivos antes de usar la copia local
+        verificar_sumas: Comprobar además el sha256 de cada archivo (lee el artefacto completo)
+    """
+    directorio_cache = directorio_cache or DIRECTORIO_CACHE
+    destino, manifiesto = _rutas_cache(run_id, ruta_artefacto, directorio_cache)
+
+    if os.path.exists(manifiesto) and (
+        not (verificar or verificar_sumas) or _verificar(destino, manifiesto, sumas=verificar_sumas)
+    ):
+        return destino
+
+    # Descargar a un directorio temporal dentro de la cache y mover de forma atómica
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    directorio_temporal = tempfile.mkdtemp(prefix=".descarga-", dir=os.path.dirname(destino))
+    try:
+        descargado = mlflow.artifacts.download_artifacts(
+            run_id=run_id, artifact_path=ruta_artefacto, dst_path=directorio_temporal
+        )
+        sumas = _calcular_sumas(descargado)
+
+        if os.path.exists(manifiesto):
+            os.remove(manifiesto)
+        if os.path.isdir(destino):
+            shutil.rmtree(destino, ignore_errors=True)
+        elif os.path.exists(destino):
+            os.remove(destino)
+        try:
+            os.replace(descargado, destino)
+        except OSError:
+            # Otro proceso movió su descarga al destino entre medias (directorio no vacío):
+            # se usa su copia si su manifiesto es válido o si el contenido es el mismo
+            if _verificar(destino, manifiesto):
+                return destino
+            if not os.path.exists(destino) or _calcular_sumas(destino) != sumas:
+                raise
+
+        # El manifiesto se escribe al final: sin manifiesto la entrada se considera incompleta
+        _escribir_manifiesto(manifiesto, {
+            'run_id': run_id,
+            'artefacto': ruta_artefacto,
+            'sumas': sumas,
+            'estados': _calcular_estados(destino)
+        })
+    finally:
+        shutil.rmtree(directorio_temporal, ignore_errors=True)
+
+    return destino
+
+def en_cache_local(run_id, ruta_artefacto, directorio_cache=None):
+    """
+    Indica si el artefacto ya está completo en la cache local
+    """
+    _, manifiesto = _rutas_cache(run_id, ruta_artefacto, directorio_cache or DIRECTORIO_CACHE)
+    return os.path.exists(manifiesto)
+
+def existe_artefacto(run_id, ruta_artefacto, directorio_cache=None):
+    """
+    Indica si un run tiene el artefacto, consultando primero la cache local
+    """
+    if en_cache_local(run_id, ruta_artefacto, directorio_cache):
+        return True
+
+    from mlflow.tracking import MlflowClient
+    return any(
+        artefacto.path == ruta_artefacto for artefacto in MlflowClient().list_artifacts(run_id)
+    )
+
+def artefactos_de_prediccion(run_id, directorio_cache=None):
+    """
+    Devuelve los artefactos necesarios para predecir con un run: el pipeline combinado
+    si existe, o el modelo y el scaler por separado
+    """
+    if en_cache_local(run_id, ARTEFACTO_PIPELINE, directorio_cache):
+        return (ARTEFACTO_PIPELINE,)
+    if (en_cache_local(run_id, ARTEFACTO_MODELO, directorio_cache)
+            and en_cache_local(run_id, ARTEFACTO_SCALER, directorio_cache)):
+        return (ARTEFACTO_MODELO, ARTEFACTO_SCALER)
+    if existe_artefacto(run_id, ARTEFACTO_PIPELINE, directorio_cache):
+        return (ARTEFACTO_PIPELINE,)
+    return (ARTEFACTO_MODELO, ARTEFACTO_SCALER)
+
+def precargar(run_ids, artefactos=None, directorio_cache=None, max_hilos=8, verificar_sumas=False):
+    """
+    Calienta la cache local descargando en paralelo los artefactos de una lista de runs
+
+    Args:
+        artefactos: Rutas a descargar de cada run; por defecto, las de artefactos_de_prediccion
+        verificar_sumas: Comprobar el sha256 de las copias que ya estaban en la cache
+
+    Returns:
+        Lista de rutas locales en el mismo orden que (run_id, artefacto)
+    """
+    tareas = [
+        (run_id, artefacto)
+        for run_id in run_ids
+        for artefacto in (artefactos or artefactos_de_prediccion(run_id, directorio_cache))
+    ]
+    with ThreadPoolExecutor(max_workers=max_hilos) as pool:
+        futuros = [
+            pool.submit(obtener_artefacto_local, run_id, artefacto, directorio_cache,
+                        verificar_sumas=verificar_sumas)
+            for run_id, artefacto in tareas
+        ]
+        return [futuro.result() for futuro in futuros]
+
+def limpiar(run_id=None, directorio_cache=None):
+    """
+    Borra de la cache local los artefactos de un run, o toda la cache si no se indica run_id
+    """
+    directorio_cache = directorio_cache or DIRECTORIO_CACHE
+    objetivo = os.path.join(directorio_cache, run_id) if run_id else directorio_cache
+    shutil.rmtree(objetivo, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache local de artefactos de MLflow")
+    parser.add_argument("--directorio", default=None, help=f"Directorio de la cache (por defecto {DIRECTORIO_CACHE})")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    parser_precargar = subparsers.add_parser("precargar", help="Descargar los artefactos de uno o más runs")
+    parser_precargar.add_argument("run_ids", nargs="+", help="Run IDs a precargar")
+    parser_precargar.add_argument("--artefactos", nargs="+", default=None,
+                                  help="Rutas de artefactos a descargar de cada run "
+                                       "(por defecto, pipeline o modelo + scaler)")
+    parser_precargar.add_argument("--verificar", action="store_true",
+                                  help="Comprobar el sha256 de los artefactos ya descargados")
+
+    parser_limpiar = subparsers.add_parser("limpiar", help="Borrar la cache local")
+    parser_limpiar.add_argument("run_id", nargs="?", default=None, help="Run ID a borrar (por defecto, todos)")
+
+    args = parser.parse_args()
+
+    if args.comando == "precargar":
+        rutas = precargar(args.run_ids, artefactos=args.artefactos, directorio_cache=args.directorio,
+                          verificar_sumas=args.verificar)
+        for ruta in rutas:
+            print(f"✅ {ruta}")
+    else:
+        limpiar(args.run_id, directorio_cache=args.directorio)
+        print("🗑️  Cache limpiada")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import mlflow.sklearn
+
+from cache_artefactos import (
+    ARTEFACTO_MODELO,
+    ARTEFACTO_PIPELINE,
+    ARTEFACTO_SCALER,
+    artefactos_de_prediccion,
+    obtener_artefacto_local
+)
+
+def _cargar_modelo_local(run_id, ruta_artefacto, directorio_cache=None):
+    return mlflow.sklearn.load_model(obtener_artefacto_local(run_id, ruta_artefacto, directorio_cache))
+
+def cargar_par_desde_mlflow(run_id, directorio_cache=None):
+    """
+    Carga el (modelo, scaler) de un run, descargando y deserializando ambos artefactos en paralelo
+
+    Los artefactos se leen desde la cache local en disco (cache_artefactos) y solo se
+    descargan del almacén de MLflow la primera vez. Si el run tiene el pipeline combinado
+    (scaler + modelo) se carga ese único artefacto y se devuelve (pipeline, None): el
+    pipeline predice directamente con pipeline.predict, sin transform previo.
+
+    Args:
+        run_id: Run de MLflow
+        directorio_cache: Directorio de la cache de artefactos (por defecto el de cache_artefactos)
+    """
+    if artefactos_de_prediccion(run_id, directorio_cache) == (ARTEFACTO_PIPELINE,):
+        return _cargar_modelo_local(run_id, ARTEFACTO_PIPELINE, directorio_cache), None
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futuro_modelo = pool.submit(_cargar_modelo_local, run_id, ARTEFACTO_MODELO, directorio_cache)
+        futuro_scaler = pool.submit(_cargar_modelo_local, run_id, ARTEFACTO_SCALER, directorio_cache)
+        return futuro_modelo.result(), futuro_scaler.result()
+
+class CacheModelos:
+    """
+    Cache LRU en proceso de pares (modelo, scaler) indexados por run_id
+
+    Cada run se carga una sola vez aunque varios hilos lo pidan a la vez; las entradas se
+    expulsan por tamaño (max_entradas) y, opcionalmente, por antigüedad (ttl_segundos).
+    """
+
+    def __init__(self, max_entradas=8, ttl_segundos=None, cargador=cargar_par_desde_mlflow):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._cargador = cargador
+        self._entradas = OrderedDict()
+        self._cargas_en_curso = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _expirada(self, instante):
+        return self.ttl_segundos is not None and time.monotonic() - instante > self.ttl_segundos
+
+    def obtener(self, run_id):
+        """
+        Devuelve el (modelo, scaler) del run, cargándolo solo si no está en cache
+        """
+        with self._lock:
+            entrada = self._entradas.get(run_id)
+            if entrada is not None:
+                instante, par = entrada
+                if not self._expirada(instante):
+                    self._entradas.move_to_end(run_id)
+                    self.aciertos += 1
+                    return par
+                del self._entradas[run_id]
+
+            carga = self._cargas_en_curso.get(run_id)
+            propietario = carga is None
+            if propietario:
+                carga = Future()
+                self._cargas_en_curso[run_id] = carga
+                self.fallos += 1
+
+        if not propietario:
+            # Otro hilo ya está cargando este run: esperar su resultado
+            return carga.result()
+
+        try:
+            par = self._cargador(run_id)
+        except BaseException as error:
+            with self._lock:
+                del self._cargas_en_curso[run_id]
+            carga.set_exception(error)
+            raise
+
+        with self._lock:
+            self._entradas[run_id] = (time.monotonic(), par)
+            self._entradas.move_to_end(run_id)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+            del self._cargas_en_curso[run_id]
+        carga.set_result(par)
+
+        return par
+
+    def invalidar(self, run_id=None):
+        """
+        Elimina un run de la cache, o todos si no se indica run_id
+        """
+        with self._lock:
+            if run_id is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(run_id, None)
+
+    def estadisticas(self):
+        """
+        Devuelve el número de entradas, aciertos y fallos de la cache
+        """
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos
+            }
+
+# Cache compartida por los scripts del proyecto
+cache_modelos = CacheModelos()
+
+def cargar_modelo_cacheado(run_id):
+    """
+    Carga el (modelo, scaler) de un run usando la cache compartida del proceso
+    """
+    return cache_modelos.obtener(run_id)
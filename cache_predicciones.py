@@ -0,0 +1,178 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from prediccion_lote import COLUMNAS_FEATURES, convertir_a_matriz
+from predictor_fusionado import PredictorFusionado
+
+def _huella_fusionado(fusionado):
+    contenido = fusionado.pesos.tobytes() + np.float64(fusionado.sesgo).tobytes()
+    return hashlib.sha1(contenido).hexdigest()
+
+def huella_modelos(modelo, scaler):
+    """
+    Identifica un par (modelo, scaler) por sus parámetros plegados: cambia si cambia el modelo
+    """
+    return _huella_fusionado(PredictorFusionado.desde_modelos(modelo, scaler))
+
+class CachePredicciones:
+    """
+    Cache LRU de predicciones por perfil de empleado, ligada a una versión del modelo
+
+    La clave es la versión del modelo (run_id, nombre de versión o huella_modelos) más la fila
+    de features (opcionalmente cuantizada), así que nunca se devuelve una predicción de otro
+    modelo y alternar entre varios modelos no vacía la cache: las entradas de las versiones
+    que ya no se usan salen por LRU o con invalidar(version). En un lote solo se predicen las
+    filas que fallan, con una única llamada vectorizada.
+    Las filas con valores no finitos (NaN, inf) no se guardan: se predicen siempre directamente.
+
+    Pensada para tráfico con perfiles repetidos y lotes pequeños; para puntuar archivos
+    grandes es más rápido el predictor directamente.
+    """
+
+    def __init__(self, max_entradas=10000, resolucion=None):
+        """
+        Args:
+            max_entradas: Número máximo de perfiles guardados
+            resolucion: Paso de cuantización de las variables continuas (p. ej. 0.5 años), un
+                        dict {columna: paso} o None para usar los valores exactos. Con
+                        cuantización se predice sobre los valores redondeados.
+        """
+        self.max_entradas = max_entradas
+        if isinstance(resolucion, dict):
+            pasos = [resolucion.get(columna, 0.0) for columna in COLUMNAS_FEATURES]
+        elif resolucion:
+            # Los conteos (proyectos, certificaciones) ya son enteros: no se cuantizan
+            pasos = [resolucion] * 4 + [0.0, 0.0]
+        else:
+            pasos = [0.0] * len(COLUMNAS_FEATURES)
+        self.pasos = np.array(pasos, dtype=np.float64)
+        self._cuantizadas = self.pasos > 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def _cuantizar(self, matriz):
+        if not self._cuantizadas.any():
+            return matriz
+        matriz = matriz.copy()
+        pasos = self.pasos[self._cuantizadas]
+        matriz[:, self._cuantizadas] = np.round(matriz[:, self._cuantizadas] / pasos) * pasos
+        return matriz
+
+    def predecir(self, datos, version, predecir):
+        """
+        Devuelve las predicciones de un lote usando la cache
+
+        Args:
+            datos: Matriz 2-D, DataFrame, LoteEmpleados o iterable de filas
+            version: Identificador de la versión del modelo que usa predecir
+            predecir: Función que recibe una matriz 2-D y devuelve sus predicciones
+        """
+        matriz = self._cuantizar(convertir_a_matriz(datos))
+        # Una clave con NaN nunca es igual a sí misma: esas filas no se buscan ni se guardan
+        finitas = np.isfinite(matriz).all(axis=1).tolist()
+        claves = [(version, tuple(fila)) if finita else None for fila, finita in zip(matriz.tolist(), finitas)]
+        resultados = np.empty(len(claves), dtype=np.float64)
+        pendientes = []
+        fallos = 0
+
+        with self._lock:
+            for i, clave in enumerate(claves):
+                if clave is None:
+                    pendientes.append(i)
+                    continue
+                valor = self._entradas.get(clave)
+                if valor is None:
+                    pendientes.append(i)
+                    fallos += 1
+                else:
+                    self._entradas.move_to_end(clave)
+                    resultados[i] = valor
+            self.aciertos += len(claves) - len(pendientes)
+            self.fallos += fallos
+
+        if pendientes:
+            predicciones = np.asarray(predecir(matriz[pendientes]), dtype=np.float64)
+            resultados[pendientes] = predicciones
+
+            with self._lock:
+                for i, valor in zip(pendientes, predicciones.tolist()):
+                    if claves[i] is not None:
+                        self._entradas[claves[i]] = valor
+                while len(self._entradas) > self.max_entradas:
+                    self._entradas.popitem(last=False)
+
+        return resultados
+
+    def invalidar(self, version=None):
+        """
+        Elimina las entradas de una versión del modelo, o todas si no se indica (cuenta como
+        una invalidación en las estadísticas)
+        """
+        with self._lock:
+            if version is None:
+                self._entradas.clear()
+            else:
+                for clave in [clave for clave in self._entradas if clave[0] == version]:
+                    del self._entradas[clave]
+            self.invalidaciones += 1
+
+    def estadisticas(self):
+        """
+        Devuelve entradas, aciertos, fallos, invalidaciones y la tasa de aciertos
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'invalidaciones': self.invalidaciones,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+            }
+
+# Cache compartida por los scripts del proyecto
+cache_predicciones = CachePredicciones()
+
+# Predictor fusionado y huella de cada modelo ya visto, para no recalcularlos en cada llamada
+_predictores = weakref.WeakKeyDictionary()
+_lock_predictores = threading.Lock()
+
+def _atributos_ajustados(modelo, scaler):
+    """
+    Arrays ajustados del par: fit() los reemplaza, así que si son los mismos objetos el
+    modelo no se ha reentrenado
+    """
+    if scaler is None:
+        scaler, modelo = modelo.steps[0][1], modelo.steps[-1][1]
+    return (modelo.coef_, modelo.intercept_, scaler.mean_, scaler.scale_)
+
+def _predictor_y_version(modelo, scaler):
+    atributos = _atributos_ajustados(modelo, scaler)
+    with _lock_predictores:
+        guardado = _predictores.get(modelo)
+    if (guardado is not None and guardado[0] is scaler
+            and all(actual is anterior for actual, anterior in zip(atributos, guardado[1]))):
+        return guardado[2], guardado[3]
+
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    huella = _huella_fusionado(fusionado)
+    with _lock_predictores:
+        _predictores[modelo] = (scaler, atributos, fusionado, huella)
+    return fusionado, huella
+
+def predecir_salarios_cacheado(modelo, scaler, datos, cache=None):
+    """
+    Predice con (modelo, scaler) a través de la cache; la versión es huella_modelos(modelo, scaler),
+    calculada una sola vez por modelo mientras no se reentrene
+    """
+    if cache is None:
+        cache = cache_predicciones
+    fusionado, huella = _predictor_y_version(modelo, scaler)
+    return cache.predecir(datos, huella, fusionado.predecir)
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import sklearn
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+import generate_synthetic_data
+from dataset_binario import leer_dataset
+from instrumentacion import medir
+
+# Versión del formato de las entradas de la cache
+VERSION_FORMATO = 3
+
+# Directorio de la cache; se puede cambiar con la variable de entorno SALARIOS_CACHE_PREPROCESAMIENTO
+DIRECTORIO_CACHE = os.environ.get(
+    "SALARIOS_CACHE_PREPROCESAMIENTO",
+    os.path.join(os.path.expanduser("~"), ".cache", "prediccion_salarios", "preprocesamiento")
+)
+
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+# El scaler se guarda como sus arrays ajustados (sin pickle) y se reconstruye al cargar
+ARCHIVO_SCALER = "scaler.npz"
+
+# Arrays guardados en cada entrada (.npy, se abren mapeados en memoria); X_train/X_test son el
+# split sin escalar, para los modelos que se entrenan con los valores originales
+ARRAYS = ('indices_train', 'indices_test', 'X_train', 'X_test', 'X_train_scaled', 'X_test_scaled',
+          'y_train', 'y_test')
+
+def _huella_origen(ruta_datos, n_samples):
+    """
+    Describe el origen de los datos: tamaño y fecha de modificación de cada archivo del dataset
+    o, para los datos sintéticos, el número de filas y el código del generador
+    """
+    if ruta_datos is None:
+        with open(generate_synthetic_data.__file__, 'rb') as archivo:
+            codigo = hashlib.sha256(archivo.read()).hexdigest()
+        return {'tipo': 'sintetico', 'n_samples': n_samples, 'generador': codigo}
+
+    ruta = os.path.abspath(ruta_datos)
+    if os.path.isfile(ruta):
+        rutas = [ruta]
+    else:
+        rutas = sorted(
+            os.path.join(raiz, nombre) for raiz, _, archivos in os.walk(ruta) for nombre in archivos
+        )
+
+    archivos = []
+    for ruta_archivo in rutas:
+        estado = os.stat(ruta_archivo)
+        archivos.append([os.path.relpath(ruta_archivo, ruta), estado.st_size, estado.st_mtime_ns])
+    return {'tipo': 'archivo', 'ruta': ruta, 'archivos': archivos}
+
+def huella_preprocesamiento(ruta_datos=None, n_samples=1000, test_size=0.2, random_state=42,
+                            columna_objetivo='salario'):
+    """
+    Calcula la clave de cache: origen de los datos + parámetros del split + versiones
+
+    Returns:
+        (huella en hexadecimal, descripción de los parámetros usados)
+    """
+    parametros = {
+        'version': VERSION_FORMATO,
+        'origen': _huella_origen(ruta_datos, n_samples),
+        'test_size': test_size,
+        'random_state': random_state,
+        'columna_objetivo': columna_objetivo,
+        'sklearn': sklearn.__version__,
+        'numpy': np.__version__
+    }
+    texto = json.dumps(parametros, sort_keys=True)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest(), parametros
+
+def _guardar_scaler(ruta, scaler):
+    columnas = getattr(scaler, 'feature_names_in_', None)
+    with open(ruta, 'wb') as archivo:
+        np.savez(
+            archivo,
+            mean_=scaler.mean_,
+            scale_=scaler.scale_,
+            var_=scaler.var_,
+            n_samples_seen_=np.asarray(scaler.n_samples_seen_),
+            columnas=np.array(columnas if columnas is not None else [], dtype=np.str_)
+        )
+
+def _cargar_scaler(ruta):
+    """
+    Reconstruye el StandardScaler a partir de sus arrays (allow_pickle=False: no ejecuta código)
+    """
+    with np.load(ruta, allow_pickle=False) as datos:
+        scaler = StandardScaler()
+        scaler.mean_ = datos['mean_']
+        scaler.scale_ = datos['scale_']
+        scaler.var_ = datos['var_']
+        n_samples_seen = datos['n_samples_seen_']
+        scaler.n_samples_seen_ = n_samples_seen[()] if n_samples_seen.ndim == 0 else n_samples_seen
+        scaler.n_features_in_ = scaler.mean_.shape[0]
+        if datos['columnas'].size:
+            scaler.feature_names_in_ = datos['columnas'].astype(object)
+    return scaler
+
+def cargar_preprocesado(huella, directorio_cache=None):
+    """
+    Devuelve la entrada de la cache (arrays mapeados en memoria y scaler) o None si no existe
+    """
+    destino = os.path.join(directorio_cache or DIRECTORIO_CACHE, huella)
+    if not os.path.isfile(os.path.join(destino, ARCHIVO_MANIFIESTO)):
+        return None
+
+    try:
+        entrada = {
+            nombre: np.load(os.path.join(destino, f"{nombre}.npy"), mmap_mode='r')
+            for nombre in ARRAYS
+        }
+        entrada['scaler'] = _cargar_scaler(os.path.join(destino, ARCHIVO_SCALER))
+    except (OSError, ValueError, KeyError):
+        return None
+    return entrada
+
+def guardar_preprocesado(huella, parametros, entrada, directorio_cache=None):
+    """
+    Guarda una entrada en la cache de forma atómica (directorio temporal + rename)
+    """
+    directorio_cache = directorio_cache or DIRECTORIO_CACHE
+    os.makedirs(directorio_cache, exist_ok=True)
+    destino = os.path.join(directorio_cache, huella)
+
+    directorio_temporal = tempfile.mkdtemp(prefix=".escritura-", dir=directorio_cache)
+    try:
+        for nombre in ARRAYS:
+            np.save(os.path.join(directorio_temporal, f"{nombre}.npy"), np.ascontiguousarray(entrada[nombre]))
+        _guardar_scaler(os.path.join(directorio_temporal, ARCHIVO_SCALER), entrada['scaler'])
+        # El manifiesto se escribe al final: sin manifiesto la entrada se considera incompleta
+        with open(os.path.join(directorio_temporal, ARCHIVO_MANIFIESTO), 'w') as archivo:
+            json.dump(parametros, archivo, indent=2)
+
+        if os.path.isdir(destino):
+            shutil.rmtree(destino)
+        os.replace(directorio_temporal, destino)
+    except OSError:
+        # Otro proceso pudo escribir la misma entrada a la vez; la cache es solo una optimización
+        shutil.rmtree(directorio_temporal, ignore_errors=True)
+
+def limpiar(directorio_cache=None):
+    """
+    Borra todas las entradas de la cache de preprocesamiento
+    """
+    shutil.rmtree(directorio_cache or DIRECTORIO_CACHE, ignore_errors=True)
+
+@medir("preprocesamiento.calcular")
+def _calcular_preprocesado(ruta_datos, n_samples, test_size, random_state, columna_objetivo):
+    if ruta_datos is None:
+        data = generate_synthetic_data.generate_synthetic_salary_data(n_samples)
+    else:
+        data = leer_dataset(ruta_datos)
+
+    X = data.drop(columna_objetivo, axis=1)
+    y = data[columna_objetivo].to_numpy(dtype=np.float64)
+
+    print(f"Valores nulos en features: {X.isnull().sum().sum()}")
+    print(f"Valores nulos en target: {int(np.isnan(y).sum())}")
+
+    # Mismo split que train_test_split(X, y, ...): se barajan los índices de las filas
+    indices_train, indices_test = train_test_split(
+        np.arange(len(data)), test_size=test_size, random_state=random_state
+    )
+    X_train, X_test = X.iloc[indices_train], X.iloc[indices_test]
+
+    scaler = StandardScaler()
+    return {
+        'indices_train': indices_train,
+        'indices_test': indices_test,
+        'X_train': X_train.to_numpy(dtype=np.float64),
+        'X_test': X_test.to_numpy(dtype=np.float64),
+        'X_train_scaled': scaler.fit_transform(X_train),
+        'X_test_scaled': scaler.transform(X_test),
+        'y_train': y[indices_train],
+        'y_test': y[indices_test],
+        'scaler': scaler
+    }
+
+def obtener_preprocesado(ruta_datos=None, n_samples=1000, test_size=0.2, random_state=42,
+                         columna_objetivo='salario', usar_cache=True, directorio_cache=None):
+    """
+    Igual que preprocesar_datos pero devuelve la entrada completa: un dict con los arrays de
+    ARRAYS (incluido el split sin escalar X_train/X_test) y el 'scaler'
+    """
+    if usar_cache:
+        huella, parametros = huella_preprocesamiento(
+            ruta_datos, n_samples, test_size, random_state, columna_objetivo
+        )
+        entrada = cargar_preprocesado(huella, directorio_cache)
+        if entrada is not None:
+            print(f"Preprocesamiento recuperado de la cache ({huella[:12]})")
+        else:
+            entrada = _calcular_preprocesado(ruta_datos, n_samples, test_size, random_state, columna_objetivo)
+            guardar_preprocesado(huella, parametros, entrada, directorio_cache)
+        return entrada
+    return _calcular_preprocesado(ruta_datos, n_samples, test_size, random_state, columna_objetivo)
+
+def preprocesar_datos(ruta_datos=None, n_samples=1000, test_size=0.2, random_state=42,
+                      columna_objetivo='salario', usar_cache=True, directorio_cache=None):
+    """
+    Split train/test y StandardScaler, reutilizando el resultado si los datos no han cambiado
+
+    La clave de la cache es huella_preprocesamiento(): si el dataset (tamaño y fecha de sus
+    archivos, o el código del generador sintético) y los parámetros del split coinciden, se
+    devuelven los arrays guardados abiertos con mmap en solo lectura y el scaler ya ajustado.
+
+    Args:
+        ruta_datos: Dataset a leer (CSV o binario); None genera n_samples filas sintéticas
+        usar_cache: Si es False siempre se recalcula y no se guarda nada
+
+    Returns:
+        (X_train_scaled, X_test_scaled, y_train, y_test, scaler) con y_train/y_test como arrays
+    """
+    entrada = obtener_preprocesado(
+        ruta_datos, n_samples, test_size, random_state, columna_objetivo, usar_cache, directorio_cache
+    )
+    return (
+        entrada['X_train_scaled'], entrada['X_test_scaled'],
+        entrada['y_train'], entrada['y_test'], entrada['scaler']
+    )
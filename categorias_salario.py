@@ -0,0 +1,53 @@
+import numpy as np
+
+class BandasSalariales:
+    """
+    Categoriza salarios en bandas definidas por umbrales, de forma vectorizada
+
+    Un salario pertenece a la banda i si umbrales[i-1] <= salario < umbrales[i]; las bandas
+    se calculan para todo el array con np.searchsorted y se devuelven como códigos compactos.
+    """
+
+    def __init__(self, umbrales, etiquetas):
+        self.umbrales = np.asarray(umbrales, dtype=np.float64)
+        self.etiquetas = list(etiquetas)
+
+        if self.umbrales.ndim != 1 or np.any(np.diff(self.umbrales) <= 0):
+            raise ValueError("Los umbrales deben ser una secuencia estrictamente creciente")
+        if len(self.etiquetas) != len(self.umbrales) + 1:
+            raise ValueError("Debe haber exactamente una etiqueta más que umbrales")
+
+        self.tipo_codigo = np.min_scalar_type(len(self.etiquetas) - 1)
+        self._etiquetas_array = np.array(self.etiquetas, dtype=object)
+
+    def codificar(self, salarios):
+        """
+        Devuelve el código de banda (0 .. n_bandas-1) de cada salario
+        """
+        codigos = np.searchsorted(self.umbrales, salarios, side='right')
+        return codigos.astype(self.tipo_codigo, copy=False)
+
+    def etiquetar(self, salarios):
+        """
+        Devuelve un array con la etiqueta de banda de cada salario
+        """
+        return self._etiquetas_array[self.codificar(salarios)]
+
+    def como_categorical(self, salarios):
+        """
+        Devuelve las bandas como pd.Categorical (códigos compactos + etiquetas compartidas)
+        """
+        import pandas as pd
+        return pd.Categorical.from_codes(self.codificar(salarios), categories=self.etiquetas)
+
+    def etiqueta(self, salario):
+        """
+        Devuelve la etiqueta de banda de un solo salario
+        """
+        return self.etiquetas[int(np.searchsorted(self.umbrales, salario, side='right'))]
+
+# Categorías usadas por las interfaces de predicción
+BANDAS_SALARIALES = BandasSalariales(
+    [40000, 60000, 80000, 100000],
+    ["Junior", "Intermedio", "Senior", "Experto", "Muy Experto"]
+)
@@ -0,0 +1,178 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from generate_synthetic_data import COLUMNAS_DATOS
+
+# Versión del formato en disco
+VERSION_FORMATO = 1
+
+# Nombre del archivo con el esquema dentro del directorio del dataset
+ARCHIVO_ESQUEMA = "esquema.json"
+
+# Tipo de cada columna en disco: float32 para las variables continuas, int16 para los conteos
+# y float64 para el salario (float32 no conserva los centavos de salarios de 6 cifras)
+TIPOS_COLUMNAS = {
+    'edad': 'float32',
+    'experiencia_anos': 'float32',
+    'educacion_anos': 'float32',
+    'horas_trabajo': 'float32',
+    'proyectos_completados': 'int16',
+    'certificaciones': 'int16',
+    'salario': 'float64'
+}
+
+def _ruta_columna(ruta, columna):
+    return os.path.join(ruta, f"{columna}.npy")
+
+def _escribir_esquema(ruta, n_filas):
+    esquema = {
+        'version': VERSION_FORMATO,
+        'n_filas': int(n_filas),
+        'columnas': [{'nombre': columna, 'tipo': TIPOS_COLUMNAS[columna]} for columna in COLUMNAS_DATOS]
+    }
+    with open(os.path.join(ruta, ARCHIVO_ESQUEMA), 'w') as archivo:
+        json.dump(esquema, archivo, indent=2)
+
+def leer_esquema(ruta):
+    """
+    Lee el esquema de un dataset binario y verifica su versión
+    """
+    with open(os.path.join(ruta, ARCHIVO_ESQUEMA)) as archivo:
+        esquema = json.load(archivo)
+
+    if esquema.get('version') != VERSION_FORMATO:
+        raise ValueError(f"Versión de dataset binario no soportada: {esquema.get('version')}")
+
+    return esquema
+
+def es_dataset_binario(ruta):
+    """
+    Indica si la ruta es un directorio con un dataset en formato binario
+    """
+    return os.path.isfile(os.path.join(ruta, ARCHIVO_ESQUEMA))
+
+def escribir_dataset_binario(bloques, ruta, n_filas):
+    """
+    Escribe un dataset binario columna a columna a partir de un iterable de bloques
+
+    Cada columna se guarda como un .npy con su tipo compacto y se rellena mediante un
+    memmap, así que la memoria usada solo depende del tamaño de bloque.
+
+    Args:
+        bloques: Iterable de DataFrames o matrices (n x 7) en el orden de COLUMNAS_DATOS,
+                 p. ej. la salida de generar_datos_sinteticos_por_bloques
+        ruta: Directorio de destino
+        n_filas: Número total de filas que suman los bloques
+    """
+    os.makedirs(ruta, exist_ok=True)
+
+    columnas = {
+        columna: np.lib.format.open_memmap(
+            _ruta_columna(ruta, columna), mode='w+', dtype=TIPOS_COLUMNAS[columna], shape=(n_filas,)
+        )
+        for columna in COLUMNAS_DATOS
+    }
+
+    posicion = 0
+    for bloque in bloques:
+        if isinstance(bloque, pd.DataFrame):
+            valores = [bloque[columna].to_numpy() for columna in COLUMNAS_DATOS]
+        else:
+            valores = [bloque[:, i] for i in range(len(COLUMNAS_DATOS))]
+
+        fin = posicion + len(valores[0])
+        if fin > n_filas:
+            raise ValueError(f"Los bloques contienen más de las {n_filas} filas declaradas")
+
+        for columna, valores_columna in zip(COLUMNAS_DATOS, valores):
+            columnas[columna][posicion:fin] = valores_columna
+        posicion = fin
+
+    if posicion != n_filas:
+        raise ValueError(f"Se declararon {n_filas} filas pero los bloques contienen {posicion}")
+
+    for memmap in columnas.values():
+        memmap.flush()
+    del columnas
+
+    # El esquema se escribe al final: un dataset sin esquema está incompleto
+    _escribir_esquema(ruta, n_filas)
+    return ruta
+
+def guardar_dataset_binario(data, ruta):
+    """
+    Guarda un DataFrame de salarios en formato binario por columnas
+    """
+    return escribir_dataset_binario([data], ruta, len(data))
+
+def abrir_columnas_binario(ruta, mmap=True):
+    """
+    Abre las columnas de un dataset binario como arrays de numpy
+
+    Args:
+        ruta: Directorio del dataset
+        mmap: Si es True las columnas se mapean en memoria en solo lectura (coste de lectura casi nulo)
+    """
+    esquema = leer_esquema(ruta)
+    modo = 'r' if mmap else None
+    return {
+        columna['nombre']: np.load(_ruta_columna(ruta, columna['nombre']), mmap_mode=modo)
+        for columna in esquema['columnas']
+    }
+
+def cargar_dataset_binario(ruta, mmap=True):
+    """
+    Carga un dataset binario como DataFrame con las mismas columnas que el CSV
+    """
+    columnas = abrir_columnas_binario(ruta, mmap=mmap)
+    return pd.DataFrame(columnas, columns=COLUMNAS_DATOS, copy=False)
+
+def iterar_bloques_binario(ruta, tamano_bloque=100000, como_array=False):
+    """
+    Recorre un dataset binario por bloques sin cargarlo completo en memoria
+
+    Args:
+        ruta: Directorio del dataset
+        tamano_bloque: Filas por bloque
+        como_array: Si es True devuelve matrices float64 (n x 7) en lugar de DataFrames
+    """
+    columnas = abrir_columnas_binario(ruta, mmap=True)
+    n_filas = len(columnas[COLUMNAS_DATOS[0]])
+
+    for inicio in range(0, n_filas, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n_filas)
+        if como_array:
+            bloque = np.empty((fin - inicio, len(COLUMNAS_DATOS)), dtype=np.float64)
+            for i, columna in enumerate(COLUMNAS_DATOS):
+                bloque[:, i] = columnas[columna][inicio:fin]
+            yield bloque
+        else:
+            yield pd.DataFrame(
+                {columna: np.asarray(columnas[columna][inicio:fin]) for columna in COLUMNAS_DATOS},
+                index=pd.RangeIndex(inicio, fin)
+            )
+
+def iterar_bloques_dataset(ruta, tamano_bloque=100000):
+    """
+    Recorre por bloques cualquier dataset en disco: CSV, dataset binario o un directorio
+    de particiones (parte-XXXXX.csv o parte-XXXXX/) como el que escribe generacion_paralela
+    """
+    if es_dataset_binario(ruta):
+        yield from iterar_bloques_binario(ruta, tamano_bloque)
+    elif os.path.isdir(ruta):
+        for nombre in sorted(os.listdir(ruta)):
+            if nombre.startswith("parte-") and not nombre.endswith(".tmp"):
+                yield from iterar_bloques_dataset(os.path.join(ruta, nombre), tamano_bloque)
+    else:
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque)
+
+def leer_dataset(ruta):
+    """
+    Lee un dataset de salarios en formato binario (directorio) o CSV
+    """
+    if es_dataset_binario(ruta):
+        return cargar_dataset_binario(ruta)
+    return pd.read_csv(ruta)
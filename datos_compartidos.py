@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# En Linux /dev/shm es memoria compartida (tmpfs): los memmaps no tocan el disco
+DIRECTORIO_BASE = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Margen sobre el tamaño de los arrays al comprobar el espacio libre (cabeceras .npy, otros procesos)
+MARGEN_ESPACIO = 1.1
+
+def _espacio_libre(directorio):
+    return shutil.disk_usage(directorio).free
+
+class ArraysCompartidos:
+    """
+    Publica arrays de numpy como .npy mapeados en memoria para compartirlos entre procesos
+
+    Los workers reciben solo el descriptor (directorio + nombres) y abren los arrays con
+    mmap en solo lectura, así que los datos no se copian ni se serializan en cada tarea.
+    Se usa como context manager: al salir se borran los archivos.
+
+    Los arrays se escriben en DIRECTORIO_BASE (/dev/shm) si caben; si no (p. ej. los 64 MB
+    por defecto de /dev/shm en Docker) se usa el directorio temporal del sistema, en disco,
+    con el mismo acceso por mmap.
+    """
+
+    def __init__(self, arrays):
+        arrays = {nombre: np.ascontiguousarray(array) for nombre, array in arrays.items()}
+        total = sum(array.nbytes for array in arrays.values())
+
+        candidatos = [None]
+        if DIRECTORIO_BASE is not None and _espacio_libre(DIRECTORIO_BASE) >= total * MARGEN_ESPACIO:
+            candidatos.insert(0, DIRECTORIO_BASE)
+
+        errores = []
+        for base in candidatos:
+            try:
+                self._publicar(base, arrays)
+                return
+            except OSError as error:
+                # Sin espacio (ENOSPC) u otro fallo de escritura: probar con el siguiente directorio
+                errores.append(f"{base or tempfile.gettempdir()}: {error}")
+
+        raise OSError(
+            f"No se pudieron compartir los arrays ({total / 1e6:,.1f} MB): " + "; ".join(errores)
+        )
+
+    def _publicar(self, base, arrays):
+        self.directorio = tempfile.mkdtemp(prefix="salarios-compartidos-", dir=base)
+        self.nombres = []
+        try:
+            for nombre, array in arrays.items():
+                np.save(os.path.join(self.directorio, f"{nombre}.npy"), array)
+                self.nombres.append(nombre)
+        except OSError:
+            self.cerrar()
+            raise
+
+    @property
+    def descriptor(self):
+        return (self.directorio, tuple(self.nombres))
+
+    def cerrar(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+def abrir_arrays_compartidos(descriptor):
+    """
+    Abre en solo lectura los arrays publicados por ArraysCompartidos (desde cualquier proceso)
+    """
+    directorio, nombres = descriptor
+    return {
+        nombre: np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode='r')
+        for nombre in nombres
+    }
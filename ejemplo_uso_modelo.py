@@ -2,40 +2,44 @@ import mlflow
 import numpy as np
 import pandas as pd
 from generate_synthetic_data import generate_synthetic_salary_data
+from prediccion_lote import predecir_salarios_lote
+from empleados import LoteEmpleados
+from cache_predicciones import predecir_salarios_cacheado
+from cache_modelos import cargar_modelo_cacheado
+from instrumentacion import medir
 
+@medir("ejemplo_uso_modelo.cargar_modelo")
 def cargar_modelo_entrenado(run_id):
     """
     Carga el modelo y scaler desde MLflow usando el run_id
+    
+    Si el run guarda el pipeline combinado, el modelo es el pipeline y el scaler es None
     """
     try:
-        modelo = mlflow.sklearn.load_model(f"runs:/{run_id}/modelo_regresion_lineal")
-        scaler = mlflow.sklearn.load_model(f"runs:/{run_id}/scaler")
+        # Ambos artefactos se cargan en paralelo y quedan en la cache del proceso
+        modelo, scaler = cargar_modelo_cacheado(run_id)
         print(f"Modelo cargado exitosamente desde run_id: {run_id}")
         return modelo, scaler
     except Exception as e:
         print(f"Error al cargar el modelo: {e}")
         return None, None
 
-def predecir_salario_empleado(modelo, scaler, datos_empleado):
+@medir("ejemplo_uso_modelo.predecir")
+def predecir_salario_empleado(modelo, scaler, datos_empleado, usar_cache=True):
     """
     Predice el salario de un empleado usando el modelo entrenado
     
     Args:
-        modelo: Modelo de regresión lineal entrenado
-        scaler: Scaler usado para normalizar los datos
+        modelo: Modelo de regresión lineal entrenado (o el pipeline combinado)
+        scaler: Scaler usado para normalizar los datos (None con el pipeline combinado)
         datos_empleado: Lista con [edad, experiencia_anos, educacion_anos, 
                                   horas_trabajo, proyectos_completados, certificaciones]
+        usar_cache: Responder los perfiles repetidos desde la cache de predicciones
     """
-    # Convertir a array numpy
-    datos_array = np.array([datos_empleado])
-    
-    # Normalizar datos
-    datos_scaled = scaler.transform(datos_array)
-    
-    # Hacer predicción
-    salario_predicho = modelo.predict(datos_scaled)[0]
-    
-    return salario_predicho
+    # Un empleado es un lote de una sola fila
+    if usar_cache:
+        return predecir_salarios_cacheado(modelo, scaler, [datos_empleado])[0]
+    return predecir_salarios_lote(modelo, scaler, [datos_empleado])[0]
 
 def ejemplo_predicciones_multiples(modelo, scaler):
     """
@@ -54,9 +58,10 @@ def ejemplo_predicciones_multiples(modelo, scaler):
     
     categorias = ["Junior", "Intermedio", "Senior", "Experto", "Muy Experto"]
     
-    for i, (empleado, categoria) in enumerate(zip(empleados, categorias)):
-        salario = predecir_salario_empleado(modelo, scaler, empleado)
-        
+    # Una sola llamada vectorizada para todos los empleados
+    salarios = predecir_salarios_cacheado(modelo, scaler, LoteEmpleados.desde_filas(empleados))
+    
+    for empleado, categoria, salario in zip(empleados, categorias, salarios):
         print(f"\n{categoria}:")
         print(f"  Edad: {empleado[0]} años")
         print(f"  Experiencia: {empleado[1]} años")
@@ -78,20 +83,17 @@ def comparar_con_datos_reales(modelo, scaler):
     # Tomar los primeros 5 registros
     muestra = data_test.head(5)
     
-    for idx, row in muestra.iterrows():
-        # Datos del empleado (sin salario)
-        datos_empleado = row.drop('salario').values
-        
-        # Salario real
-        salario_real = row['salario']
-        
-        # Salario predicho
-        salario_predicho = predecir_salario_empleado(modelo, scaler, datos_empleado)
-        
-        # Calcular diferencia
-        diferencia = abs(salario_real - salario_predicho)
-        porcentaje_error = (diferencia / salario_real) * 100
-        
+    # Predecir todos los registros de una vez (se ignora la columna 'salario')
+    salarios_predichos = predecir_salarios_lote(modelo, scaler, muestra)
+    salarios_reales = muestra['salario'].to_numpy()
+    
+    # Calcular diferencias de forma vectorizada
+    diferencias = np.abs(salarios_reales - salarios_predichos)
+    porcentajes_error = (diferencias / salarios_reales) * 100
+    
+    for idx, salario_real, salario_predicho, diferencia, porcentaje_error in zip(
+        muestra.index, salarios_reales, salarios_predichos, diferencias, porcentajes_error
+    ):
         print(f"\nEmpleado {idx + 1}:")
         print(f"  Salario real: ${salario_real:,.2f}")
         print(f"  Salario predicho: ${salario_predicho:,.2f}")
@@ -110,7 +112,7 @@ def main():
     # Cargar modelo
     modelo, scaler = cargar_modelo_entrenado(run_id)
     
-    if modelo is None or scaler is None:
+    if modelo is None:
         print("No se pudo cargar el modelo. Asegúrate de:")
         print("1. Haber ejecutado primero mlflow_regression_example.py")
         print("2. Usar el run_id correcto")
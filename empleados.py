@@ -0,0 +1,191 @@
+import numpy as np
+
+from prediccion_lote import COLUMNAS_FEATURES
+
+N_FEATURES = len(COLUMNAS_FEATURES)
+
+# Columnas de conteo: solo admiten valores enteros
+COLUMNAS_CONTEO = ('proyectos_completados', 'certificaciones')
+_INDICES_CONTEO = [COLUMNAS_FEATURES.index(columna) for columna in COLUMNAS_CONTEO]
+
+def _conteo(nombre, valor):
+    """
+    Convierte un conteo a int sin truncar: como en EsquemaEmpleado, 3.7 no es un valor válido
+    """
+    numero = float(valor)
+    if not numero.is_integer():
+        raise ValueError(f"{nombre} debe ser un número entero, se recibió {valor!r}")
+    return int(numero)
+
+class Empleado:
+    """
+    Datos de un empleado con un atributo por feature (sin __dict__ por instancia)
+
+    Se comporta como la secuencia [edad, experiencia, educacion, horas, proyectos,
+    certificaciones], así que se puede pasar donde antes se pasaba esa lista.
+    """
+
+    __slots__ = tuple(COLUMNAS_FEATURES)
+
+    def __init__(self, edad, experiencia_anos, educacion_anos, horas_trabajo, proyectos_completados,
+                 certificaciones):
+        self.edad = float(edad)
+        self.experiencia_anos = float(experiencia_anos)
+        self.educacion_anos = float(educacion_anos)
+        self.horas_trabajo = float(horas_trabajo)
+        self.proyectos_completados = _conteo(COLUMNAS_CONTEO[0], proyectos_completados)
+        self.certificaciones = _conteo(COLUMNAS_CONTEO[1], certificaciones)
+
+    @classmethod
+    def desde_secuencia(cls, valores):
+        """
+        Crea un empleado a partir de una secuencia en el orden de COLUMNAS_FEATURES
+        """
+        valores = list(valores)
+        if len(valores) != N_FEATURES:
+            raise ValueError(f"Se esperaban {N_FEATURES} valores ({', '.join(COLUMNAS_FEATURES)}), "
+                             f"se recibieron {len(valores)}")
+        return cls(*valores)
+
+    def como_tupla(self):
+        return tuple(getattr(self, columna) for columna in COLUMNAS_FEATURES)
+
+    def __len__(self):
+        return N_FEATURES
+
+    def __getitem__(self, indice):
+        return self.como_tupla()[indice]
+
+    def __iter__(self):
+        return iter(self.como_tupla())
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.como_tupla(), dtype=dtype or np.float64)
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Empleado):
+            return NotImplemented
+        return self.como_tupla() == otro.como_tupla()
+
+    def __hash__(self):
+        # Coherente con __eq__; no modificar un empleado mientras esté en un set o como clave de dict
+        return hash(self.como_tupla())
+
+    def __repr__(self):
+        campos = ", ".join(f"{columna}={getattr(self, columna)!r}" for columna in COLUMNAS_FEATURES)
+        return f"Empleado({campos})"
+
+class LoteEmpleados:
+    """
+    Lote de empleados guardado en una matriz float64 (capacidad x features) reservada de antemano
+
+    Las filas se escriben directamente en el buffer (agregar/extender) y la capacidad se
+    duplica cuando se llena. La propiedad matriz (y np.asarray(lote)) devuelve una vista de las
+    filas ocupadas, sin copia, lista para PredictorFusionado.predecir o convertir_a_matriz.
+    vaciar() reutiliza el mismo buffer para el siguiente lote.
+    """
+
+    def __init__(self, capacidad=64):
+        self._datos = np.empty((max(capacidad, 1), N_FEATURES), dtype=np.float64)
+        self.n = 0
+
+    @classmethod
+    def desde_filas(cls, filas):
+        """
+        Crea un lote con las filas indicadas (matriz, DataFrame o iterable de empleados/listas)
+        """
+        if not isinstance(filas, np.ndarray) and not hasattr(filas, 'columns'):
+            filas = list(filas)
+        lote = cls(len(filas))
+        lote.extender(filas)
+        return lote
+
+    @property
+    def capacidad(self):
+        return self._datos.shape[0]
+
+    @property
+    def matriz(self):
+        return self._datos[:self.n]
+
+    def columna(self, nombre):
+        """
+        Vista (sin copia) de una columna de las filas ocupadas
+        """
+        return self._datos[:self.n, COLUMNAS_FEATURES.index(nombre)]
+
+    def _reservar(self, n_filas):
+        if n_filas <= self.capacidad:
+            return
+        nuevos = np.empty((max(n_filas, 2 * self.capacidad), N_FEATURES), dtype=np.float64)
+        nuevos[:self.n] = self._datos[:self.n]
+        self._datos = nuevos
+
+    @staticmethod
+    def _validar(filas):
+        if filas.ndim != 2 or filas.shape[1] != N_FEATURES:
+            raise ValueError(f"Se esperaban filas con {N_FEATURES} valores ({', '.join(COLUMNAS_FEATURES)}), "
+                             f"se recibió forma {filas.shape}")
+        if not np.isfinite(filas).all():
+            raise ValueError("Los datos de los empleados contienen valores no finitos (NaN o infinito)")
+        # Misma regla que Empleado: un lote aceptado siempre se puede recorrer como empleados
+        conteos = filas[:, _INDICES_CONTEO]
+        no_enteros = (conteos != np.round(conteos)).any(axis=0)
+        if no_enteros.any():
+            columnas = [columna for columna, error in zip(COLUMNAS_CONTEO, no_enteros) if error]
+            raise ValueError(f"{', '.join(columnas)} debe ser un número entero")
+
+    def agregar(self, empleado):
+        """
+        Añade un empleado (Empleado o secuencia de 6 valores)
+        """
+        fila = np.asarray(empleado, dtype=np.float64).reshape(1, -1)
+        self._validar(fila)
+        self._reservar(self.n + 1)
+        self._datos[self.n] = fila[0]
+        self.n += 1
+        return self
+
+    def extender(self, filas):
+        """
+        Añade varias filas con una sola copia (matriz 2-D, DataFrame o iterable de empleados)
+        """
+        if hasattr(filas, 'columns'):
+            filas = filas[COLUMNAS_FEATURES].to_numpy(dtype=np.float64)
+        elif not isinstance(filas, np.ndarray):
+            filas = list(filas)
+            if not filas:
+                return self
+        filas = np.asarray(filas, dtype=np.float64)
+        if filas.ndim == 1:
+            filas = filas.reshape(1, -1)
+
+        self._validar(filas)
+        self._reservar(self.n + filas.shape[0])
+        self._datos[self.n:self.n + filas.shape[0]] = filas
+        self.n += filas.shape[0]
+        return self
+
+    def vaciar(self):
+        self.n = 0
+        return self
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            # Un tramo es un lote nuevo con sus filas copiadas
+            return LoteEmpleados.desde_filas(self.matriz[indice])
+        if not -self.n <= indice < self.n:
+            raise IndexError(f"Índice fuera del lote: {indice}")
+        return Empleado.desde_secuencia(self._datos[indice % self.n].tolist())
+
+    def __iter__(self):
+        for fila in self.matriz.tolist():
+            yield Empleado(*fila)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype) != np.float64:
+            return self.matriz.astype(dtype)
+        return self.matriz.copy() if copy else self.matriz
@@ -0,0 +1,234 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from generate_synthetic_data import generar_datos_sinteticos_por_bloques
+from metricas_streaming import AcumuladorMetricas
+from prediccion_lote import COLUMNAS_FEATURES
+
+class EstadisticosSuficientes:
+    """
+    Estadísticos suficientes de una regresión lineal acumulados en una sola pasada
+
+    Guarda el número de filas, las medias de X e y, la matriz de co-momentos centrados
+    Σ(x - x̄)(x - x̄)ᵀ y el vector Σ(x - x̄)(y - ȳ). Los bloques se combinan con la fórmula
+    de Chan et al., que es numéricamente estable, y la memoria es O(features²).
+    Si los bloques traen nombres de columnas (DataFrames) se guardan en columnas.
+    """
+
+    def __init__(self, n_features=len(COLUMNAS_FEATURES)):
+        self.n = 0
+        self.media_x = np.zeros(n_features)
+        self.media_y = 0.0
+        self.comomentos_xx = np.zeros((n_features, n_features))
+        self.comomentos_xy = np.zeros(n_features)
+        self.suma_cuadrados_y = 0.0
+        self.columnas = None
+
+    def _combinar(self, n, media_x, media_y, comomentos_xx, comomentos_xy, suma_cuadrados_y):
+        if n == 0:
+            return
+        if self.n == 0:
+            self.n = n
+            self.media_x = media_x.copy()
+            self.media_y = media_y
+            self.comomentos_xx = comomentos_xx.copy()
+            self.comomentos_xy = comomentos_xy.copy()
+            self.suma_cuadrados_y = suma_cuadrados_y
+            return
+
+        n_total = self.n + n
+        factor = self.n * n / n_total
+        delta_x = media_x - self.media_x
+        delta_y = media_y - self.media_y
+
+        self.comomentos_xx += comomentos_xx + np.outer(delta_x, delta_x) * factor
+        self.comomentos_xy += comomentos_xy + delta_x * (delta_y * factor)
+        self.suma_cuadrados_y += suma_cuadrados_y + delta_y * delta_y * factor
+        self.media_x += delta_x * (n / n_total)
+        self.media_y += delta_y * (n / n_total)
+        self.n = n_total
+
+    def actualizar(self, X, y):
+        """
+        Incorpora un bloque de filas (X: n x features, y: n)
+        """
+        if hasattr(X, 'columns'):
+            self.columnas = list(X.columns)
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if X.shape[0] == 0:
+            return self
+
+        media_x = X.mean(axis=0)
+        media_y = float(y.mean())
+        X_centrado = X - media_x
+        y_centrado = y - media_y
+
+        self._combinar(
+            X.shape[0],
+            media_x,
+            media_y,
+            X_centrado.T @ X_centrado,
+            X_centrado.T @ y_centrado,
+            float(y_centrado @ y_centrado)
+        )
+        return self
+
+    def combinar(self, otro):
+        """
+        Incorpora los estadísticos acumulados por otro objeto (p. ej. de otro worker)
+        """
+        if self.columnas is None:
+            self.columnas = otro.columnas
+        self._combinar(
+            otro.n, otro.media_x, otro.media_y,
+            otro.comomentos_xx, otro.comomentos_xy, otro.suma_cuadrados_y
+        )
+        return self
+
+    def construir_modelos(self, columnas=None):
+        """
+        Resuelve la regresión y devuelve un (LinearRegression, StandardScaler) ya ajustados
+
+        Los objetos son equivalentes a ajustar StandardScaler sobre todas las filas y
+        LinearRegression sobre los datos escalados, como hace entrenar_modelo_regresion_lineal.
+        El scaler solo lleva feature_names_in_ si se indican columnas o los bloques eran
+        DataFrames; con matrices sklearn avisaría en cada predict sin nombres.
+        """
+        columnas = columnas if columnas is not None else self.columnas
+        if self.n == 0:
+            raise ValueError("No hay filas acumuladas para entrenar el modelo")
+
+        # Scaler: varianza poblacional, igual que StandardScaler
+        varianza = np.diag(self.comomentos_xx) / self.n
+        escala = np.sqrt(varianza)
+        escala[escala == 0.0] = 1.0
+
+        scaler = StandardScaler()
+        scaler.mean_ = self.media_x.copy()
+        scaler.var_ = varianza
+        scaler.scale_ = escala
+        scaler.n_samples_seen_ = np.int64(self.n)
+        scaler.n_features_in_ = len(escala)
+        if columnas is not None:
+            scaler.feature_names_in_ = np.asarray(columnas, dtype=object)
+
+        # Ecuaciones normales en el espacio escalado (mejor condicionadas que en el original)
+        comomentos_xx_escalados = self.comomentos_xx / np.outer(escala, escala)
+        comomentos_xy_escalados = self.comomentos_xy / escala
+        coef, _, rango, singulares = np.linalg.lstsq(
+            comomentos_xx_escalados, comomentos_xy_escalados, rcond=None
+        )
+
+        modelo = LinearRegression(fit_intercept=True, copy_X=True, n_jobs=-1, positive=False)
+        modelo.coef_ = coef
+        # Los datos escalados tienen media cero, así que el intercepto es la media de y
+        modelo.intercept_ = self.media_y
+        modelo.rank_ = int(rango)
+        modelo.singular_ = singulares
+        modelo.n_features_in_ = len(coef)
+
+        return modelo, scaler
+
+def _separar_bloque(bloque, columna_objetivo):
+    """
+    Separa un bloque en (X, y). Acepta DataFrames o matrices con el objetivo en la última columna
+    """
+    if isinstance(bloque, pd.DataFrame):
+        # X se devuelve como DataFrame para que EstadisticosSuficientes guarde los nombres
+        return bloque[COLUMNAS_FEATURES], bloque[columna_objetivo].to_numpy(dtype=np.float64)
+
+    bloque = np.asarray(bloque, dtype=np.float64)
+    return bloque[:, :-1], bloque[:, -1]
+
+def entrenar_modelo_incremental(bloques, columna_objetivo='salario'):
+    """
+    Entrena la regresión lineal fuera de memoria en una sola pasada sobre los bloques
+
+    Args:
+        bloques: Iterable de DataFrames o matrices (n x 7) con el salario en la última columna,
+                 p. ej. generar_datos_sinteticos_por_bloques o dataset_binario.iterar_bloques_dataset
+        columna_objetivo: Nombre de la columna objetivo en los DataFrames
+
+    Returns:
+        (modelo, scaler, estadisticos)
+    """
+    estadisticos = EstadisticosSuficientes()
+    for bloque in bloques:
+        X, y = _separar_bloque(bloque, columna_objetivo)
+        estadisticos.actualizar(X, y)
+
+    modelo, scaler = estadisticos.construir_modelos()
+    return modelo, scaler, estadisticos
+
+def evaluar_modelo_incremental(predictor, bloques, columna_objetivo='salario', acumulador=None):
+    """
+    Evalúa un predictor fuera de memoria en una sola pasada sobre los bloques
+
+    Args:
+        predictor: Objeto con predecir(X), p. ej. PredictorFusionado
+        bloques: Iterable de DataFrames o matrices (n x 7) con el salario en la última columna
+        columna_objetivo: Nombre de la columna objetivo en los DataFrames
+        acumulador: AcumuladorMetricas a continuar (p. ej. para combinar varios workers)
+
+    Returns:
+        AcumuladorMetricas con las métricas acumuladas (ver AcumuladorMetricas.metricas)
+    """
+    acumulador = acumulador or AcumuladorMetricas()
+    for bloque in bloques:
+        X, y = _separar_bloque(bloque, columna_objetivo)
+        acumulador.actualizar(y, predictor.predecir(X))
+    return acumulador
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entrena el modelo de salarios en streaming, sin cargar el dataset en memoria"
+    )
+    origen = parser.add_mutually_exclusive_group(required=True)
+    origen.add_argument("--datos", help="Dataset en disco (CSV, binario o directorio de particiones)")
+    origen.add_argument("--n-samples", type=int, help="Generar este número de filas sintéticas")
+    parser.add_argument("--tamano-bloque", type=int, default=100000, help="Filas por bloque")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla para los datos sintéticos")
+    parser.add_argument("--exportar", help="Guardar el predictor fusionado (.npz) en esta ruta")
+    parser.add_argument("--evaluar", help="Dataset de prueba en disco para evaluar el modelo en streaming")
+    args = parser.parse_args()
+
+    if args.datos:
+        from dataset_binario import iterar_bloques_dataset
+        bloques = iterar_bloques_dataset(args.datos, args.tamano_bloque)
+    else:
+        bloques = generar_datos_sinteticos_por_bloques(
+            args.n_samples, tamano_bloque=args.tamano_bloque, semilla=args.semilla, como_array=True
+        )
+
+    print("Entrenando modelo de regresión lineal en streaming...")
+    modelo, scaler, estadisticos = entrenar_modelo_incremental(bloques)
+
+    print(f"Filas procesadas: {estadisticos.n:,}")
+    print(f"Intercepto: {modelo.intercept_:.2f}")
+    for columna, coef in zip(COLUMNAS_FEATURES, modelo.coef_):
+        print(f"- {columna}: {coef:.2f}")
+
+    if args.exportar or args.evaluar:
+        from predictor_fusionado import PredictorFusionado
+        fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+
+    if args.exportar:
+        fusionado.guardar(args.exportar)
+        print(f"Predictor fusionado guardado en '{args.exportar}'")
+
+    if args.evaluar:
+        from dataset_binario import iterar_bloques_dataset
+        print("Evaluando modelo en streaming...")
+        metricas = evaluar_modelo_incremental(
+            fusionado, iterar_bloques_dataset(args.evaluar, args.tamano_bloque)
+        ).metricas()
+        for nombre, valor in metricas.items():
+            print(f"- {nombre}: {valor:.4f}")
+
+if __name__ == "__main__":
+    main()
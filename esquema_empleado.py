@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+import numpy as np
+
+from dataset_binario import TIPOS_COLUMNAS
+from generate_synthetic_data import LIMITES_FEATURES
+from prediccion_lote import COLUMNAS_FEATURES, convertir_a_matriz
+
+# Definición de una feature: nombre de columna, tipo numpy, rango [minimo, maximo]
+# (None = sin límite) y textos para pedir el valor por consola
+CampoEmpleado = namedtuple('CampoEmpleado', ['nombre', 'tipo', 'minimo', 'maximo', 'etiqueta', 'unidad'])
+
+# Textos de cada campo para la entrada interactiva: (etiqueta, unidad del rango)
+_TEXTOS_CAMPOS = {
+    'edad': ("Edad", " años"),
+    'experiencia_anos': ("Años de experiencia laboral", ""),
+    'educacion_anos': ("Años de educación formal", ""),
+    'horas_trabajo': ("Horas trabajadas por semana", ""),
+    'proyectos_completados': ("Número de proyectos completados", ""),
+    'certificaciones': ("Número de certificaciones obtenidas", "")
+}
+
+class EsquemaEmpleado:
+    """
+    Esquema declarativo de las features de un empleado con validación vectorizada
+
+    validar() comprueba un lote entero de una vez y devuelve por fila una máscara de bits:
+    el bit i está activo si el valor de la columna i (en el orden de COLUMNAS_FEATURES) no
+    es finito, está fuera de [minimo, maximo] o no es entero en una columna de conteo.
+    """
+
+    def __init__(self, campos):
+        self.campos = list(campos)
+        self.minimos = np.array([-np.inf if c.minimo is None else c.minimo for c in self.campos], dtype=np.float64)
+        self.maximos = np.array([np.inf if c.maximo is None else c.maximo for c in self.campos], dtype=np.float64)
+        self.enteros = np.array([np.dtype(c.tipo).kind in 'iu' for c in self.campos])
+        self.bits = (1 << np.arange(len(self.campos))).astype(np.uint8)
+
+    def texto_rango(self, campo):
+        if campo.maximo is None:
+            return f">= {campo.minimo:g}"
+        return f"{campo.minimo:g}-{campo.maximo:g}{campo.unidad}"
+
+    def pregunta(self, campo):
+        """
+        Texto para pedir el valor de un campo por consola, p. ej. "• Edad (22-65 años): "
+        """
+        return f"• {campo.etiqueta} ({self.texto_rango(campo)}): "
+
+    def convertir_valor(self, campo, texto):
+        """
+        Convierte el texto introducido al tipo del campo (lanza ValueError si no es numérico)
+        """
+        return int(texto) if np.dtype(campo.tipo).kind in 'iu' else float(texto)
+
+    def validar(self, datos):
+        """
+        Devuelve un array uint8 con la máscara de violaciones de cada fila (0 = fila válida)
+
+        Args:
+            datos: Matriz 2-D, DataFrame, LoteEmpleados, Empleado o iterable de filas
+        """
+        matriz = convertir_a_matriz(datos)
+        invalidos = ~np.isfinite(matriz)
+        # Las comparaciones con NaN son False: esos valores ya están marcados como no finitos
+        invalidos |= matriz < self.minimos
+        invalidos |= matriz > self.maximos
+        invalidos |= self.enteros & (matriz != np.round(matriz))
+        return invalidos.astype(np.uint8) @ self.bits
+
+    def filas_validas(self, datos):
+        """
+        Máscara booleana de las filas que cumplen el esquema
+        """
+        return self.validar(datos) == 0
+
+    def recortar(self, datos, out=None):
+        """
+        Recorta cada columna a su rango y redondea los conteos (los valores no finitos no cambian)
+        """
+        matriz = convertir_a_matriz(datos)
+        recortada = np.clip(matriz, self.minimos, self.maximos, out=out)
+        recortada[:, self.enteros] = np.round(recortada[:, self.enteros])
+        return recortada
+
+    def describir(self, mascara):
+        """
+        Devuelve los campos que incumple una fila a partir de su máscara de violaciones
+        """
+        return [campo for campo, bit in zip(self.campos, self.bits.tolist()) if int(mascara) & bit]
+
+    def contar_violaciones(self, mascaras):
+        """
+        Cuenta cuántas filas incumplen cada campo
+        """
+        mascaras = np.asarray(mascaras, dtype=np.uint8)
+        return {campo.nombre: int(np.count_nonzero(mascaras & bit)) for campo, bit in zip(self.campos, self.bits.tolist())}
+
+# Esquema derivado de los rangos del generador de datos sintéticos y de los tipos del formato binario
+ESQUEMA_EMPLEADO = EsquemaEmpleado(
+    CampoEmpleado(columna, TIPOS_COLUMNAS[columna], *LIMITES_FEATURES[columna], *_TEXTOS_CAMPOS[columna])
+    for columna in COLUMNAS_FEATURES
+)
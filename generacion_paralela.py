@@ -0,0 +1,117 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_synthetic_data import generar_datos_sinteticos_por_bloques
+from dataset_binario import escribir_dataset_binario
+
+# Filas por partición escrita en disco. No depende del número de procesos,
+# por eso el dataset resultante es idéntico byte a byte con cualquier número de workers.
+FILAS_POR_PARTICION = 1000000
+
+def _nombre_particion(indice, formato):
+    if formato == 'csv':
+        return f"parte-{indice:05d}.csv"
+    return f"parte-{indice:05d}"
+
+def _escribir_particion(n_samples, semilla, indice, filas_por_particion, directorio, tamano_bloque,
+                        formato):
+    """
+    Genera y escribe en disco la partición indicada (se ejecuta dentro de un proceso worker)
+    """
+    fila_inicial = indice * filas_por_particion
+    fila_final = min(fila_inicial + filas_por_particion, n_samples)
+    ruta = os.path.join(directorio, _nombre_particion(indice, formato))
+
+    bloques = generar_datos_sinteticos_por_bloques(
+        n_samples,
+        tamano_bloque=tamano_bloque,
+        semilla=semilla,
+        fila_inicial=fila_inicial,
+        fila_final=fila_final,
+        como_array=(formato == 'binario')
+    )
+
+    if formato == 'binario':
+        escribir_dataset_binario(bloques, ruta, fila_final - fila_inicial)
+        return ruta, fila_final - fila_inicial
+
+    # Escribir a un archivo temporal y renombrar para no dejar particiones a medias
+    ruta_temporal = ruta + ".tmp"
+    with open(ruta_temporal, 'w', newline='') as archivo:
+        for i, bloque in enumerate(bloques):
+            bloque.to_csv(archivo, index=False, header=(i == 0))
+    os.replace(ruta_temporal, ruta)
+
+    return ruta, fila_final - fila_inicial
+
+def generar_datos_paralelo(n_samples, directorio, n_procesos=None, semilla=42,
+                           filas_por_particion=FILAS_POR_PARTICION, tamano_bloque=100000, formato='csv'):
+    """
+    Genera el dataset sintético repartiendo las particiones entre un pool de procesos
+
+    Cada partición cubre un rango fijo de filas y se genera con las semillas derivadas de
+    generar_datos_sinteticos_por_bloques, así que la misma semilla produce los mismos archivos
+    sea cual sea n_procesos.
+
+    Args:
+        n_samples: Número total de filas
+        directorio: Directorio donde se escriben las particiones parte-XXXXX
+        n_procesos: Número de procesos worker (por defecto, todos los núcleos)
+        semilla: Semilla raíz del dataset
+        filas_por_particion: Filas de cada archivo de partición
+        tamano_bloque: Filas generadas y escritas de una vez dentro de cada worker
+        formato: 'csv' o 'binario' (un directorio por partición con un .npy tipado por columna)
+    """
+    if formato not in ('csv', 'binario'):
+        raise ValueError(f"Formato no soportado: {formato}")
+
+    os.makedirs(directorio, exist_ok=True)
+    n_particiones = (n_samples + filas_por_particion - 1) // filas_por_particion
+
+    with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+        futuros = [
+            pool.submit(
+                _escribir_particion,
+                n_samples, semilla, indice, filas_por_particion, directorio, tamano_bloque, formato
+            )
+            for indice in range(n_particiones)
+        ]
+        rutas = [futuro.result()[0] for futuro in futuros]
+
+    return rutas
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Genera datos sintéticos de salarios en paralelo, particionados en disco"
+    )
+    parser.add_argument("n_samples", type=int, help="Número total de filas a generar")
+    parser.add_argument("--directorio", default="datos_salarios_particionados",
+                        help="Directorio de salida")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Número de procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla raíz")
+    parser.add_argument("--filas-por-particion", type=int, default=FILAS_POR_PARTICION,
+                        help="Filas por archivo de partición")
+    parser.add_argument("--formato", choices=["csv", "binario"], default="csv",
+                        help="Formato de las particiones")
+    args = parser.parse_args()
+
+    print(f"Generando {args.n_samples:,} filas en '{args.directorio}'...")
+    inicio = time.perf_counter()
+    rutas = generar_datos_paralelo(
+        args.n_samples,
+        args.directorio,
+        n_procesos=args.procesos,
+        semilla=args.semilla,
+        filas_por_particion=args.filas_por_particion,
+        formato=args.formato
+    )
+    duracion = time.perf_counter() - inicio
+
+    print(f"Particiones escritas: {len(rutas)}")
+    print(f"Tiempo: {duracion:.2f} s ({args.n_samples / max(duracion, 1e-9):,.0f} filas/s)")
+
+if __name__ == "__main__":
+    main()
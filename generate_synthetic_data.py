@@ -1,21 +1,39 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
+from instrumentacion import medir
 
-def generate_synthetic_salary_data(n_samples=1000):
+# Columnas del dataset en el orden en que se generan
+COLUMNAS_DATOS = [
+    'edad',
+    'experiencia_anos',
+    'educacion_anos',
+    'horas_trabajo',
+    'proyectos_completados',
+    'certificaciones',
+    'salario'
+]
+
+# Rango (mínimo, máximo) de cada variable independiente; None = sin límite.
+# Las variables continuas se recortan a estos rangos y los conteos (Poisson) nunca son negativos.
+LIMITES_FEATURES = {
+    'edad': (22, 65),
+    'experiencia_anos': (0, 35),
+    'educacion_anos': (12, 22),
+    'horas_trabajo': (30, 60),
+    'proyectos_completados': (0, None),
+    'certificaciones': (0, None)
+}
+
+# Filas generadas con cada semilla derivada en el modo por bloques.
+# Es parte del formato: cambiarlo cambia los datos generados para una misma semilla.
+FILAS_POR_FRAGMENTO = 65536
+
+def _calcular_salario(edad, experiencia_anos, educacion_anos, proyectos_completados,
+                      certificaciones, ruido):
     """
-    Genera datos sintéticos realistas para predecir salario basado en características del empleado.
+    Calcula el salario a partir de las variables independientes y el ruido
     """
-    np.random.seed(42)
-    
-    # Variables independientes
-    edad = np.random.normal(35, 10, n_samples).clip(22, 65)
-    experiencia_anos = np.random.normal(8, 6, n_samples).clip(0, 35)
-    educacion_anos = np.random.normal(16, 2, n_samples).clip(12, 22)
-    horas_trabajo = np.random.normal(40, 5, n_samples).clip(30, 60)
-    proyectos_completados = np.random.poisson(15, n_samples)
-    certificaciones = np.random.poisson(3, n_samples)
-    
     # Crear correlaciones realistas
     # El salario base depende de la experiencia y educación
     salario_base = 30000 + (experiencia_anos * 2500) + (educacion_anos * 1500)
@@ -29,9 +47,29 @@ def generate_synthetic_salary_data(n_samples=1000):
     
     # Salario final con ruido
     salario = (salario_base + bonus_proyectos + bonus_certificaciones) * factor_edad
-    ruido = np.random.normal(0, 5000, n_samples)
     salario = salario + ruido
-    salario = salario.clip(25000, 150000)
+    return salario.clip(25000, 150000)
+
+@medir("datos.generar")
+def generate_synthetic_salary_data(n_samples=1000):
+    """
+    Genera datos sintéticos realistas para predecir salario basado en características del empleado.
+    """
+    # Generador propio con la misma secuencia que np.random.seed(42), sin alterar el estado global
+    rng = np.random.RandomState(42)
+    
+    # Variables independientes
+    edad = rng.normal(35, 10, n_samples).clip(*LIMITES_FEATURES['edad'])
+    experiencia_anos = rng.normal(8, 6, n_samples).clip(*LIMITES_FEATURES['experiencia_anos'])
+    educacion_anos = rng.normal(16, 2, n_samples).clip(*LIMITES_FEATURES['educacion_anos'])
+    horas_trabajo = rng.normal(40, 5, n_samples).clip(*LIMITES_FEATURES['horas_trabajo'])
+    proyectos_completados = rng.poisson(15, n_samples)
+    certificaciones = rng.poisson(3, n_samples)
+    
+    ruido = rng.normal(0, 5000, n_samples)
+    salario = _calcular_salario(
+        edad, experiencia_anos, educacion_anos, proyectos_completados, certificaciones, ruido
+    )
     
     # Crear DataFrame
     data = pd.DataFrame({
@@ -46,15 +84,125 @@ def generate_synthetic_salary_data(n_samples=1000):
     
     return data
 
-def save_synthetic_data():
+def _generar_fragmento(semilla, indice_fragmento, n_filas):
+    """
+    Genera un fragmento de filas como matriz (n_filas x 7) con su propia semilla derivada
+
+    Cada fragmento usa SeedSequence(semilla, spawn_key=(indice_fragmento,)) y un generador
+    independiente por columna, de modo que su contenido solo depende de la semilla y del índice.
     """
-    Genera y guarda los datos sintéticos en CSV
+    semillas = np.random.SeedSequence(semilla, spawn_key=(indice_fragmento,)).spawn(len(COLUMNAS_DATOS))
+    rng_edad, rng_exp, rng_edu, rng_horas, rng_proy, rng_cert, rng_ruido = [
+        np.random.default_rng(s) for s in semillas
+    ]
+    
+    fragmento = np.empty((n_filas, len(COLUMNAS_DATOS)), dtype=np.float64)
+    edad = rng_edad.normal(35, 10, n_filas).clip(*LIMITES_FEATURES['edad'])
+    experiencia_anos = rng_exp.normal(8, 6, n_filas).clip(*LIMITES_FEATURES['experiencia_anos'])
+    educacion_anos = rng_edu.normal(16, 2, n_filas).clip(*LIMITES_FEATURES['educacion_anos'])
+    horas_trabajo = rng_horas.normal(40, 5, n_filas).clip(*LIMITES_FEATURES['horas_trabajo'])
+    proyectos_completados = rng_proy.poisson(15, n_filas)
+    certificaciones = rng_cert.poisson(3, n_filas)
+    ruido = rng_ruido.normal(0, 5000, n_filas)
+    
+    salario = _calcular_salario(
+        edad, experiencia_anos, educacion_anos, proyectos_completados, certificaciones, ruido
+    )
+    
+    fragmento[:, 0] = edad.round(1)
+    fragmento[:, 1] = experiencia_anos.round(1)
+    fragmento[:, 2] = educacion_anos.round(1)
+    fragmento[:, 3] = horas_trabajo.round(1)
+    fragmento[:, 4] = proyectos_completados
+    fragmento[:, 5] = certificaciones
+    fragmento[:, 6] = salario.round(2)
+    
+    return fragmento
+
+def _matriz_a_dataframe(matriz, inicio=0):
+    """
+    Convierte una matriz (n x 7) del modo por bloques al mismo DataFrame que generate_synthetic_salary_data
+    """
+    data = pd.DataFrame(
+        matriz,
+        columns=COLUMNAS_DATOS,
+        index=pd.RangeIndex(inicio, inicio + matriz.shape[0])
+    )
+    return data.astype({'proyectos_completados': np.int64, 'certificaciones': np.int64})
+
+def generar_datos_sinteticos_por_bloques(n_samples, tamano_bloque=100000, semilla=42, como_array=False,
+                                         fila_inicial=0, fila_final=None):
+    """
+    Genera datos sintéticos por bloques con memoria acotada, sin tocar el estado global de numpy
+
+    La salida concatenada es la misma para cualquier tamano_bloque: los datos se generan en
+    fragmentos de FILAS_POR_FRAGMENTO filas con semillas derivadas de forma determinista, y
+    los bloques solo deciden cómo se reparten esas filas. La memoria usada no depende de n_samples.
+
+    Args:
+        n_samples: Número total de filas a generar
+        tamano_bloque: Número de filas de cada bloque devuelto
+        semilla: Semilla raíz de la secuencia
+        como_array: Si es True devuelve matrices (n x 7) en el orden de COLUMNAS_DATOS
+                    en lugar de DataFrames
+        fila_inicial, fila_final: Subrango [fila_inicial, fila_final) del dataset a generar,
+                                  útil para repartir la generación entre procesos
+    """
+    if tamano_bloque <= 0:
+        raise ValueError("tamano_bloque debe ser positivo")
+    
+    if fila_final is None:
+        fila_final = n_samples
+    fila_final = min(fila_final, n_samples)
+    
+    indice_actual = -1
+    fragmento = None
+    
+    for inicio in range(fila_inicial, fila_final, tamano_bloque):
+        fin = min(inicio + tamano_bloque, fila_final)
+        piezas = []
+        posicion = inicio
+        
+        while posicion < fin:
+            indice = posicion // FILAS_POR_FRAGMENTO
+            inicio_fragmento = indice * FILAS_POR_FRAGMENTO
+            if indice != indice_actual:
+                n_filas = min(FILAS_POR_FRAGMENTO, n_samples - inicio_fragmento)
+                fragmento = _generar_fragmento(semilla, indice, n_filas)
+                indice_actual = indice
+            
+            hasta = min(fin, inicio_fragmento + FILAS_POR_FRAGMENTO)
+            piezas.append(fragmento[posicion - inicio_fragmento:hasta - inicio_fragmento])
+            posicion = hasta
+        
+        bloque = piezas[0] if len(piezas) == 1 else np.concatenate(piezas)
+        
+        if como_array:
+            yield bloque
+        else:
+            yield _matriz_a_dataframe(bloque, inicio)
+
+def save_synthetic_data(formato='csv'):
+    """
+    Genera y guarda los datos sintéticos en CSV o en formato binario por columnas
+    
+    Args:
+        formato: 'csv' (datos_salarios_sinteticos.csv) o 'binario'
+                 (directorio datos_salarios_sinteticos/ con un .npy tipado por columna)
     """
     print("Generando datos sintéticos para predicción de salarios...")
     data = generate_synthetic_salary_data(1000)
     
-    # Guardar en CSV
-    data.to_csv('datos_salarios_sinteticos.csv', index=False)
+    if formato == 'csv':
+        # Guardar en CSV
+        destino = 'datos_salarios_sinteticos.csv'
+        data.to_csv(destino, index=False)
+    elif formato == 'binario':
+        from dataset_binario import guardar_dataset_binario
+        destino = 'datos_salarios_sinteticos'
+        guardar_dataset_binario(data, destino)
+    else:
+        raise ValueError(f"Formato no soportado: {formato}")
     
     print(f"Datos generados exitosamente:")
     print(f"- Filas: {len(data)}")
@@ -64,7 +212,7 @@ def save_synthetic_data():
     print("\nEstadísticas básicas:")
     print(data.describe())
     
-    print(f"\nDatos guardados en 'datos_salarios_sinteticos.csv'")
+    print(f"\nDatos guardados en '{destino}'")
     
     return data
 
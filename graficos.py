@@ -0,0 +1,86 @@
+import numpy as np
+
+from instrumentacion import medir
+
+# Por encima de este número de puntos el gráfico automático usa un histograma 2-D
+MAX_PUNTOS_DISPERSION = 5000
+
+# Celdas por eje del histograma 2-D
+CELDAS_HISTOGRAMA = 100
+
+def _muestra(y_real, y_pred, max_puntos, semilla):
+    if len(y_real) <= max_puntos:
+        return y_real, y_pred
+    indices = np.random.default_rng(semilla).choice(len(y_real), size=max_puntos, replace=False)
+    return y_real[indices], y_pred[indices]
+
+@medir("grafico.predicciones_vs_reales")
+def graficar_predicciones_vs_reales(y_real, y_pred, ruta, modo='auto', max_puntos=MAX_PUNTOS_DISPERSION,
+                                    celdas=CELDAS_HISTOGRAMA, semilla=0):
+    """
+    Dibuja predicciones frente a valores reales y guarda el gráfico en un PNG
+
+    El coste de dibujo no depende del tamaño del test: 'muestra' dibuja como mucho max_puntos
+    puntos elegidos al azar e 'histograma' agrupa todos los puntos en celdas x celdas
+    (np.histogram2d) y dibuja solo la rejilla. 'auto' usa la dispersión con todos los puntos
+    si hay como mucho max_puntos y el histograma en otro caso.
+
+    Usa la API orientada a objetos de matplotlib (sin pyplot), así que se puede llamar
+    desde un hilo en segundo plano.
+
+    Returns:
+        Ruta del PNG guardado
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import LogNorm
+    from matplotlib.figure import Figure
+
+    y_real = np.asarray(y_real, dtype=np.float64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+    if modo == 'auto':
+        modo = 'muestra' if len(y_real) <= max_puntos else 'histograma'
+
+    figura = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figura)
+    ejes = figura.add_subplot()
+
+    if modo == 'muestra':
+        x, y = _muestra(y_real, y_pred, max_puntos, semilla)
+        ejes.scatter(x, y, alpha=0.5)
+    elif modo == 'histograma':
+        conteos, bordes_x, bordes_y = np.histogram2d(y_real, y_pred, bins=celdas)
+        malla = ejes.pcolormesh(
+            bordes_x, bordes_y, np.ma.masked_equal(conteos.T, 0), norm=LogNorm(), cmap='viridis'
+        )
+        figura.colorbar(malla, ax=ejes, label='Empleados')
+    else:
+        raise ValueError(f"Modo de gráfico desconocido: {modo}")
+
+    minimo, maximo = y_real.min(), y_real.max()
+    ejes.plot([minimo, maximo], [minimo, maximo], 'r--', lw=2)
+    ejes.set_xlabel('Salario Real')
+    ejes.set_ylabel('Salario Predicho')
+    ejes.set_title(f'Predicciones vs Valores Reales (n={len(y_real):,})')
+    figura.tight_layout()
+
+    figura.savefig(ruta)
+    return ruta
+
+def registrar_grafico_predicciones(registro, y_real, y_pred, nombre='predicciones_vs_reales.png', **opciones):
+    """
+    Dibuja y sube el gráfico de predicciones al run en segundo plano
+
+    Args:
+        registro: BufferRegistroMLflow del run; el PNG se escribe en su directorio temporal
+        opciones: Argumentos de graficar_predicciones_vs_reales (modo, max_puntos, ...)
+
+    Returns:
+        Future de la tarea
+    """
+    ruta = registro.ruta_temporal(nombre)
+
+    def dibujar_y_subir():
+        graficar_predicciones_vs_reales(y_real, y_pred, ruta, **opciones)
+        registro.cliente.log_artifact(registro.run_id, ruta)
+
+    return registro.en_segundo_plano(dibujar_y_subir)
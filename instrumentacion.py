@@ -0,0 +1,199 @@
+import atexit
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+
+# Variable de entorno para activar la instrumentación sin tocar el código, p. ej.:
+#   SALARIOS_INSTRUMENTACION="json:tiempos.jsonl,prometheus:tiempos.prom,mlflow"
+VARIABLE_ENTORNO = "SALARIOS_INSTRUMENTACION"
+
+# Prefijo de las métricas exportadas
+PREFIJO_METRICAS = "salarios_tramo"
+
+class ExportadorMLflow:
+    """
+    Registra el tiempo total de cada tramo como métrica de MLflow: a través del registro
+    indicado (p. ej. BufferRegistroMLflow) o, si no hay, en el run activo
+    """
+
+    def exportar(self, resumen, registro=None):
+        if not resumen:
+            return
+        metricas = {f"tiempo_{nombre}_s": datos['total_s'] for nombre, datos in resumen.items()}
+        if registro is not None:
+            registro.log_metrics(metricas)
+            return
+
+        import mlflow
+
+        if mlflow.active_run() is not None:
+            mlflow.log_metrics(metricas)
+
+class ExportadorJSON:
+    """
+    Añade una línea JSON con el desglose de tiempos a un archivo
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def exportar(self, resumen, registro=None):
+        linea = {
+            'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'tramos': resumen
+        }
+        with open(self.ruta, 'a') as archivo:
+            archivo.write(json.dumps(linea) + "\n")
+
+class ExportadorPrometheus:
+    """
+    Escribe los tiempos en formato de texto de Prometheus (p. ej. para el textfile collector)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def exportar(self, resumen, registro=None):
+        lineas = [
+            f"# HELP {PREFIJO_METRICAS}_segundos_total Tiempo acumulado por tramo",
+            f"# TYPE {PREFIJO_METRICAS}_segundos_total counter"
+        ]
+        lineas += [
+            f'{PREFIJO_METRICAS}_segundos_total{{tramo="{nombre}"}} {datos["total_s"]:.9f}'
+            for nombre, datos in resumen.items()
+        ]
+        lineas += [
+            f"# HELP {PREFIJO_METRICAS}_llamadas_total Número de ejecuciones por tramo",
+            f"# TYPE {PREFIJO_METRICAS}_llamadas_total counter"
+        ]
+        lineas += [
+            f'{PREFIJO_METRICAS}_llamadas_total{{tramo="{nombre}"}} {datos["llamadas"]}'
+            for nombre, datos in resumen.items()
+        ]
+
+        # Escritura atómica para que el lector nunca vea un archivo a medias
+        with open(self.ruta + ".tmp", 'w') as archivo:
+            archivo.write("\n".join(lineas) + "\n")
+        os.replace(self.ruta + ".tmp", self.ruta)
+
+class Trazador:
+    """
+    Acumula la duración de tramos con nombre (llamadas, total y máximo por tramo)
+
+    Sin exportadores está inactivo y tramo()/medir() no miden nada.
+    """
+
+    def __init__(self, exportadores=()):
+        self.exportadores = list(exportadores)
+        self._tramos = {}
+        self._lock = threading.Lock()
+
+    @property
+    def activo(self):
+        return bool(self.exportadores)
+
+    def registrar(self, nombre, segundos):
+        with self._lock:
+            datos = self._tramos.get(nombre)
+            if datos is None:
+                self._tramos[nombre] = {'llamadas': 1, 'total_s': segundos, 'max_s': segundos}
+            else:
+                datos['llamadas'] += 1
+                datos['total_s'] += segundos
+                datos['max_s'] = max(datos['max_s'], segundos)
+
+    @contextlib.contextmanager
+    def _medir_tramo(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio)
+
+    def tramo(self, nombre):
+        if not self.activo:
+            return contextlib.nullcontext()
+        return self._medir_tramo(nombre)
+
+    def resumen(self):
+        with self._lock:
+            return {nombre: dict(datos) for nombre, datos in self._tramos.items()}
+
+    def reiniciar(self):
+        with self._lock:
+            self._tramos.clear()
+
+    def exportar(self, registro=None):
+        """
+        Envía el resumen a los exportadores; registro (opcional) es el destino de las métricas
+        de MLflow, p. ej. el BufferRegistroMLflow del run
+        """
+        resumen = self.resumen()
+        for exportador in self.exportadores:
+            exportador.exportar(resumen, registro=registro)
+        return resumen
+
+# Trazador global del proceso (inactivo por defecto)
+_trazador = Trazador()
+
+def configurar(exportadores):
+    """
+    Activa la instrumentación global con los exportadores indicados (lista vacía = sin medir)
+    """
+    global _trazador
+    _trazador = Trazador(exportadores)
+    return _trazador
+
+def configurar_desde_entorno():
+    """
+    Configura los exportadores a partir de SALARIOS_INSTRUMENTACION y exporta al terminar el proceso
+    """
+    valor = os.environ.get(VARIABLE_ENTORNO, "").strip()
+    if not valor:
+        return _trazador
+
+    exportadores = []
+    for especificacion in valor.split(","):
+        tipo, _, ruta = especificacion.strip().partition(":")
+        if tipo == "mlflow":
+            exportadores.append(ExportadorMLflow())
+        elif tipo == "json":
+            exportadores.append(ExportadorJSON(ruta or "tiempos_salarios.jsonl"))
+        elif tipo == "prometheus":
+            exportadores.append(ExportadorPrometheus(ruta or "tiempos_salarios.prom"))
+        else:
+            raise ValueError(f"Exportador de instrumentación desconocido: {tipo}")
+
+    trazador = configurar(exportadores)
+    atexit.register(lambda: trazador.exportar() if trazador.resumen() else None)
+    return trazador
+
+def obtener_trazador():
+    return _trazador
+
+def tramo(nombre):
+    """
+    Context manager que mide un tramo con el trazador global
+    """
+    return _trazador.tramo(nombre)
+
+def medir(nombre):
+    """
+    Decorador que mide cada llamada a la función como un tramo del trazador global
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            trazador = _trazador
+            if not trazador.activo:
+                return funcion(*args, **kwargs)
+            with trazador._medir_tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+configurar_desde_entorno()
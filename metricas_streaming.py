@@ -0,0 +1,128 @@
+import numpy as np
+
+# Tamaño por defecto de la muestra de residuos para estimar cuantiles
+TAMANO_MUESTRA = 10000
+
+# Semilla por defecto de la muestra: con los mismos datos los cuantiles registrados no cambian entre ejecuciones
+SEMILLA_MUESTRA = 42
+
+# Cuantiles del error absoluto incluidos en metricas()
+CUANTILES_ERROR = (0.5, 0.9, 0.99)
+
+class AcumuladorMetricas:
+    """
+    Métricas de regresión (MSE, RMSE, MAE, R²) acumuladas en una sola pasada por bloques
+
+    Por cada bloque se calculan los residuos una vez y se acumulan la suma de cuadrados y de
+    valores absolutos de los residuos, y la media y la suma de cuadrados centrada de y (con la
+    fórmula de Chan et al., numéricamente estable) para el R². Los cuantiles de los residuos se
+    estiman con una muestra uniforme de tamaño fijo (bottom-k: se conservan los residuos con
+    las prioridades aleatorias más pequeñas), exacta mientras haya menos filas que la muestra.
+
+    Dos acumuladores (p. ej. de distintos workers) se combinan con combinar(); la memoria es
+    O(tamano_muestra) sea cual sea el número de filas. Los acumuladores que se van a combinar
+    deben usar semillas distintas (p. ej. [semilla, indice_worker]) para que sus prioridades
+    sean independientes.
+    """
+
+    def __init__(self, tamano_muestra=TAMANO_MUESTRA, semilla=SEMILLA_MUESTRA):
+        self.tamano_muestra = tamano_muestra
+        self.n = 0
+        self.media_y = 0.0
+        self.suma_cuadrados_y = 0.0
+        self.suma_cuadrados_residuo = 0.0
+        self.suma_abs_residuo = 0.0
+        self._rng = np.random.default_rng(semilla)
+        self._prioridades = np.empty(0)
+        self._residuos = np.empty(0)
+
+    def _combinar_muestra(self, prioridades, residuos):
+        prioridades = np.concatenate([self._prioridades, prioridades])
+        residuos = np.concatenate([self._residuos, residuos])
+        if len(prioridades) > self.tamano_muestra:
+            seleccion = np.argpartition(prioridades, self.tamano_muestra - 1)[:self.tamano_muestra]
+            prioridades, residuos = prioridades[seleccion], residuos[seleccion]
+        self._prioridades, self._residuos = prioridades, residuos
+
+    def _combinar(self, n, media_y, suma_cuadrados_y, suma_cuadrados_residuo, suma_abs_residuo):
+        if n == 0:
+            return
+
+        n_total = self.n + n
+        delta_y = media_y - self.media_y
+        self.suma_cuadrados_y += suma_cuadrados_y + delta_y * delta_y * (self.n * n / n_total)
+        self.media_y += delta_y * (n / n_total)
+        self.suma_cuadrados_residuo += suma_cuadrados_residuo
+        self.suma_abs_residuo += suma_abs_residuo
+        self.n = n_total
+
+    def actualizar(self, y_real, y_pred):
+        """
+        Incorpora un bloque de valores reales y predichos
+        """
+        y_real = np.asarray(y_real, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        if len(y_real) != len(y_pred):
+            raise ValueError(f"y_real y y_pred tienen longitudes distintas: {len(y_real)} y {len(y_pred)}")
+        if len(y_real) == 0:
+            return self
+
+        residuos = y_real - y_pred
+        media_y = float(y_real.mean())
+        y_centrado = y_real - media_y
+
+        self._combinar(
+            len(y_real),
+            media_y,
+            float(y_centrado @ y_centrado),
+            float(residuos @ residuos),
+            float(np.abs(residuos).sum())
+        )
+        self._combinar_muestra(self._rng.random(len(residuos)), residuos)
+        return self
+
+    def combinar(self, otro):
+        """
+        Incorpora las métricas acumuladas por otro objeto (p. ej. de otro worker)
+        """
+        self._combinar(
+            otro.n, otro.media_y, otro.suma_cuadrados_y,
+            otro.suma_cuadrados_residuo, otro.suma_abs_residuo
+        )
+        self._combinar_muestra(otro._prioridades, otro._residuos)
+        return self
+
+    def cuantiles_residuo(self, cuantiles, absoluto=False):
+        """
+        Estima cuantiles de los residuos (y_real - y_pred) o de su valor absoluto
+        """
+        if self.n == 0:
+            raise ValueError("No hay filas acumuladas")
+        residuos = np.abs(self._residuos) if absoluto else self._residuos
+        return np.quantile(residuos, cuantiles)
+
+    def metricas(self, cuantiles=CUANTILES_ERROR):
+        """
+        Devuelve mse, rmse, mae, r2 y los cuantiles del error absoluto (error_abs_p50, ...)
+        """
+        if self.n == 0:
+            raise ValueError("No hay filas acumuladas")
+
+        mse = self.suma_cuadrados_residuo / self.n
+        if self.suma_cuadrados_y > 0:
+            r2 = 1.0 - self.suma_cuadrados_residuo / self.suma_cuadrados_y
+        else:
+            # Igual que r2_score con y constante
+            r2 = 1.0 if self.suma_cuadrados_residuo == 0 else 0.0
+
+        metricas = {
+            'mse': mse,
+            'rmse': float(np.sqrt(mse)),
+            'mae': self.suma_abs_residuo / self.n,
+            'r2': r2
+        }
+        if cuantiles:
+            valores = self.cuantiles_residuo(cuantiles, absoluto=True)
+            for cuantil, valor in zip(cuantiles, valores):
+                metricas[f"error_abs_p{cuantil * 100:g}"] = float(valor)
+        return metricas
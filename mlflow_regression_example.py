@@ -2,48 +2,51 @@ import pandas as pd
 import numpy as np
 import mlflow
 import mlflow.sklearn
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from sklearn.pipeline import Pipeline
 import warnings
 warnings.filterwarnings('ignore')
 
-# Importar la función para generar datos
-from generate_synthetic_data import generate_synthetic_salary_data
+from predictor_fusionado import PredictorFusionado
+from prediccion_lote import predecir_salarios_lote
+from cache_preprocesamiento import preprocesar_datos
+from cache_modelos import cargar_modelo_cacheado
+from cache_artefactos import ARTEFACTO_PIPELINE, PASO_MODELO, PASO_SCALER
+from registro_buffer import BufferRegistroMLflow
+from metricas_streaming import AcumuladorMetricas
+from graficos import registrar_grafico_predicciones
+from validacion_cruzada import registrar_validacion_cruzada, validacion_cruzada
+from instrumentacion import medir, obtener_trazador, tramo
 
-def cargar_y_preprocesar_datos():
+# Parámetros del split de los experimentos (y de la entrada de cache que comparten)
+PARAMETROS_SPLIT = {'n_samples': 1000, 'test_size': 0.2, 'random_state': 42}
+
+@medir("preprocesamiento.cargar_y_preprocesar")
+def cargar_y_preprocesar_datos(ruta_datos=None, usar_cache=True):
     """
     Carga los datos sintéticos y realiza preprocesamiento básico
-    """
-    print("Cargando y preprocesando datos...")
     
-    # Generar datos sintéticos
-    data = generate_synthetic_salary_data(1000)
+    El split y el scaler se guardan en una cache local (cache_preprocesamiento) indexada por
+    una huella de los datos y de los parámetros del split, así que los experimentos repetidos
+    pasan directamente al entrenamiento.
     
-    # Separar features y target
-    X = data.drop('salario', axis=1)
-    y = data['salario']
-    
-    # Verificar valores nulos
-    print(f"Valores nulos en features: {X.isnull().sum().sum()}")
-    print(f"Valores nulos en target: {y.isnull().sum()}")
+    Args:
+        ruta_datos: Dataset a leer (CSV o directorio en formato binario). Si no se indica,
+                    se generan 1000 filas sintéticas
+        usar_cache: Si es False se recalcula siempre el preprocesamiento
+    """
+    print("Cargando y preprocesando datos...")
     
-    # Dividir en train y test
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+    X_train_scaled, X_test_scaled, y_train, y_test, scaler = preprocesar_datos(
+        ruta_datos, usar_cache=usar_cache, **PARAMETROS_SPLIT
     )
     
-    # Normalización de features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
     print(f"Forma de datos de entrenamiento: {X_train_scaled.shape}")
     print(f"Forma de datos de prueba: {X_test_scaled.shape}")
     
     return X_train_scaled, X_test_scaled, y_train, y_test, scaler
 
+@medir("entrenamiento.ajustar")
 def entrenar_modelo_regresion_lineal(X_train, y_train):
     """
     Entrena un modelo de regresión lineal
@@ -65,9 +68,13 @@ def entrenar_modelo_regresion_lineal(X_train, y_train):
     print("Modelo entrenado exitosamente")
     return modelo, hiperparametros
 
+@medir("evaluacion.evaluar")
 def evaluar_modelo(modelo, X_test, y_test):
     """
     Evalúa el modelo y calcula métricas
+    
+    Las métricas (MSE, RMSE, MAE, R² y cuantiles del error absoluto) se calculan en una
+    sola pasada con AcumuladorMetricas.
     """
     print("Evaluando modelo...")
     
@@ -75,86 +82,126 @@ def evaluar_modelo(modelo, X_test, y_test):
     y_pred = modelo.predict(X_test)
     
     # Calcular métricas
-    mse = mean_squared_error(y_test, y_pred)
-    rmse = np.sqrt(mse)
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
-    
-    metricas = {
-        'mse': mse,
-        'rmse': rmse,
-        'mae': mae,
-        'r2': r2
-    }
+    metricas = AcumuladorMetricas(semilla=42).actualizar(y_test, y_pred).metricas()
     
-    print(f"MSE: {mse:.2f}")
-    print(f"RMSE: {rmse:.2f}")
-    print(f"MAE: {mae:.2f}")
-    print(f"R²: {r2:.4f}")
+    print(f"MSE: {metricas['mse']:.2f}")
+    print(f"RMSE: {metricas['rmse']:.2f}")
+    print(f"MAE: {metricas['mae']:.2f}")
+    print(f"R²: {metricas['r2']:.4f}")
     
     return metricas, y_pred
 
-def experimento_mlflow():
+def crear_pipeline(scaler, modelo):
+    """
+    Combina el scaler y el modelo ya entrenados en un único Pipeline de sklearn
+    """
+    return Pipeline([(PASO_SCALER, scaler), (PASO_MODELO, modelo)])
+
+def experimento_mlflow(artefacto_combinado=False, k_pliegues=None, ruta_datos=None):
     """
     Ejecuta el experimento completo con MLflow
+    
+    Args:
+        artefacto_combinado: Si es True registra un único pipeline (scaler + modelo) como
+                             "pipeline_prediccion_salarios" en lugar de dos modelos separados,
+                             de modo que se carga y predice con una sola llamada
+        k_pliegues: Si se indica, registra además una validación cruzada k-fold con pliegues en
+                    paralelo (métricas cv_* por pliegue y agregadas) sobre el mismo dataset
+        ruta_datos: Dataset a leer (CSV o directorio en formato binario); por defecto 1000
+                    filas sintéticas
     """
     # Configurar MLflow
     mlflow.set_experiment("Prediccion_Salarios_Regresion_Lineal")
     
-    with mlflow.start_run(run_name="regresion_lineal_salarios"):
+    # El buffer agrupa params/métricas en log_batch y sube los artefactos en segundo plano;
+    # al salir del bloque envía lo pendiente y espera a las subidas antes de cerrar el run
+    with mlflow.start_run(run_name="regresion_lineal_salarios") as run, \
+            BufferRegistroMLflow(run.info.run_id) as registro:
         print("=== INICIANDO EXPERIMENTO MLFLOW ===")
         
+        # Cada run registra su propio desglose de tiempos por etapa
+        trazador = obtener_trazador()
+        trazador.reiniciar()
+        
         # 1. Cargar y preprocesar datos
-        X_train, X_test, y_train, y_test, scaler = cargar_y_preprocesar_datos()
+        with tramo("experimento.datos"):
+            X_train, X_test, y_train, y_test, scaler = cargar_y_preprocesar_datos(ruta_datos)
         
         # 2. Entrenar modelo
-        modelo, hiperparametros = entrenar_modelo_regresion_lineal(X_train, y_train)
+        with tramo("experimento.entrenamiento"):
+            modelo, hiperparametros = entrenar_modelo_regresion_lineal(X_train, y_train)
         
         # 3. Evaluar modelo
-        metricas, y_pred = evaluar_modelo(modelo, X_test, y_test)
+        with tramo("experimento.evaluacion"):
+            metricas, y_pred = evaluar_modelo(modelo, X_test, y_test)
         
-        # 4. Registrar hiperparámetros en MLflow
+        # 3b. Validación cruzada (más estable que un único split 80/20)
+        if k_pliegues:
+            with tramo("experimento.validacion_cruzada"):
+                print(f"Validación cruzada con {k_pliegues} pliegues...")
+                # Mismo origen de datos que el split del experimento (ruta_datos o las mismas filas sintéticas)
+                resultado_cv = validacion_cruzada(k=k_pliegues, ruta_datos=ruta_datos, n_samples=1000, semilla=42)
+                registrar_validacion_cruzada(registro, resultado_cv, k_pliegues, semilla=42)
+                print(f"RMSE CV: {resultado_cv['media']['rmse']:.2f} ± {resultado_cv['desviacion']['rmse']:.2f}")
+        
+        # 4. Registrar hiperparámetros en MLflow (se envían en lote con log_batch)
         print("Registrando hiperparámetros...")
-        mlflow.log_params(hiperparametros)
+        registro.log_params(hiperparametros)
         
         # 5. Registrar métricas en MLflow
         print("Registrando métricas...")
-        mlflow.log_metrics(metricas)
-        
-        # 6. Guardar el modelo como artefacto
-        print("Guardando modelo...")
-        mlflow.sklearn.log_model(
-            modelo, 
-            "modelo_regresion_lineal",
-            registered_model_name="prediccion_salarios"
-        )
-        
-        # 7. Guardar el scaler como artefacto
-        mlflow.sklearn.log_model(
-            scaler,
-            "scaler",
-            registered_model_name="scaler_salarios"
-        )
+        registro.log_metrics(metricas)
         
-        # 8. Crear y guardar gráfico de resultados
-        import matplotlib.pyplot as plt
+        # El tramo cubre el guardado y la subida en segundo plano, no solo el encolado
+        with tramo("experimento.registro_modelos"):
+            subidas = []
+            if artefacto_combinado:
+                # 6-7. Guardar scaler + modelo como un único pipeline
+                print("Guardando pipeline (scaler + modelo)...")
+                subidas.append(registro.log_model_sklearn(
+                    crear_pipeline(scaler, modelo),
+                    ARTEFACTO_PIPELINE,
+                    registered_model_name="pipeline_prediccion_salarios"
+                ))
+            else:
+                # 6. Guardar el modelo como artefacto (la subida se hace en segundo plano)
+                print("Guardando modelo...")
+                subidas.append(registro.log_model_sklearn(
+                    modelo, 
+                    "modelo_regresion_lineal",
+                    registered_model_name="prediccion_salarios"
+                ))
+            
+                # 7. Guardar el scaler como artefacto
+                subidas.append(registro.log_model_sklearn(
+                    scaler,
+                    "scaler",
+                    registered_model_name="scaler_salarios"
+                ))
         
-        plt.figure(figsize=(10, 6))
-        plt.scatter(y_test, y_pred, alpha=0.5)
-        plt.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
-        plt.xlabel('Salario Real')
-        plt.ylabel('Salario Predicho')
-        plt.title('Predicciones vs Valores Reales')
-        plt.tight_layout()
+            # 7b. Guardar el predictor fusionado (scaler + modelo plegados, sin sklearn)
+            fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+            ruta_fusionado = fusionado.guardar(registro.ruta_temporal("predictor_fusionado.npz"))
+            subidas.append(registro.log_artifact(ruta_fusionado, "predictor_fusionado"))
+            registro.esperar(subidas)
         
-        # Guardar gráfico
-        plt.savefig('predicciones_vs_reales.png')
-        mlflow.log_artifact('predicciones_vs_reales.png')
+        # 8. Gráfico de resultados: se dibuja (muestreado o como histograma 2-D) y se sube en segundo plano
+        registrar_grafico_predicciones(registro, y_test, y_pred)
         
         # 9. Guardar información adicional
-        mlflow.log_param("n_features", X_train.shape[1])
-        mlflow.log_param("n_samples_train", X_train.shape[0])
-        mlflow.log_param("n_samples_test", X_test.shape[0])
+        registro.log_params({
+            "n_features": X_train.shape[1],
+            "n_samples_train": X_train.shape[0],
+            "n_samples_test": X_test.shape[0],
+            "artefacto_combinado": artefacto_combinado
+        })
+        
+        if trazador.activo:
+            # Las tareas en segundo plano (p. ej. el gráfico) registran sus tramos al terminar:
+            # se espera a todas para que entren en el desglose de este run, que se envía con el buffer
+            registro.esperar()
+            trazador.exportar(registro)
+            trazador.reiniciar()
         
         print("=== EXPERIMENTO COMPLETADO ===")
         print(f"Run ID: {mlflow.active_run().info.run_id}")
@@ -162,12 +209,12 @@ def experimento_mlflow():
         
         return modelo, scaler, metricas
 
+@medir("carga.modelo_mlflow")
 def cargar_modelo_desde_mlflow(run_id):
     """
-    Función para cargar un modelo guardado desde MLflow
+    Función para cargar un modelo guardado desde MLflow (usa la cache de modelos del proceso)
     """
-    modelo_cargado = mlflow.sklearn.load_model(f"runs:/{run_id}/modelo_regresion_lineal")
-    scaler_cargado = mlflow.sklearn.load_model(f"runs:/{run_id}/scaler")
+    modelo_cargado, scaler_cargado = cargar_modelo_cacheado(run_id)
     return modelo_cargado, scaler_cargado
 
 def hacer_prediccion_ejemplo(modelo, scaler):
@@ -186,11 +233,8 @@ def hacer_prediccion_ejemplo(modelo, scaler):
         2      # certificaciones
     ]])
     
-    # Normalizar datos
-    empleado_scaled = scaler.transform(empleado_ejemplo)
-    
-    # Hacer predicción
-    salario_predicho = modelo.predict(empleado_scaled)[0]
+    # Normalizar y predecir (un pipeline combinado lo hace en una sola llamada)
+    salario_predicho = predecir_salarios_lote(modelo, scaler, empleado_ejemplo)[0]
     
     print(f"Empleado ejemplo:")
     print(f"- Edad: {empleado_ejemplo[0][0]} años")
@@ -203,7 +247,19 @@ def hacer_prediccion_ejemplo(modelo, scaler):
 
 if __name__ == "__main__":
     # Ejecutar experimento completo
-    modelo, scaler, metricas = experimento_mlflow()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Experimento de regresión lineal de salarios con MLflow")
+    parser.add_argument("--artefacto-combinado", action="store_true",
+                        help="Registrar scaler + modelo como un único pipeline en lugar de dos modelos")
+    parser.add_argument("--k-pliegues", type=int, default=None,
+                        help="Registrar además una validación cruzada con este número de pliegues")
+    parser.add_argument("--datos", default=None, help="Dataset (CSV o binario); por defecto datos sintéticos")
+    args = parser.parse_args()
+    
+    modelo, scaler, metricas = experimento_mlflow(
+        artefacto_combinado=args.artefacto_combinado, k_pliegues=args.k_pliegues, ruta_datos=args.datos
+    )
     
     # Ejemplo de predicción
     hacer_prediccion_ejemplo(modelo, scaler)
@@ -2,34 +2,37 @@ import mlflow
 import numpy as np
 import pandas as pd
 from generate_synthetic_data import generate_synthetic_salary_data
+from categorias_salario import BANDAS_SALARIALES
+from empleados import Empleado, LoteEmpleados
+from esquema_empleado import ESQUEMA_EMPLEADO
+from cache_predicciones import cache_predicciones, predecir_salarios_cacheado
+from cache_modelos import cargar_modelo_cacheado
+from registro_modelos_memoria import RegistroModelosMemoria
+from instrumentacion import medir
 
+@medir("prediccion_interactiva.cargar_modelo")
 def cargar_modelo_entrenado(run_id):
     """
     Carga el modelo y scaler desde MLflow usando el run_id
+    
+    Si el run guarda el pipeline combinado, el modelo es el pipeline y el scaler es None
     """
     try:
-        modelo = mlflow.sklearn.load_model(f"runs:/{run_id}/modelo_regresion_lineal")
-        scaler = mlflow.sklearn.load_model(f"runs:/{run_id}/scaler")
+        # Ambos artefactos se cargan en paralelo y quedan en la cache del proceso
+        modelo, scaler = cargar_modelo_cacheado(run_id)
         print(f"✅ Modelo cargado exitosamente desde run_id: {run_id}")
         return modelo, scaler
     except Exception as e:
         print(f"❌ Error al cargar el modelo: {e}")
         return None, None
 
+@medir("prediccion_interactiva.predecir")
 def predecir_salario_empleado(modelo, scaler, datos_empleado):
     """
     Predice el salario de un empleado usando el modelo entrenado
     """
-    # Convertir a array numpy
-    datos_array = np.array([datos_empleado])
-    
-    # Normalizar datos
-    datos_scaled = scaler.transform(datos_array)
-    
-    # Hacer predicción
-    salario_predicho = modelo.predict(datos_scaled)[0]
-    
-    return salario_predicho
+    # Un empleado es un lote de una sola fila; los perfiles repetidos salen de la cache
+    return predecir_salarios_cacheado(modelo, scaler, [datos_empleado])[0]
 
 def obtener_datos_empleado():
     """
@@ -43,31 +46,17 @@ def obtener_datos_empleado():
         # Solicitar datos con validación
         print("\nPor favor, ingresa los datos del empleado:")
         
-        edad = float(input("• Edad (22-65 años): "))
-        if not (22 <= edad <= 65):
-            print("⚠️  Advertencia: La edad debe estar entre 22 y 65 años")
-        
-        experiencia = float(input("• Años de experiencia laboral (0-35): "))
-        if not (0 <= experiencia <= 35):
-            print("⚠️  Advertencia: La experiencia debe estar entre 0 y 35 años")
+        valores = [
+            ESQUEMA_EMPLEADO.convertir_valor(campo, input(ESQUEMA_EMPLEADO.pregunta(campo)))
+            for campo in ESQUEMA_EMPLEADO.campos
+        ]
+        empleado = Empleado(*valores)
         
-        educacion = float(input("• Años de educación formal (12-22): "))
-        if not (12 <= educacion <= 22):
-            print("⚠️  Advertencia: La educación debe estar entre 12 y 22 años")
+        # Validación con el mismo esquema que usa la puntuación masiva
+        for campo in ESQUEMA_EMPLEADO.describir(ESQUEMA_EMPLEADO.validar(empleado)[0]):
+            print(f"⚠️  Advertencia: {campo.etiqueta} debe estar en el rango {ESQUEMA_EMPLEADO.texto_rango(campo)}")
         
-        horas = float(input("• Horas trabajadas por semana (30-60): "))
-        if not (30 <= horas <= 60):
-            print("⚠️  Advertencia: Las horas deben estar entre 30 y 60")
-        
-        proyectos = int(input("• Número de proyectos completados: "))
-        if proyectos < 0:
-            print("⚠️  Advertencia: El número de proyectos debe ser positivo")
-        
-        certificaciones = int(input("• Número de certificaciones obtenidas: "))
-        if certificaciones < 0:
-            print("⚠️  Advertencia: El número de certificaciones debe ser positivo")
-        
-        return [edad, experiencia, educacion, horas, proyectos, certificaciones]
+        return empleado
         
     except ValueError:
         print("❌ Error: Por favor ingresa valores numéricos válidos")
@@ -94,35 +83,28 @@ def mostrar_resultado_prediccion(datos_empleado, salario_predicho):
     print(f"   ${salario_predicho/12:,.2f} USD mensuales")
     
     # Categorizar el salario
-    if salario_predicho < 40000:
-        categoria = "Junior"
-    elif salario_predicho < 60000:
-        categoria = "Intermedio"
-    elif salario_predicho < 80000:
-        categoria = "Senior"
-    elif salario_predicho < 100000:
-        categoria = "Experto"
-    else:
-        categoria = "Muy Experto"
+    categoria = BANDAS_SALARIALES.etiqueta(salario_predicho)
     
     print(f"\n🏷️  Categoría estimada: {categoria}")
     
     print("\n" + "="*60)
 
-def menu_principal():
+def menu_principal(registro):
     """
     Menú principal de la aplicación
     """
     print("\n" + "="*60)
     print("🤖 PREDICTOR DE SALARIOS - MLflow + Regresión Lineal")
+    print(f"   Modelo activo: {registro.activa.nombre}")
     print("="*60)
     print("\nOpciones disponibles:")
     print("1. 🔮 Hacer predicción de salario")
     print("2. 📊 Ver ejemplos predefinidos")
     print("3. 🔄 Entrenar nuevo modelo")
-    print("4. ❌ Salir")
+    print("4. 🔀 Cambiar modelo (run_id, versión o alias)")
+    print("5. ❌ Salir")
     
-    return input("\nSelecciona una opción (1-4): ")
+    return input("\nSelecciona una opción (1-5): ")
 
 def mostrar_ejemplos_predefinidos(modelo, scaler):
     """
@@ -160,13 +142,18 @@ def mostrar_ejemplos_predefinidos(modelo, scaler):
         }
     ]
     
-    for i, ejemplo in enumerate(ejemplos, 1):
-        salario = predecir_salario_empleado(modelo, scaler, ejemplo["datos"])
-        
+    salarios = predecir_salarios_cacheado(
+        modelo, scaler, LoteEmpleados.desde_filas(ejemplo["datos"] for ejemplo in ejemplos)
+    )
+    
+    for i, (ejemplo, salario) in enumerate(zip(ejemplos, salarios), 1):
         print(f"\n{i}. {ejemplo['nombre']}")
         print(f"   Descripción: {ejemplo['descripcion']}")
         print(f"   Datos: Edad={ejemplo['datos'][0]}, Exp={ejemplo['datos'][1]}, Edu={ejemplo['datos'][2]}")
         print(f"   Salario predicho: ${salario:,.2f} USD")
+    
+    estadisticas = cache_predicciones.estadisticas()
+    print(f"\n🗄️  Cache de predicciones: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos")
 
 def entrenar_nuevo_modelo():
     """
@@ -180,6 +167,35 @@ def entrenar_nuevo_modelo():
     print("python mlflow_regression_example.py")
     print("\nLuego copia el Run ID que aparece al final y úsalo en esta aplicación.")
 
+def cambiar_modelo(registro):
+    """
+    Carga otra versión en segundo plano; se sigue prediciendo con la activa hasta que esté lista
+    """
+    print("\n" + "="*60)
+    print("🔀 CAMBIAR MODELO")
+    print("="*60)
+    print(f"\nVersiones en memoria: {', '.join(registro.versiones())}")
+    print("Formatos: <run_id>, prediccion_salarios/<versión>, prediccion_salarios@<alias>,")
+    print("          prediccion_salarios:<etapa> (p. ej. prediccion_salarios:Production)")
+    
+    referencia = input("\nModelo a cargar: ").strip()
+    if not referencia:
+        return
+    
+    if referencia in registro.versiones():
+        registro.activar(referencia)
+        print(f"✅ Modelo activo: {referencia}")
+        return
+    
+    def informar(futuro):
+        if futuro.exception() is not None:
+            print(f"\n❌ Error al cargar el modelo: {futuro.exception()}")
+        else:
+            print(f"\n✅ Modelo activo: {futuro.result().nombre}")
+    
+    registro.cargar_referencia(referencia).add_done_callback(informar)
+    print("🔄 Cargando en segundo plano...")
+
 def main():
     """
     Función principal de la aplicación interactiva
@@ -204,46 +220,61 @@ def main():
     # Cargar modelo
     modelo, scaler = cargar_modelo_entrenado(run_id)
     
-    if modelo is None or scaler is None:
+    if modelo is None:
         print("\n❌ No se pudo cargar el modelo. Verifica:")
         print("1. Que el Run ID sea correcto")
         print("2. Que hayas ejecutado el entrenamiento primero")
         print("3. Que MLflow esté configurado correctamente")
         return
     
-    # Bucle principal
-    while True:
-        opcion = menu_principal()
-        
-        if opcion == "1":
-            # Hacer predicción
-            datos = obtener_datos_empleado()
-            if datos:
-                salario = predecir_salario_empleado(modelo, scaler, datos)
-                mostrar_resultado_prediccion(datos, salario)
-                
-                # Preguntar si quiere hacer otra predicción
-                continuar = input("\n¿Hacer otra predicción? (s/n): ").lower()
-                if continuar != 's':
-                    break
-                    
-        elif opcion == "2":
-            # Mostrar ejemplos
-            mostrar_ejemplos_predefinidos(modelo, scaler)
-            input("\nPresiona Enter para continuar...")
-            
-        elif opcion == "3":
-            # Entrenar nuevo modelo
-            entrenar_nuevo_modelo()
-            input("\nPresiona Enter para continuar...")
+    # Versiones en memoria: permite cambiar de modelo sin reiniciar la aplicación
+    registro = RegistroModelosMemoria()
+    registro.registrar(run_id, modelo, scaler, origen={'run_id': run_id})
+    
+    # Bucle principal; el pool de carga en segundo plano se cierra al salir por cualquier camino
+    try:
+        while True:
+            opcion = menu_principal(registro)
             
-        elif opcion == "4":
-            # Salir
-            print("\n👋 ¡Gracias por usar el Predictor de Salarios!")
-            break
+            # La versión activa se lee una vez por operación: modelo y scaler siempre del mismo par
+            version = registro.activa
+            modelo, scaler = version.modelo, version.scaler
             
-        else:
-            print("❌ Opción no válida. Por favor selecciona 1-4.")
+            if opcion == "1":
+                # Hacer predicción
+                datos = obtener_datos_empleado()
+                if datos:
+                    salario = predecir_salario_empleado(modelo, scaler, datos)
+                    mostrar_resultado_prediccion(datos, salario)
+                    
+                    # Preguntar si quiere hacer otra predicción
+                    continuar = input("\n¿Hacer otra predicción? (s/n): ").lower()
+                    if continuar != 's':
+                        break
+                        
+            elif opcion == "2":
+                # Mostrar ejemplos
+                mostrar_ejemplos_predefinidos(modelo, scaler)
+                input("\nPresiona Enter para continuar...")
+                
+            elif opcion == "3":
+                # Entrenar nuevo modelo
+                entrenar_nuevo_modelo()
+                input("\nPresiona Enter para continuar...")
+                
+            elif opcion == "4":
+                # Cambiar de modelo
+                cambiar_modelo(registro)
+                
+            elif opcion == "5":
+                # Salir
+                print("\n👋 ¡Gracias por usar el Predictor de Salarios!")
+                break
+                
+            else:
+                print("❌ Opción no válida. Por favor selecciona 1-5.")
+    finally:
+        registro.cerrar()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Orden de las variables independientes esperado por el scaler y el modelo
+COLUMNAS_FEATURES = [
+    'edad',
+    'experiencia_anos',
+    'educacion_anos',
+    'horas_trabajo',
+    'proyectos_completados',
+    'certificaciones'
+]
+
+def convertir_a_matriz(datos):
+    """
+    Convierte los datos de uno o varios empleados a una matriz 2-D de floats
+
+    Args:
+        datos: Matriz 2-D, DataFrame con las columnas de COLUMNAS_FEATURES, LoteEmpleados
+               (se usa su buffer sin copiar) o iterable de filas/Empleado
+               [edad, experiencia, educacion, horas, proyectos, certificaciones]
+    """
+    if isinstance(datos, pd.DataFrame):
+        # Se ignoran columnas adicionales como 'salario'
+        return datos[COLUMNAS_FEATURES].to_numpy(dtype=np.float64)
+
+    # Los objetos con __array__ (ndarray, LoteEmpleados, Empleado) se convierten sin iterarlos
+    if not hasattr(datos, '__array__'):
+        datos = list(datos)
+
+    matriz = np.asarray(datos, dtype=np.float64)
+
+    if matriz.ndim == 1:
+        matriz = matriz.reshape(1, -1)
+
+    if matriz.ndim != 2 or matriz.shape[1] != len(COLUMNAS_FEATURES):
+        raise ValueError(
+            f"Se esperaban filas con {len(COLUMNAS_FEATURES)} valores "
+            f"({', '.join(COLUMNAS_FEATURES)}), se recibió forma {matriz.shape}"
+        )
+
+    return matriz
+
+def predecir_salarios_lote(modelo, scaler, datos, tamano_bloque=None):
+    """
+    Predice el salario de muchos empleados con una sola llamada vectorizada
+
+    Args:
+        modelo: Modelo de regresión lineal entrenado, o el pipeline (scaler + modelo) completo
+        scaler: Scaler usado para normalizar los datos (None si modelo es un pipeline)
+        datos: Matriz 2-D, DataFrame o iterable de filas de empleados
+        tamano_bloque: Si se indica, procesa la matriz en bloques de este número de filas
+                       para acotar la memoria temporal usada por el scaler
+    """
+    matriz = convertir_a_matriz(datos)
+
+    def predecir(bloque):
+        if scaler is None:
+            return modelo.predict(bloque)
+        return modelo.predict(scaler.transform(bloque))
+
+    if tamano_bloque is None or matriz.shape[0] <= tamano_bloque:
+        return predecir(matriz)
+
+    predicciones = np.empty(matriz.shape[0], dtype=np.float64)
+    for inicio in range(0, matriz.shape[0], tamano_bloque):
+        fin = inicio + tamano_bloque
+        predicciones[inicio:fin] = predecir(matriz[inicio:fin])
+
+    return predicciones
+
+def iterar_predicciones(modelo, scaler, bloques):
+    """
+    Predice bloque a bloque sobre un iterable de bloques (p. ej. DataFrames leídos por partes)
+
+    Cada bloque se puntúa con una única llamada vectorizada y se devuelve su array de predicciones.
+    """
+    for bloque in bloques:
+        yield predecir_salarios_lote(modelo, scaler, bloque)
@@ -0,0 +1,149 @@
+# Punto de entrada de predicción con arranque rápido: solo importa numpy y predictor_fusionado.
+# No carga mlflow, pandas, sklearn ni matplotlib en el camino de predicción.
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from predictor_fusionado import PredictorFusionado
+
+MODELO_POR_DEFECTO = "predictor_fusionado.npz"
+
+# Presupuesto de tiempo de importación del módulo (medido con python -X importtime)
+PRESUPUESTO_IMPORTACION_MS = 250
+
+# Módulos que no deben cargarse al importar este punto de entrada
+MODULOS_PROHIBIDOS = ("mlflow", "pandas", "sklearn", "matplotlib")
+
+# Filas leídas de la entrada estándar antes de predecir cada bloque
+FILAS_POR_BLOQUE = 65536
+
+def _parsear_linea(linea, columnas):
+    linea = linea.strip()
+    if linea.startswith('{'):
+        if columnas is None:
+            raise ValueError("El modelo no guarda nombres de columnas; usa filas con 6 valores numéricos")
+        registro = json.loads(linea)
+        return [float(registro[columna]) for columna in columnas]
+    if linea.startswith('['):
+        return [float(valor) for valor in json.loads(linea)]
+    return [float(valor) for valor in linea.replace(',', ' ').split()]
+
+def _leer_bloques(lineas, columnas, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Agrupa las líneas de entrada en matrices; ignora líneas vacías y cabeceras no numéricas
+    """
+    filas = []
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        try:
+            filas.append(_parsear_linea(linea, columnas))
+        except ValueError:
+            if numero == 1:
+                continue
+            raise
+        if len(filas) >= filas_por_bloque:
+            yield np.array(filas, dtype=np.float64)
+            filas = []
+    if filas:
+        yield np.array(filas, dtype=np.float64)
+
+def exportar_desde_run(run_id, ruta):
+    """
+    Exporta el predictor fusionado de un run a un .npz (aquí sí se importa mlflow)
+    """
+    from cache_modelos import cargar_modelo_cacheado
+
+    modelo, scaler = cargar_modelo_cacheado(run_id)
+    return PredictorFusionado.desde_modelos(modelo, scaler).guardar(ruta)
+
+def medir_importacion(modulo="prediccion_rapida"):
+    """
+    Importa el módulo en un proceso nuevo con -X importtime
+
+    Returns:
+        (milisegundos acumulados del módulo, conjunto de módulos de primer nivel importados)
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    acumulado_us = None
+    importados = set()
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        partes = [parte.strip() for parte in linea[len("import time:"):].split("|")]
+        if not partes[1].isdigit():
+            # Cabecera "self [us] | cumulative | imported package"
+            continue
+        nombre = partes[2]
+        importados.add(nombre.split(".")[0])
+        if nombre == modulo:
+            acumulado_us = int(partes[1])
+
+    if acumulado_us is None:
+        raise RuntimeError(f"No se encontró '{modulo}' en la salida de -X importtime")
+
+    return acumulado_us / 1000, importados
+
+def verificar_importacion(presupuesto_ms=PRESUPUESTO_IMPORTACION_MS):
+    """
+    Comprueba que importar este módulo cabe en el presupuesto y no arrastra dependencias pesadas
+    """
+    milisegundos, importados = medir_importacion()
+    prohibidos = sorted(set(MODULOS_PROHIBIDOS) & importados)
+
+    print(f"Tiempo de importación: {milisegundos:.1f} ms (presupuesto: {presupuesto_ms} ms)")
+    if prohibidos:
+        print(f"❌ Se importaron módulos pesados: {', '.join(prohibidos)}")
+    if milisegundos > presupuesto_ms:
+        print("❌ Se superó el presupuesto de importación")
+
+    return not prohibidos and milisegundos <= presupuesto_ms
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predicción de salarios con arranque rápido")
+    parser.add_argument("valores", nargs="*", type=float,
+                        help="edad experiencia educacion horas proyectos certificaciones")
+    parser.add_argument("--modelo", default=MODELO_POR_DEFECTO, help="Artefacto .npz del predictor fusionado")
+    parser.add_argument("--exportar", metavar="RUN_ID", help="Exportar el predictor de este run a --modelo")
+    parser.add_argument("--verificar-importacion", action="store_true",
+                        help="Medir el tiempo de importación con -X importtime y validar el presupuesto")
+    parser.add_argument("--presupuesto-ms", type=float, default=PRESUPUESTO_IMPORTACION_MS,
+                        help="Presupuesto de importación en milisegundos")
+    args = parser.parse_args(argv)
+
+    if args.verificar_importacion:
+        return 0 if verificar_importacion(args.presupuesto_ms) else 1
+
+    if args.exportar:
+        ruta = exportar_desde_run(args.exportar, args.modelo)
+        print(f"Predictor fusionado exportado en '{ruta}'")
+        return 0
+
+    predictor = PredictorFusionado.cargar(args.modelo)
+
+    if args.valores:
+        bloques = [np.array(args.valores, dtype=np.float64).reshape(1, -1)]
+    else:
+        bloques = _leer_bloques(sys.stdin, predictor.columnas)
+
+    salida = sys.stdout
+    for bloque in bloques:
+        predicciones = predictor.predecir(bloque)
+        salida.write("\n".join(f"{salario:.2f}" for salario in predicciones))
+        salida.write("\n")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
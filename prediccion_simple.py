@@ -1,58 +1,103 @@
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
-from generate_synthetic_data import generate_synthetic_salary_data
+from cache_preprocesamiento import preprocesar_datos
+from categorias_salario import BANDAS_SALARIALES
+from empleados import Empleado, LoteEmpleados
+from esquema_empleado import ESQUEMA_EMPLEADO
+from registro_modelos_memoria import RegistroModelosMemoria
+from cache_predicciones import CachePredicciones
+from instrumentacion import medir
 
 class PredictorSalarios:
     def __init__(self):
-        self.modelo = None
-        self.scaler = None
-        self.entrenado = False
+        # Versiones del modelo en memoria; la activa se cambia de forma atómica y la cache
+        # de predicciones está indexada por versión
+        self.registro = RegistroModelosMemoria(cache_predicciones=CachePredicciones())
     
-    def entrenar_modelo(self):
-        """
-        Entrena el modelo de regresión lineal con datos sintéticos
+    @property
+    def entrenado(self):
+        return self.registro.activa is not None
+    
+    @property
+    def modelo(self):
+        return self.registro.activa.modelo if self.entrenado else None
+    
+    @property
+    def scaler(self):
+        return self.registro.activa.scaler if self.entrenado else None
+    
+    @property
+    def fusionado(self):
+        return self.registro.activa.predictor if self.entrenado else None
+    
+    def _entrenar(self):
         """
-        print("🔄 Entrenando modelo de predicción de salarios...")
-        
-        # Generar datos sintéticos
-        data = generate_synthetic_salary_data(1000)
+        Entrena y evalúa un modelo nuevo sin tocar la versión activa
         
-        # Separar features y target
-        X = data.drop('salario', axis=1)
-        y = data['salario']
-        
-        # Dividir en train y test
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
+        Returns:
+            (modelo, scaler, r2, rmse)
+        """
+        # Split y normalización (reutilizados de la cache de preprocesamiento si no cambian)
+        X_train_scaled, X_test_scaled, y_train, y_test, scaler = preprocesar_datos(
+            n_samples=1000, test_size=0.2, random_state=42
         )
         
-        # Normalización
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
         # Entrenar modelo
-        self.modelo = LinearRegression()
-        self.modelo.fit(X_train_scaled, y_train)
+        modelo = LinearRegression()
+        modelo.fit(X_train_scaled, y_train)
         
         # Evaluar modelo
-        y_pred = self.modelo.predict(X_test_scaled)
+        y_pred = modelo.predict(X_test_scaled)
         mse = mean_squared_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
         
-        self.entrenado = True
+        return modelo, scaler, r2, np.sqrt(mse)
+    
+    @medir("prediccion_simple.entrenar_modelo")
+    def entrenar_modelo(self):
+        """
+        Entrena el modelo de regresión lineal con datos sintéticos
+        """
+        print("🔄 Entrenando modelo de predicción de salarios...")
+        
+        modelo, scaler, r2, rmse = self._entrenar()
+        self.registro.registrar("inicial", modelo, scaler, origen={'local': True})
         
         print("✅ Modelo entrenado exitosamente!")
         print(f"📊 Métricas del modelo:")
         print(f"   • R² Score: {r2:.4f}")
-        print(f"   • RMSE: ${np.sqrt(mse):,.2f}")
+        print(f"   • RMSE: ${rmse:,.2f}")
         
         return True
     
+    def reentrenar_en_segundo_plano(self):
+        """
+        Reentrena en un hilo en segundo plano; mientras tanto se sigue prediciendo con la
+        versión activa, que se sustituye de forma atómica al terminar
+        
+        Returns:
+            Future con la nueva versión
+        """
+        metricas = {}
+        
+        def entrenar():
+            modelo, scaler, metricas['r2'], metricas['rmse'] = self._entrenar()
+            return modelo, scaler
+        
+        def informar(futuro):
+            # Se ejecuta cuando el Future termina, es decir, después de activar la nueva versión
+            if futuro.exception() is not None:
+                print(f"\n❌ Error al reentrenar: {futuro.exception()}")
+                return
+            print(f"\n✅ Nuevo modelo activo: {futuro.result().nombre} "
+                  f"(R² {metricas['r2']:.4f}, RMSE ${metricas['rmse']:,.2f})")
+        
+        futuro = self.registro.entrenar_en_segundo_plano(entrenar)
+        futuro.add_done_callback(informar)
+        return futuro
+    
     def predecir_salario(self, datos_empleado):
         """
         Predice el salario basado en los datos del empleado
@@ -60,18 +105,22 @@ class PredictorSalarios:
         Args:
             datos_empleado: Lista con [edad, experiencia, educacion, horas, proyectos, certificaciones]
         """
+        return self.predecir_salarios_lote([datos_empleado])[0]
+    
+    @medir("prediccion_simple.predecir_lote")
+    def predecir_salarios_lote(self, datos_empleados, tamano_bloque=None):
+        """
+        Predice el salario de varios empleados con una sola llamada vectorizada
+        
+        Args:
+            datos_empleados: Matriz 2-D, DataFrame o iterable de filas de empleados
+            tamano_bloque: Número de filas por bloque para lotes muy grandes (opcional)
+        """
         if not self.entrenado:
             print("❌ El modelo no está entrenado. Ejecutando entrenamiento...")
             self.entrenar_modelo()
         
-        # Convertir a array y normalizar
-        datos_array = np.array([datos_empleado])
-        datos_scaled = self.scaler.transform(datos_array)
-        
-        # Hacer predicción
-        salario_predicho = self.modelo.predict(datos_scaled)[0]
-        
-        return salario_predicho
+        return self.registro.predecir(datos_empleados, tamano_bloque=tamano_bloque)
 
 def obtener_datos_empleado():
     """
@@ -84,14 +133,17 @@ def obtener_datos_empleado():
     try:
         print("\nPor favor, ingresa los datos:")
         
-        edad = float(input("• Edad (22-65 años): "))
-        experiencia = float(input("• Años de experiencia laboral (0-35): "))
-        educacion = float(input("• Años de educación formal (12-22): "))
-        horas = float(input("• Horas trabajadas por semana (30-60): "))
-        proyectos = int(input("• Número de proyectos completados: "))
-        certificaciones = int(input("• Número de certificaciones obtenidas: "))
+        valores = [
+            ESQUEMA_EMPLEADO.convertir_valor(campo, input(ESQUEMA_EMPLEADO.pregunta(campo)))
+            for campo in ESQUEMA_EMPLEADO.campos
+        ]
+        empleado = Empleado(*valores)
+        
+        # Validación con el mismo esquema que usa la puntuación masiva
+        for campo in ESQUEMA_EMPLEADO.describir(ESQUEMA_EMPLEADO.validar(empleado)[0]):
+            print(f"⚠️  Advertencia: {campo.etiqueta} debe estar en el rango {ESQUEMA_EMPLEADO.texto_rango(campo)}")
         
-        return [edad, experiencia, educacion, horas, proyectos, certificaciones]
+        return empleado
         
     except ValueError:
         print("❌ Error: Por favor ingresa valores numéricos válidos")
@@ -118,16 +170,7 @@ def mostrar_resultado(datos, salario_predicho):
     print(f"   ${salario_predicho/12:,.2f} USD mensuales")
     
     # Categorizar
-    if salario_predicho < 40000:
-        categoria = "Junior"
-    elif salario_predicho < 60000:
-        categoria = "Intermedio"
-    elif salario_predicho < 80000:
-        categoria = "Senior"
-    elif salario_predicho < 100000:
-        categoria = "Experto"
-    else:
-        categoria = "Muy Experto"
+    categoria = BANDAS_SALARIALES.etiqueta(salario_predicho)
     
     print(f"\n🏷️  Categoría estimada: {categoria}")
     print("="*60)
@@ -148,9 +191,13 @@ def mostrar_ejemplos(predictor):
         {"nombre": "Tech Lead", "datos": [42, 15, 22, 55, 35, 7]}
     ]
     
-    for ejemplo in ejemplos:
-        salario = predictor.predecir_salario(ejemplo["datos"])
+    salarios = predictor.predecir_salarios_lote(LoteEmpleados.desde_filas(ejemplo["datos"] for ejemplo in ejemplos))
+    
+    for ejemplo, salario in zip(ejemplos, salarios):
         print(f"\n{ejemplo['nombre']}: ${salario:,.2f} USD")
+    
+    estadisticas = predictor.registro.cache_predicciones.estadisticas()
+    print(f"\n🗄️  Cache de predicciones: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos")
 
 def main():
     """
@@ -192,12 +239,13 @@ def main():
             input("\nPresiona Enter para continuar...")
             
         elif opcion == "3":
-            print("\n🔄 Reentrenando modelo...")
-            predictor.entrenar_modelo()
+            print("\n🔄 Reentrenando modelo en segundo plano (puedes seguir haciendo predicciones)...")
+            predictor.reentrenar_en_segundo_plano()
             input("Presiona Enter para continuar...")
             
         elif opcion == "4":
             print("\n👋 ¡Gracias por usar el Predictor de Salarios!")
+            predictor.registro.cerrar()
             break
             
         else:
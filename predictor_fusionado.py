@@ -0,0 +1,123 @@
+import numpy as np
+
+# Versión del formato del artefacto .npz
+VERSION_FORMATO = 1
+
+class PredictorFusionado:
+    """
+    Predictor compilado que combina StandardScaler + LinearRegression en una sola operación afín
+
+    Como ((x - media) / escala) · coef + intercepto = x · (coef / escala) + (intercepto - media · coef / escala),
+    la media, la escala, los coeficientes y el intercepto se pliegan en un único vector de pesos
+    y un sesgo. Predecir un lote es un producto matriz-vector sin arrays intermedios escalados.
+
+    Este módulo solo depende de numpy: el artefacto guardado se puede cargar sin importar sklearn.
+    """
+
+    def __init__(self, pesos, sesgo, columnas=None):
+        self.pesos = np.ascontiguousarray(pesos, dtype=np.float64).ravel()
+        self.sesgo = float(sesgo)
+        self.columnas = list(columnas) if columnas is not None else None
+
+    @classmethod
+    def desde_modelos(cls, modelo, scaler=None):
+        """
+        Construye el predictor a partir de un LinearRegression y un StandardScaler ya entrenados
+
+        Args:
+            modelo: Modelo de regresión lineal entrenado sobre los datos escalados, o un
+                    Pipeline (scaler, modelo) si scaler es None
+            scaler: StandardScaler ajustado sobre los datos originales
+        """
+        if scaler is None:
+            # Pipeline de sklearn: el primer paso es el scaler y el último el modelo
+            scaler, modelo = modelo.steps[0][1], modelo.steps[-1][1]
+
+        coef = np.asarray(modelo.coef_, dtype=np.float64).ravel()
+        intercepto = float(np.ravel(modelo.intercept_)[0])
+
+        # Con with_mean=False el scaler calcula mean_ pero no la resta
+        usa_media = getattr(scaler, 'with_mean', True) and scaler.mean_ is not None
+        media = scaler.mean_ if usa_media else np.zeros_like(coef)
+        escala = scaler.scale_ if scaler.scale_ is not None else np.ones_like(coef)
+
+        pesos = coef / escala
+        sesgo = intercepto - float(np.dot(media, pesos))
+
+        columnas = getattr(scaler, 'feature_names_in_', None)
+        return cls(pesos, sesgo, columnas)
+
+    def _matriz(self, datos):
+        if hasattr(datos, 'columns'):
+            # DataFrame: seleccionar las columnas en el orden del entrenamiento
+            columnas = self.columnas if self.columnas is not None else list(datos.columns[:len(self.pesos)])
+            datos = datos[columnas].to_numpy(dtype=np.float64)
+
+        matriz = np.asarray(datos, dtype=np.float64)
+        if matriz.ndim == 1:
+            matriz = matriz.reshape(1, -1)
+
+        if matriz.shape[1] != self.pesos.shape[0]:
+            raise ValueError(
+                f"Se esperaban {self.pesos.shape[0]} features por fila, se recibieron {matriz.shape[1]}"
+            )
+        return matriz
+
+    def predecir(self, datos, out=None):
+        """
+        Predice los salarios de un lote de empleados con un único producto matriz-vector
+
+        Args:
+            datos: Matriz 2-D (n_empleados x n_features), una sola fila o un DataFrame
+            out: Array de salida opcional de longitud n_empleados para reutilizar memoria
+        """
+        matriz = self._matriz(datos)
+        predicciones = np.dot(matriz, self.pesos, out=out)
+        predicciones += self.sesgo
+        return predicciones
+
+    def predecir_en_bloques(self, datos, tamano_bloque, out=None):
+        """
+        Predice un lote grande por bloques de tamano_bloque filas, escribiendo cada bloque
+        directamente en el array de salida
+
+        Args:
+            datos: Matriz 2-D, una sola fila o un DataFrame
+            tamano_bloque: Número de filas por bloque
+            out: Array de salida opcional de longitud n_empleados
+        """
+        matriz = self._matriz(datos)
+        if out is None:
+            out = np.empty(matriz.shape[0], dtype=np.float64)
+        for inicio in range(0, matriz.shape[0], tamano_bloque):
+            fin = inicio + tamano_bloque
+            self.predecir(matriz[inicio:fin], out=out[inicio:fin])
+        return out
+
+    def guardar(self, ruta):
+        """
+        Guarda el predictor como un artefacto .npz de unos pocos bytes
+        """
+        columnas = np.array(self.columnas if self.columnas is not None else [], dtype=np.str_)
+        with open(ruta, 'wb') as archivo:
+            np.savez(
+                archivo,
+                version=np.array(VERSION_FORMATO),
+                pesos=self.pesos,
+                sesgo=np.array(self.sesgo),
+                columnas=columnas
+            )
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un predictor guardado con guardar() sin necesidad de sklearn
+        """
+        with np.load(ruta, allow_pickle=False) as artefacto:
+            version = int(artefacto['version'])
+            if version != VERSION_FORMATO:
+                raise ValueError(f"Versión de artefacto no soportada: {version}")
+
+            columnas = [str(columna) for columna in artefacto['columnas']] or None
+            return cls(artefacto['pesos'], float(artefacto['sesgo']), columnas)
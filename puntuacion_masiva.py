@@ -0,0 +1,171 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from categorias_salario import BANDAS_SALARIALES
+from esquema_empleado import ESQUEMA_EMPLEADO
+from predictor_fusionado import PredictorFusionado
+from prediccion_lote import COLUMNAS_FEATURES, convertir_a_matriz
+
+def _formato_archivo(ruta, formato=None):
+    if formato:
+        return formato
+    extension = os.path.splitext(ruta)[1].lower()
+    return 'jsonl' if extension in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+def leer_bloques(ruta, tamano_bloque, formato=None):
+    """
+    Lee un archivo de empleados (CSV o JSONL) por bloques de tamano_bloque filas
+    """
+    if _formato_archivo(ruta, formato) == 'jsonl':
+        with pd.read_json(ruta, lines=True, chunksize=tamano_bloque) as lector:
+            yield from lector
+    else:
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque)
+
+def cargar_predictor(run_id=None, ruta_modelo=None):
+    """
+    Obtiene el predictor fusionado desde un .npz exportado o desde un run de MLflow
+    """
+    if ruta_modelo:
+        return PredictorFusionado.cargar(ruta_modelo)
+
+    from cache_modelos import cargar_modelo_cacheado
+    modelo, scaler = cargar_modelo_cacheado(run_id)
+    return PredictorFusionado.desde_modelos(modelo, scaler)
+
+def _aplicar_esquema(bloque, matriz, filas_invalidas, esquema, violaciones):
+    """
+    Valida un bloque con el esquema y rechaza o recorta las filas inválidas
+
+    Al recortar, el bloque devuelto lleva los valores recortados en sus columnas de features,
+    los mismos con los que se predice. En violaciones, 'filas' cuenta las filas omitidas
+    ('rechazar') o recortadas ('recortar'), y 'no_finitas' las que se omiten al recortar
+    porque un valor no finito no tiene recorte posible.
+
+    Returns:
+        (bloque, matriz) a puntuar
+    """
+    mascaras = esquema.validar(matriz)
+    invalidas = mascaras != 0
+    if not invalidas.any():
+        return bloque, matriz
+
+    for nombre, n in esquema.contar_violaciones(mascaras[invalidas]).items():
+        violaciones[nombre] = violaciones.get(nombre, 0) + n
+
+    if filas_invalidas == 'recortar':
+        matriz = esquema.recortar(matriz)
+        # Los valores no finitos no se pueden recortar: esas filas se rechazan
+        validas = np.isfinite(matriz).all(axis=1)
+        recortadas = invalidas & validas
+        violaciones['no_finitas'] = violaciones.get('no_finitas', 0) + int(np.count_nonzero(~validas))
+    else:
+        validas = ~invalidas
+        recortadas = invalidas
+    violaciones['filas'] = violaciones.get('filas', 0) + int(np.count_nonzero(recortadas))
+
+    if not validas.all():
+        bloque, matriz = bloque[validas].copy(), matriz[validas]
+    if filas_invalidas == 'recortar':
+        for j, columna in enumerate(COLUMNAS_FEATURES):
+            # Los conteos recortados ya están redondeados: conservan el tipo entero de la columna
+            bloque[columna] = matriz[:, j].astype(bloque[columna].dtype, copy=False)
+    return bloque, matriz
+
+def puntuar_archivo(predictor, entrada, salida, tamano_bloque=100000, formato_entrada=None, formato_salida=None,
+                    bandas=BANDAS_SALARIALES, filas_invalidas='aceptar', esquema=ESQUEMA_EMPLEADO):
+    """
+    Puntúa un archivo de empleados por bloques y escribe predicción y categoría por fila
+
+    Cada bloque se puntúa con una única llamada vectorizada; la memoria usada depende solo
+    del tamaño de bloque.
+
+    Args:
+        filas_invalidas: Qué hacer con las filas que no cumplen el esquema (rango, tipo, valores
+                         finitos): 'aceptar' (puntuarlas igual), 'rechazar' (omitirlas de la salida)
+                         o 'recortar' (puntuar y escribir los valores recortados al rango del
+                         esquema; las filas con valores no finitos se omiten)
+
+    Returns:
+        (filas puntuadas, segundos transcurridos, violaciones por campo con el total en 'filas'
+        y, al recortar, las filas omitidas por valores no finitos en 'no_finitas')
+    """
+    formato_salida = _formato_archivo(salida, formato_salida)
+    filas = 0
+    violaciones = {}
+    inicio = time.perf_counter()
+
+    with open(salida, 'w', newline='') as archivo:
+        for i, bloque in enumerate(leer_bloques(entrada, tamano_bloque, formato_entrada)):
+            matriz = convertir_a_matriz(bloque)
+            if filas_invalidas != 'aceptar':
+                bloque, matriz = _aplicar_esquema(bloque, matriz, filas_invalidas, esquema, violaciones)
+            salarios = predictor.predecir(matriz)
+
+            bloque['salario_predicho'] = salarios.round(2)
+            bloque['categoria'] = bandas.como_categorical(salarios)
+
+            if formato_salida == 'jsonl':
+                if bloque.empty:
+                    # to_json de un bloque vacío devuelve '\n': no escribir líneas en blanco
+                    continue
+                texto = bloque.to_json(orient='records', lines=True, force_ascii=False)
+                archivo.write(texto if texto.endswith('\n') else texto + '\n')
+            else:
+                bloque.to_csv(archivo, index=False, header=(i == 0))
+
+            filas += len(bloque)
+
+    return filas, time.perf_counter() - inicio, violaciones
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Puntúa en bloque un archivo de empleados (CSV o JSONL) con el modelo de salarios"
+    )
+    origen = parser.add_mutually_exclusive_group(required=True)
+    origen.add_argument("--run-id", help="Run de MLflow con el modelo y el scaler")
+    origen.add_argument("--modelo", help="Predictor fusionado exportado (.npz)")
+    parser.add_argument("entrada", help="Archivo de entrada con las columnas: " + ", ".join(COLUMNAS_FEATURES))
+    parser.add_argument("salida", help="Archivo de salida (.csv o .jsonl)")
+    parser.add_argument("--tamano-bloque", type=int, default=100000, help="Filas por bloque")
+    parser.add_argument("--formato-entrada", choices=["csv", "jsonl"], default=None,
+                        help="Formato de entrada (por defecto, según la extensión)")
+    parser.add_argument("--formato-salida", choices=["csv", "jsonl"], default=None,
+                        help="Formato de salida (por defecto, según la extensión)")
+    parser.add_argument("--filas-invalidas", choices=["aceptar", "rechazar", "recortar"], default="aceptar",
+                        help="Filas fuera del rango del esquema: puntuarlas, omitirlas o recortar sus valores")
+    args = parser.parse_args()
+
+    predictor = cargar_predictor(args.run_id, args.modelo)
+
+    print(f"Puntuando '{args.entrada}'...")
+    filas, segundos, violaciones = puntuar_archivo(
+        predictor,
+        args.entrada,
+        args.salida,
+        tamano_bloque=args.tamano_bloque,
+        formato_entrada=args.formato_entrada,
+        formato_salida=args.formato_salida,
+        filas_invalidas=args.filas_invalidas
+    )
+
+    print(f"Filas puntuadas: {filas:,}")
+    if violaciones:
+        accion = "omitidas" if args.filas_invalidas == "rechazar" else "recortadas"
+        print(f"Filas inválidas ({accion}): {violaciones.pop('filas'):,}")
+        no_finitas = violaciones.pop('no_finitas', 0)
+        if no_finitas:
+            print(f"Filas omitidas por valores no finitos: {no_finitas:,}")
+        for nombre, n in violaciones.items():
+            if n:
+                print(f"- {nombre}: {n:,}")
+    print(f"Tiempo: {segundos:.2f} s")
+    print(f"Rendimiento: {filas / max(segundos, 1e-9):,.0f} filas/s")
+    print(f"Resultados guardados en '{args.salida}'")
+
+if __name__ == "__main__":
+    main()
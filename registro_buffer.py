@@ -0,0 +1,200 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import mlflow
+import mlflow.sklearn
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+
+from instrumentacion import medir
+
+# Límites de MlflowClient.log_batch por llamada
+MAX_METRICAS_POR_LOTE = 1000
+MAX_PARAMS_POR_LOTE = 100
+MAX_TAGS_POR_LOTE = 100
+MAX_ENTIDADES_POR_LOTE = 1000
+
+class BufferRegistroMLflow:
+    """
+    Acumula params, métricas y tags de un run y los envía con log_batch
+
+    En lugar de una llamada al tracking store por cada log_param/log_metric, los valores se
+    guardan en memoria y se envían en lotes al cerrar el buffer o al superar umbral_vaciado
+    entradas. Las subidas de artefactos y modelos se ejecutan en hilos en segundo plano para
+    no bloquear el entrenamiento; cerrar() espera a que terminen y propaga sus errores.
+    Si el bloque with lanza una excepción, lo pendiente se descarta y se propaga la original.
+
+    Se usa como context manager dentro de mlflow.start_run().
+    """
+
+    def __init__(self, run_id=None, umbral_vaciado=MAX_PARAMS_POR_LOTE, hilos_artefactos=2, cliente=None):
+        self.run_id = run_id or mlflow.active_run().info.run_id
+        self.umbral_vaciado = umbral_vaciado
+        self.cliente = cliente or MlflowClient()
+        self._metricas = []
+        self._params = []
+        self._tags = []
+        self._lock = threading.Lock()
+        self._lock_run = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=hilos_artefactos, thread_name_prefix="registro-mlflow")
+        self._subidas = []
+        self._directorio_temporal = None
+
+    # --- Params, métricas y tags -------------------------------------------------
+
+    def log_param(self, clave, valor):
+        self.log_params({clave: valor})
+
+    def log_params(self, params):
+        with self._lock:
+            self._params.extend(Param(clave, str(valor)) for clave, valor in params.items())
+        self._vaciar_si_lleno()
+
+    def log_metric(self, clave, valor, step=0):
+        self.log_metrics({clave: valor}, step=step)
+
+    def log_metrics(self, metricas, step=0):
+        instante = int(time.time() * 1000)
+        with self._lock:
+            self._metricas.extend(
+                Metric(clave, float(valor), instante, step) for clave, valor in metricas.items()
+            )
+        self._vaciar_si_lleno()
+
+    def set_tag(self, clave, valor):
+        self.set_tags({clave: valor})
+
+    def set_tags(self, tags):
+        with self._lock:
+            self._tags.extend(RunTag(clave, str(valor)) for clave, valor in tags.items())
+        self._vaciar_si_lleno()
+
+    def _pendientes(self):
+        return len(self._metricas) + len(self._params) + len(self._tags)
+
+    def _vaciar_si_lleno(self):
+        if self._pendientes() >= self.umbral_vaciado:
+            self.vaciar()
+
+    def vaciar(self):
+        """
+        Envía todo lo acumulado con el mínimo número de llamadas a log_batch
+        """
+        with self._lock:
+            metricas, params, tags = self._metricas, self._params, self._tags
+            self._metricas, self._params, self._tags = [], [], []
+
+        while metricas or params or tags:
+            lote_params = params[:MAX_PARAMS_POR_LOTE]
+            lote_tags = tags[:MAX_TAGS_POR_LOTE]
+            espacio = MAX_ENTIDADES_POR_LOTE - len(lote_params) - len(lote_tags)
+            lote_metricas = metricas[:min(MAX_METRICAS_POR_LOTE, espacio)]
+
+            self.cliente.log_batch(self.run_id, metrics=lote_metricas, params=lote_params, tags=lote_tags)
+
+            params = params[len(lote_params):]
+            tags = tags[len(lote_tags):]
+            metricas = metricas[len(lote_metricas):]
+
+    # --- Artefactos en segundo plano ---------------------------------------------
+
+    def ruta_temporal(self, nombre):
+        """
+        Devuelve una ruta en un directorio temporal que se borra al cerrar el buffer,
+        para artefactos que solo existen para ser subidos
+        """
+        if self._directorio_temporal is None:
+            self._directorio_temporal = tempfile.mkdtemp(prefix="registro-mlflow-")
+        return os.path.join(self._directorio_temporal, nombre)
+
+    def en_segundo_plano(self, funcion, *args, **kwargs):
+        """
+        Ejecuta una tarea de registro en el pool de hilos y devuelve su Future
+        """
+        futuro = self._pool.submit(funcion, *args, **kwargs)
+        self._subidas.append(futuro)
+        return futuro
+
+    def log_artifact(self, ruta_local, ruta_artefacto=None):
+        """
+        Sube un archivo al run en segundo plano
+        """
+        return self.en_segundo_plano(self.cliente.log_artifact, self.run_id, ruta_local, ruta_artefacto)
+
+    def log_model_sklearn(self, modelo, ruta_artefacto, registered_model_name=None, **opciones):
+        """
+        Registra un modelo sklearn con mlflow.sklearn.log_model en segundo plano
+
+        log_model guarda el MLmodel con sus metadatos (firma, ejemplo de entrada si se indican en
+        opciones), añade el modelo a la etiqueta mlflow.log-model.history del run y crea la
+        versión registrada. Se ejecuta con el run del buffer como run activo.
+        """
+        return self.en_segundo_plano(
+            self._log_model_en_run, modelo, ruta_artefacto, registered_model_name, opciones
+        )
+
+    @medir("registro.log_model")
+    def _log_model_en_run(self, modelo, ruta_artefacto, registered_model_name, opciones):
+        activo = mlflow.active_run()
+        if activo is not None and activo.info.run_id == self.run_id:
+            # La pila de runs activos de mlflow es del proceso: el run del buffer ya es el activo
+            return mlflow.sklearn.log_model(
+                modelo, ruta_artefacto, registered_model_name=registered_model_name, **opciones
+            )
+
+        # Este hilo no ve el run del buffer: se reanuda explícitamente solo para esta llamada
+        with self._lock_run, mlflow.start_run(run_id=self.run_id, nested=activo is not None):
+            return mlflow.sklearn.log_model(
+                modelo, ruta_artefacto, registered_model_name=registered_model_name, **opciones
+            )
+
+    def esperar(self, futuros=None):
+        """
+        Espera a las tareas en segundo plano indicadas (por defecto, todas las lanzadas hasta
+        ahora) y propaga el primer error
+        """
+        futuros = list(self._subidas if futuros is None else futuros)
+        wait(futuros)
+        for futuro in futuros:
+            error = futuro.exception()
+            if error is not None:
+                raise error
+
+    # --- Cierre ------------------------------------------------------------------
+
+    def cerrar(self):
+        """
+        Envía lo pendiente, espera a las subidas en segundo plano y limpia los temporales
+        """
+        try:
+            self.vaciar()
+            self.esperar()
+        finally:
+            self._pool.shutdown(wait=True)
+            if self._directorio_temporal is not None:
+                shutil.rmtree(self._directorio_temporal, ignore_errors=True)
+
+    def abortar(self):
+        """
+        Descarta lo pendiente sin enviarlo: cancela las subidas que no han empezado, espera a
+        las que están en curso ignorando sus errores y limpia los temporales
+        """
+        with self._lock:
+            self._metricas, self._params, self._tags = [], [], []
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._directorio_temporal is not None:
+            shutil.rmtree(self._directorio_temporal, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is not None:
+            # El experimento falló: no se registra nada más y se propaga la excepción original
+            self.abortar()
+            return False
+        self.cerrar()
@@ -0,0 +1,216 @@
+import itertools
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from prediccion_lote import convertir_a_matriz
+from predictor_fusionado import PredictorFusionado
+
+# Nombre con el que experimento_mlflow registra el modelo (el scaler se registra desde el mismo run)
+MODELO_REGISTRADO = "prediccion_salarios"
+
+# Versión cargada en memoria. Es inmutable: el modelo, el scaler y el predictor fusionado
+# se publican juntos, así que quien lee la versión activa nunca ve un par a medio cambiar.
+VersionModelo = namedtuple('VersionModelo', ['nombre', 'modelo', 'scaler', 'predictor', 'origen', 'cargada_en'])
+
+def resolver_run_id(nombre_modelo=MODELO_REGISTRADO, version=None, etapa=None, alias=None):
+    """
+    Devuelve el run_id de una versión registrada en MLflow (por número, etapa o alias)
+
+    Sin version, etapa ni alias se usa la última versión registrada. El scaler se carga del
+    mismo run, así que basta con resolver el modelo.
+    """
+    from mlflow.tracking import MlflowClient
+
+    cliente = MlflowClient()
+    if alias is not None:
+        return cliente.get_model_version_by_alias(nombre_modelo, alias).run_id
+    if version is not None:
+        return cliente.get_model_version(nombre_modelo, str(version)).run_id
+
+    versiones = cliente.search_model_versions(f"name='{nombre_modelo}'")
+    if etapa is not None:
+        versiones = [v for v in versiones if v.current_stage.lower() == etapa.lower()]
+    if not versiones:
+        raise ValueError(f"No hay versiones de '{nombre_modelo}'" + (f" en la etapa '{etapa}'" if etapa else ""))
+    return max(versiones, key=lambda v: int(v.version)).run_id
+
+def interpretar_referencia(referencia):
+    """
+    Convierte una referencia de texto en argumentos de resolver_run_id, o None si es un run_id
+
+    Formatos: 'prediccion_salarios/3' (versión), 'prediccion_salarios/Production' o
+    'prediccion_salarios:Production' (etapa), 'prediccion_salarios/latest' (última versión),
+    'prediccion_salarios@campeon' (alias), con o sin el prefijo 'models:/' de MLflow;
+    cualquier otro texto se toma como run_id.
+    """
+    referencia = referencia.strip()
+    if referencia.startswith("models:/"):
+        referencia = referencia[len("models:/"):]
+    for separador, clave in (("@", 'alias'), ("/", 'version'), (":", 'etapa')):
+        nombre, encontrado, valor = referencia.partition(separador)
+        if encontrado:
+            if clave == 'version' and not valor.isdigit():
+                # Como en los URI models:/<nombre>/<etapa>, un valor no numérico es una etapa
+                if valor.lower() == 'latest':
+                    return {'nombre_modelo': nombre}
+                clave = 'etapa'
+            return {'nombre_modelo': nombre, clave: valor}
+    return None
+
+class RegistroModelosMemoria:
+    """
+    Versiones de (modelo, scaler) cargadas en memoria con cambio atómico de la versión activa
+
+    Las cargas desde MLflow y los reentrenamientos se ejecutan en un hilo en segundo plano;
+    cuando la nueva versión está lista (incluido su predictor fusionado) se activa
+    reasignando una sola referencia. Las predicciones leen esa referencia una vez, sin
+    locks, y usan la versión completa que había en ese momento.
+    """
+
+    def __init__(self, max_versiones=4, cargador=None, cache_predicciones=None):
+        if cargador is None:
+            from cache_modelos import cargar_modelo_cacheado
+            cargador = cargar_modelo_cacheado
+        self.max_versiones = max_versiones
+        self.cache_predicciones = cache_predicciones
+        self._cargador = cargador
+        self._versiones = {}
+        self._activa = None
+        self._lock = threading.Lock()
+        self._contador = itertools.count(1)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="registro-modelos")
+
+    @property
+    def activa(self):
+        """
+        Versión activa (VersionModelo) o None si todavía no hay ninguna
+        """
+        return self._activa
+
+    def versiones(self):
+        """
+        Devuelve los nombres de las versiones en memoria, de la más antigua a la más reciente
+        """
+        with self._lock:
+            return list(self._versiones)
+
+    def registrar(self, nombre, modelo, scaler, origen=None, activar=True):
+        """
+        Añade una versión ya entrenada y, opcionalmente, la activa
+
+        Si se supera max_versiones se descarta la más antigua que no esté activa, junto con sus
+        entradas en cache_predicciones.
+        """
+        version = VersionModelo(
+            nombre, modelo, scaler, PredictorFusionado.desde_modelos(modelo, scaler), origen, time.time()
+        )
+        with self._lock:
+            descartadas = [self._versiones.pop(nombre)] if nombre in self._versiones else []
+            self._versiones[nombre] = version
+            if activar:
+                self._activa = version
+            for antigua in list(self._versiones):
+                if len(self._versiones) <= self.max_versiones:
+                    break
+                if self._activa is None or antigua != self._activa.nombre:
+                    descartadas.append(self._versiones.pop(antigua))
+        if self.cache_predicciones is not None:
+            for descartada in descartadas:
+                if descartada is not self._activa:
+                    self.cache_predicciones.invalidar(self._clave_cache(descartada))
+        return version
+
+    @staticmethod
+    def _clave_cache(version):
+        return (version.nombre, version.cargada_en)
+
+    def activar(self, nombre):
+        """
+        Cambia la versión activa a otra ya cargada
+        """
+        with self._lock:
+            if nombre not in self._versiones:
+                raise KeyError(f"Versión no cargada: {nombre}")
+            self._activa = self._versiones[nombre]
+            return self._activa
+
+    def _cargar(self, run_id, nombre, activar):
+        modelo, scaler = self._cargador(run_id)
+        return self.registrar(nombre or run_id, modelo, scaler, origen={'run_id': run_id}, activar=activar)
+
+    def cargar_run(self, run_id, nombre=None, activar=True):
+        """
+        Carga el (modelo, scaler) de un run en segundo plano
+
+        Returns:
+            Future con la VersionModelo cargada
+        """
+        return self._pool.submit(self._cargar, run_id, nombre, activar)
+
+    def cargar_registrado(self, nombre_modelo=MODELO_REGISTRADO, version=None, etapa=None, alias=None,
+                          activar=True):
+        """
+        Carga en segundo plano una versión registrada en MLflow (por número, etapa o alias)
+
+        Returns:
+            Future con la VersionModelo cargada
+        """
+        def resolver_y_cargar():
+            run_id = resolver_run_id(nombre_modelo, version, etapa, alias)
+            if alias is not None:
+                nombre = f"{nombre_modelo}@{alias}"
+            elif version is not None:
+                nombre = f"{nombre_modelo}/{version}"
+            else:
+                nombre = f"{nombre_modelo}:{etapa or 'ultima'}"
+            return self._cargar(run_id, nombre, activar)
+
+        return self._pool.submit(resolver_y_cargar)
+
+    def cargar_referencia(self, referencia, activar=True):
+        """
+        Carga un run_id o una referencia 'modelo/versión', 'modelo@alias' o 'modelo:etapa'
+        """
+        argumentos = interpretar_referencia(referencia)
+        if argumentos is None:
+            return self.cargar_run(referencia.strip(), activar=activar)
+        return self.cargar_registrado(activar=activar, **argumentos)
+
+    def entrenar_en_segundo_plano(self, entrenar, nombre=None, activar=True):
+        """
+        Ejecuta entrenar() (que devuelve (modelo, scaler)) en segundo plano y registra el resultado
+
+        Returns:
+            Future con la VersionModelo entrenada
+        """
+        def entrenar_y_registrar():
+            modelo, scaler = entrenar()
+            return self.registrar(
+                nombre or f"local-{next(self._contador)}", modelo, scaler, origen={'local': True}, activar=activar
+            )
+
+        return self._pool.submit(entrenar_y_registrar)
+
+    def predecir(self, datos, tamano_bloque=None):
+        """
+        Predice con la versión activa (un lote: matriz, DataFrame o iterable de filas)
+
+        Con cache_predicciones (CachePredicciones) los perfiles repetidos se responden desde la
+        cache, indexada por versión, así que nunca responde con otra versión que la activa. Con
+        tamano_bloque el lote se predice por bloques de ese número de filas, sin pasar por la cache.
+        """
+        version = self._activa
+        if version is None:
+            raise RuntimeError("No hay ninguna versión de modelo activa")
+        if tamano_bloque is not None:
+            return version.predictor.predecir_en_bloques(convertir_a_matriz(datos), tamano_bloque)
+        if self.cache_predicciones is not None:
+            return self.cache_predicciones.predecir(
+                datos, self._clave_cache(version), version.predictor.predecir
+            )
+        return version.predictor.predecir(convertir_a_matriz(datos))
+
+    def cerrar(self):
+        self._pool.shutdown(wait=True)
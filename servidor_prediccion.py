@@ -0,0 +1,301 @@
+import argparse
+import asyncio
+import collections
+import json
+import math
+import time
+
+import numpy as np
+
+from predictor_fusionado import PredictorFusionado
+from empleados import COLUMNAS_CONTEO, LoteEmpleados
+from prediccion_lote import COLUMNAS_FEATURES
+
+# Latencias recientes usadas para calcular los percentiles
+VENTANA_LATENCIAS = 10000
+
+# Tamaño máximo del cuerpo de una petición (una fila de empleado ocupa unos pocos bytes)
+MAX_CUERPO = 64 * 1024
+
+MENSAJES_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error"
+}
+
+class EstadisticasServicio:
+    """
+    Latencias por petición (p50/p99 sobre una ventana reciente), rendimiento y tamaño de lote
+    """
+
+    def __init__(self, ventana=VENTANA_LATENCIAS):
+        self.latencias = collections.deque(maxlen=ventana)
+        self.inicio = time.monotonic()
+        self.peticiones = 0
+        self.lotes = 0
+        self.filas_en_lotes = 0
+
+    def registrar_peticion(self, segundos):
+        self.latencias.append(segundos)
+        self.peticiones += 1
+
+    def registrar_lote(self, tamano):
+        self.lotes += 1
+        self.filas_en_lotes += tamano
+
+    def resumen(self):
+        duracion = time.monotonic() - self.inicio
+        resumen = {
+            'peticiones': self.peticiones,
+            'lotes': self.lotes,
+            'tamano_medio_lote': self.filas_en_lotes / self.lotes if self.lotes else 0.0,
+            'peticiones_por_segundo': self.peticiones / duracion if duracion > 0 else 0.0,
+            'latencia_p50_ms': None,
+            'latencia_p99_ms': None
+        }
+        if self.latencias:
+            p50, p99 = np.percentile(np.fromiter(self.latencias, dtype=np.float64), [50, 99])
+            resumen['latencia_p50_ms'] = p50 * 1000
+            resumen['latencia_p99_ms'] = p99 * 1000
+        return resumen
+
+class AgrupadorMicroLotes:
+    """
+    Agrupa peticiones individuales concurrentes en micro-lotes y los puntúa con una sola llamada
+
+    Un lote se cierra al alcanzar max_lote filas o cuando han pasado max_espera segundos desde
+    que llegó su primera fila.
+    """
+
+    def __init__(self, predictor, max_lote=64, max_espera=0.002, estadisticas=None):
+        self.predictor = predictor
+        self.max_lote = max_lote
+        self.max_espera = max_espera
+        self.estadisticas = estadisticas or EstadisticasServicio()
+        self._cola = asyncio.Queue()
+        self._tarea = None
+        # Buffers reutilizados por todos los micro-lotes (solo se usan desde el bucle de eventos)
+        self._lote = LoteEmpleados(max_lote)
+        self._predicciones = np.empty(max_lote, dtype=np.float64)
+
+    def iniciar(self):
+        self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+
+    async def predecir(self, fila):
+        """
+        Encola una fila y espera su predicción
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((fila, futuro))
+        return await futuro
+
+    async def _bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.max_espera
+
+            while len(lote) < self.max_lote:
+                # Tomar sin esperar lo que ya esté en la cola
+                if not self._cola.empty():
+                    lote.append(self._cola.get_nowait())
+                    continue
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            self._puntuar(lote)
+
+    def _puntuar(self, lote):
+        futuros = [futuro for _, futuro in lote]
+        try:
+            self._lote.vaciar().extender([fila for fila, _ in lote])
+            predicciones = self.predictor.predecir(self._lote.matriz, out=self._predicciones[:len(lote)])
+        except Exception as error:
+            for futuro in futuros:
+                if not futuro.done():
+                    futuro.set_exception(error)
+            return
+
+        self.estadisticas.registrar_lote(len(lote))
+        for futuro, prediccion in zip(futuros, predicciones.tolist()):
+            if not futuro.done():
+                futuro.set_result(prediccion)
+
+def _fila_desde_json(cuerpo):
+    """
+    Extrae la fila de features de {"datos": [...]} o de un objeto con los nombres de las columnas
+    """
+    datos = json.loads(cuerpo)
+    if isinstance(datos, dict) and 'datos' in datos:
+        fila = datos['datos']
+    elif isinstance(datos, dict):
+        fila = [datos[columna] for columna in COLUMNAS_FEATURES]
+    else:
+        fila = datos
+
+    fila = [float(valor) for valor in fila]
+    if len(fila) != len(COLUMNAS_FEATURES):
+        raise ValueError(f"Se esperaban {len(COLUMNAS_FEATURES)} valores: {', '.join(COLUMNAS_FEATURES)}")
+    # Una fila no finita se rechaza aquí para no hacer fallar al resto de su micro-lote
+    if not all(math.isfinite(valor) for valor in fila):
+        raise ValueError("Los valores deben ser números finitos")
+    for columna in COLUMNAS_CONTEO:
+        if not fila[COLUMNAS_FEATURES.index(columna)].is_integer():
+            raise ValueError(f"{columna} debe ser un número entero")
+    return fila
+
+class ServidorPrediccion:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio con los endpoints:
+
+        POST /predecir   {"datos": [edad, experiencia, educacion, horas, proyectos, certificaciones]}
+        GET  /metricas   latencias p50/p99, peticiones/s y tamaño medio de lote
+        GET  /salud
+    """
+
+    def __init__(self, predictor, max_lote=64, max_espera=0.002):
+        self.estadisticas = EstadisticasServicio()
+        self.agrupador = AgrupadorMicroLotes(predictor, max_lote, max_espera, self.estadisticas)
+
+    async def _responder(self, writer, estado, contenido, mantener):
+        cuerpo = json.dumps(contenido).encode('utf-8')
+        cabeceras = (
+            f"HTTP/1.1 {estado} {MENSAJES_HTTP[estado]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        writer.write(cabeceras.encode('latin-1') + cuerpo)
+        await writer.drain()
+
+    async def _atender_peticion(self, metodo, ruta, cuerpo):
+        if ruta == '/predecir':
+            if metodo != 'POST':
+                return 405, {'error': 'Usa POST'}
+            inicio = time.perf_counter()
+            try:
+                fila = _fila_desde_json(cuerpo)
+            except (ValueError, KeyError, TypeError) as error:
+                return 400, {'error': str(error)}
+            salario = await self.agrupador.predecir(fila)
+            self.estadisticas.registrar_peticion(time.perf_counter() - inicio)
+            return 200, {'salario_predicho': salario}
+
+        if ruta == '/metricas':
+            return 200, self.estadisticas.resumen()
+
+        if ruta == '/salud':
+            return 200, {'estado': 'ok'}
+
+        return 404, {'error': f"Ruta no encontrada: {ruta}"}
+
+    @staticmethod
+    def _longitud_cuerpo(cabeceras):
+        """
+        Devuelve el Content-Length validado (lanza ValueError si no es un entero entre 0 y MAX_CUERPO)
+        """
+        valor = cabeceras.get('content-length', '0')
+        if not (valor.isascii() and valor.isdigit()):
+            raise ValueError(f"Content-Length inválido: {valor!r}")
+        longitud = int(valor)
+        if longitud > MAX_CUERPO:
+            raise ValueError(f"Cuerpo demasiado grande: {longitud} bytes (máximo {MAX_CUERPO})")
+        return longitud
+
+    async def manejar_conexion(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(writer, 400, {'error': 'Petición mal formada'}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    linea_cabecera = await reader.readline()
+                    if linea_cabecera in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea_cabecera.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                try:
+                    longitud = self._longitud_cuerpo(cabeceras)
+                except ValueError as error:
+                    # Sin una longitud válida no se sabe dónde acaba el cuerpo: se cierra la conexión
+                    await self._responder(writer, 400, {'error': str(error)}, False)
+                    break
+                cuerpo = await reader.readexactly(longitud) if longitud else b''
+
+                conexion = cabeceras.get('connection', '').lower()
+                mantener = conexion != 'close' and (version == 'HTTP/1.1' or conexion == 'keep-alive')
+
+                try:
+                    estado, contenido = await self._atender_peticion(metodo, ruta.split('?')[0], cuerpo)
+                except Exception as error:
+                    estado, contenido = 500, {'error': str(error)}
+
+                await self._responder(writer, estado, contenido, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, host="127.0.0.1", puerto=8000):
+        self.agrupador.iniciar()
+        servidor = await asyncio.start_server(self.manejar_conexion, host, puerto)
+        print(f"🚀 Servidor de predicción escuchando en http://{host}:{puerto}")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            await self.agrupador.detener()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP de predicción de salarios con micro-lotes")
+    origen = parser.add_mutually_exclusive_group(required=True)
+    origen.add_argument("--run-id", help="Run de MLflow con el modelo y el scaler")
+    origen.add_argument("--modelo", help="Predictor fusionado exportado (.npz)")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección de escucha")
+    parser.add_argument("--puerto", type=int, default=8000, help="Puerto de escucha")
+    parser.add_argument("--max-lote", type=int, default=64, help="Tamaño máximo de cada micro-lote")
+    parser.add_argument("--max-espera-ms", type=float, default=2.0,
+                        help="Espera máxima para completar un micro-lote, en milisegundos")
+    args = parser.parse_args()
+
+    if args.modelo:
+        predictor = PredictorFusionado.cargar(args.modelo)
+    else:
+        # El modelo y el scaler se cargan una sola vez, igual que cargar_modelo_entrenado
+        from cache_modelos import cargar_modelo_cacheado
+        modelo, scaler = cargar_modelo_cacheado(args.run_id)
+        predictor = PredictorFusionado.desde_modelos(modelo, scaler)
+
+    servidor = ServidorPrediccion(predictor, args.max_lote, args.max_espera_ms / 1000)
+    try:
+        asyncio.run(servidor.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del proyecto están en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def mlflow_local(tmp_path, monkeypatch):
+    """
+    Tracking store y caches de artefactos y preprocesamiento en directorios temporales; devuelve un MlflowClient
+    """
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    import cache_artefactos
+    import cache_preprocesamiento
+
+    uri_anterior = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+    mlflow.set_experiment("pruebas")
+    monkeypatch.setattr(cache_artefactos, 'DIRECTORIO_CACHE', str(tmp_path / "cache_artefactos"))
+    monkeypatch.setattr(cache_preprocesamiento, 'DIRECTORIO_CACHE', str(tmp_path / "cache_preprocesamiento"))
+    yield MlflowClient()
+    mlflow.set_tracking_uri(uri_anterior)
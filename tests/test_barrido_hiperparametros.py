@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+
+import barrido_hiperparametros
+from barrido_hiperparametros import _nombre_prueba, ejecutar_barrido, generar_aleatorio, generar_grid
+from cache_preprocesamiento import obtener_preprocesado
+from mlflow_regression_example import PARAMETROS_SPLIT
+
+def test_generar_grid():
+    pruebas = generar_grid(alphas=(0.1, 1.0))
+
+    # LinearRegression: 2 positive x 2 escalado; Ridge y Lasso: además 2 alphas
+    assert len(pruebas) == 4 + 2 * 8
+    assert all(p['alpha'] is None for p in pruebas if p['familia'] == 'LinearRegression')
+    assert {p['alpha'] for p in pruebas if p['familia'] == 'Lasso'} == {0.1, 1.0}
+    assert len({_nombre_prueba(p) for p in pruebas}) == len(pruebas)
+
+def test_generar_aleatorio_es_reproducible_y_respeta_el_rango():
+    pruebas = generar_aleatorio(50, alpha_min=1e-2, alpha_max=1e2, semilla=7)
+
+    assert pruebas == generar_aleatorio(50, alpha_min=1e-2, alpha_max=1e2, semilla=7)
+    assert pruebas != generar_aleatorio(50, alpha_min=1e-2, alpha_max=1e2, semilla=8)
+    alphas = [p['alpha'] for p in pruebas if p['familia'] != 'LinearRegression']
+    assert alphas and all(1e-2 <= alpha <= 1e2 for alpha in alphas)
+    assert generar_aleatorio(0) == []
+
+def test_nombre_prueba():
+    assert _nombre_prueba({'familia': 'LinearRegression', 'alpha': None, 'positive': False, 'escalado': True}) \
+        == "LinearRegression"
+    assert _nombre_prueba({'familia': 'Ridge', 'alpha': 12.3456, 'positive': True, 'escalado': False}) \
+        == "Ridge_alpha=12.35_positive_sin_escalado"
+
+def test_n_pruebas_debe_ser_positivo(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["barrido_hiperparametros.py", "--modo", "aleatorio", "--n-pruebas", "0"])
+    with pytest.raises(SystemExit):
+        barrido_hiperparametros.main()
+    with pytest.raises(ValueError):
+        ejecutar_barrido([])
+
+def test_barrido_pequeno(mlflow_local):
+    pruebas = [
+        {'familia': 'LinearRegression', 'alpha': None, 'positive': False, 'escalado': False},
+        {'familia': 'Ridge', 'alpha': 1e4, 'positive': False, 'escalado': True}
+    ]
+
+    prueba, metricas = ejecutar_barrido(pruebas, n_procesos=2)
+
+    # Las pruebas sin escalado se entrenan sobre el split original, no sobre una reconstrucción
+    entrada = obtener_preprocesado(**PARAMETROS_SPLIT)
+    modelo = LinearRegression().fit(entrada['X_train'], entrada['y_train'])
+    rmse = np.sqrt(mean_squared_error(entrada['y_test'], modelo.predict(entrada['X_test'])))
+    assert prueba == pruebas[0]
+    assert metricas['rmse'] == pytest.approx(rmse, rel=1e-12)
+
+    runs = mlflow_local.search_runs(
+        [mlflow_local.get_experiment_by_name("Prediccion_Salarios_Regresion_Lineal").experiment_id]
+    )
+    nombres = sorted(run.info.run_name for run in runs)
+    assert nombres == sorted(["barrido_hiperparametros", "LinearRegression_sin_escalado", "Ridge_alpha=1e+04"])
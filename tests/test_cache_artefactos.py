@@ -0,0 +1,96 @@
+import os
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+import cache_artefactos
+from cache_artefactos import ARTEFACTO_SCALER, en_cache_local, obtener_artefacto_local, precargar
+
+@pytest.fixture
+def run_con_scaler(mlflow_local):
+    with mlflow.start_run() as run:
+        mlflow.sklearn.log_model(StandardScaler().fit(np.arange(12.0).reshape(6, 2)), ARTEFACTO_SCALER)
+    return run.info.run_id
+
+@pytest.fixture
+def descargas(monkeypatch):
+    llamadas = []
+    descargar = mlflow.artifacts.download_artifacts
+
+    def contar(**kwargs):
+        llamadas.append(kwargs['artifact_path'])
+        return descargar(**kwargs)
+
+    monkeypatch.setattr(cache_artefactos.mlflow.artifacts, 'download_artifacts', contar)
+    return llamadas
+
+def _archivo_modelo(destino):
+    return os.path.join(destino, "model.pkl")
+
+def test_fallo_descarga_y_acierto_reutiliza(run_con_scaler, descargas):
+    assert not en_cache_local(run_con_scaler, ARTEFACTO_SCALER)
+
+    destino = obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+    assert en_cache_local(run_con_scaler, ARTEFACTO_SCALER)
+    assert os.path.isfile(_archivo_modelo(destino))
+
+    assert obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER) == destino
+    assert descargas == [ARTEFACTO_SCALER]
+
+def test_acierto_no_calcula_sha256(run_con_scaler, monkeypatch):
+    obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+
+    def sin_hash(ruta):
+        raise AssertionError("la comprobación rápida no debe leer los archivos")
+
+    monkeypatch.setattr(cache_artefactos, '_sha256', sin_hash)
+    obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+
+def test_copia_modificada_se_descarga_de_nuevo(run_con_scaler, descargas):
+    destino = obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+    original = open(_archivo_modelo(destino), 'rb').read()
+    with open(_archivo_modelo(destino), 'ab') as archivo:
+        archivo.write(b"corrupto")
+
+    obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+
+    assert descargas == [ARTEFACTO_SCALER, ARTEFACTO_SCALER]
+    assert open(_archivo_modelo(destino), 'rb').read() == original
+
+def test_corrupcion_con_mismo_tamano_y_fecha_solo_la_detecta_verificar(run_con_scaler, descargas):
+    destino = obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+    ruta = _archivo_modelo(destino)
+    estado = os.stat(ruta)
+    contenido = bytearray(open(ruta, 'rb').read())
+    contenido[-1] ^= 0xFF
+    with open(ruta, 'wb') as archivo:
+        archivo.write(contenido)
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+
+    obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+    assert descargas == [ARTEFACTO_SCALER]
+
+    precargar([run_con_scaler], artefactos=[ARTEFACTO_SCALER], verificar_sumas=True)
+    assert descargas == [ARTEFACTO_SCALER, ARTEFACTO_SCALER]
+    assert open(ruta, 'rb').read() != bytes(contenido)
+
+def test_descarga_concurrente_usa_la_copia_del_otro_proceso(run_con_scaler, monkeypatch):
+    reemplazar = os.replace
+    otro_proceso = []
+
+    def reemplazar_tras_otro_proceso(origen, destino):
+        if not otro_proceso and os.path.isdir(origen):
+            # Otro proceso completa la misma entrada justo antes de nuestro os.replace
+            otro_proceso.append(None)
+            otro_proceso[0] = obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+        return reemplazar(origen, destino)
+
+    monkeypatch.setattr(cache_artefactos.os, 'replace', reemplazar_tras_otro_proceso)
+    destino = obtener_artefacto_local(run_con_scaler, ARTEFACTO_SCALER)
+
+    assert otro_proceso == [destino]
+    assert en_cache_local(run_con_scaler, ARTEFACTO_SCALER)
+    # No quedan directorios temporales de descarga
+    assert [nombre for nombre in os.listdir(os.path.dirname(destino)) if nombre.startswith(".")] == []
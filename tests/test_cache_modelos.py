@@ -0,0 +1,87 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import cache_modelos
+from cache_modelos import CacheModelos
+
+class CargadorFalso:
+    def __init__(self, espera=None):
+        self.llamadas = []
+        self.espera = espera
+
+    def __call__(self, run_id):
+        self.llamadas.append(run_id)
+        if self.espera is not None:
+            self.espera.wait(5)
+        return f"modelo-{run_id}", f"scaler-{run_id}"
+
+def test_lru_expulsa_la_entrada_menos_usada():
+    cargador = CargadorFalso()
+    cache = CacheModelos(max_entradas=2, cargador=cargador)
+    cache.obtener("a")
+    cache.obtener("b")
+    cache.obtener("a")
+    cache.obtener("c")  # expulsa "b", usada hace más tiempo que "a"
+
+    assert cache.obtener("a") == ("modelo-a", "scaler-a")
+    cache.obtener("b")
+    assert cargador.llamadas == ["a", "b", "c", "b"]
+    assert cache.estadisticas() == {'entradas': 2, 'aciertos': 2, 'fallos': 4}
+
+def test_ttl_recarga_las_entradas_caducadas(monkeypatch):
+    ahora = [1000.0]
+    monkeypatch.setattr(cache_modelos.time, 'monotonic', lambda: ahora[0])
+    cargador = CargadorFalso()
+    cache = CacheModelos(ttl_segundos=60, cargador=cargador)
+
+    cache.obtener("a")
+    ahora[0] += 59
+    cache.obtener("a")
+    assert cargador.llamadas == ["a"]
+
+    ahora[0] += 2
+    cache.obtener("a")
+    assert cargador.llamadas == ["a", "a"]
+
+def test_una_sola_carga_con_peticiones_concurrentes():
+    liberar = threading.Event()
+    cargador = CargadorFalso(espera=liberar)
+    cache = CacheModelos(cargador=cargador)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futuros = [pool.submit(cache.obtener, "a") for _ in range(8)]
+        time.sleep(0.1)
+        liberar.set()
+        resultados = [futuro.result() for futuro in futuros]
+
+    assert cargador.llamadas == ["a"]
+    assert all(resultado == ("modelo-a", "scaler-a") for resultado in resultados)
+
+def test_error_de_carga_no_queda_en_cache():
+    fallar = [True]
+
+    def cargador(run_id):
+        if fallar[0]:
+            raise IOError("sin conexión")
+        return "modelo", "scaler"
+
+    cache = CacheModelos(cargador=cargador)
+    with pytest.raises(IOError):
+        cache.obtener("a")
+    fallar[0] = False
+    assert cache.obtener("a") == ("modelo", "scaler")
+
+def test_invalidar():
+    cargador = CargadorFalso()
+    cache = CacheModelos(cargador=cargador)
+    cache.obtener("a")
+    cache.obtener("b")
+    cache.invalidar("a")
+    cache.obtener("a")
+    cache.obtener("b")
+    assert cargador.llamadas == ["a", "b", "a"]
+    cache.invalidar()
+    assert cache.estadisticas()['entradas'] == 0
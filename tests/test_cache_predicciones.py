@@ -0,0 +1,149 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from cache_predicciones import CachePredicciones
+from registro_modelos_memoria import RegistroModelosMemoria
+
+class PredictorContado:
+    def __init__(self, factor=1.0):
+        self.factor = factor
+        self.filas = []
+
+    def __call__(self, matriz):
+        self.filas.append(len(matriz))
+        return np.nan_to_num(matriz.sum(axis=1), nan=-1.0) * self.factor
+
+def _fila(edad, proyectos=10.0):
+    return [edad, 5.0, 16.0, 40.0, proyectos, 2.0]
+
+def test_solo_se_predicen_las_filas_que_fallan():
+    cache = CachePredicciones()
+    predecir = PredictorContado()
+    cache.predecir([_fila(30), _fila(31)], "v1", predecir)
+
+    resultados = cache.predecir([_fila(30), _fila(32), _fila(31)], "v1", predecir)
+
+    np.testing.assert_array_equal(resultados, [sum(_fila(30)), sum(_fila(32)), sum(_fila(31))])
+    assert predecir.filas == [2, 1]
+    estadisticas = cache.estadisticas()
+    assert (estadisticas['aciertos'], estadisticas['fallos'], estadisticas['entradas']) == (2, 3, 3)
+
+def test_lru_expulsa_el_perfil_menos_usado():
+    cache = CachePredicciones(max_entradas=2)
+    predecir = PredictorContado()
+    cache.predecir([_fila(30), _fila(31)], "v1", predecir)
+    cache.predecir([_fila(30)], "v1", predecir)
+    cache.predecir([_fila(32)], "v1", predecir)  # expulsa 31
+
+    predecir.filas.clear()
+    cache.predecir([_fila(30), _fila(31)], "v1", predecir)
+    assert predecir.filas == [1]
+
+def test_las_versiones_no_se_mezclan_ni_se_vacian_al_alternar():
+    cache = CachePredicciones()
+    v1, v2 = PredictorContado(1.0), PredictorContado(2.0)
+
+    for _ in range(3):
+        assert cache.predecir([_fila(30)], "v1", v1)[0] == sum(_fila(30))
+        assert cache.predecir([_fila(30)], "v2", v2)[0] == 2 * sum(_fila(30))
+
+    assert v1.filas == [1] and v2.filas == [1]
+    assert cache.estadisticas()['invalidaciones'] == 0
+
+    cache.invalidar("v1")
+    assert cache.estadisticas()['entradas'] == 1
+    cache.predecir([_fila(30)], "v1", v1)
+    assert v1.filas == [1, 1]
+    cache.invalidar()
+    estadisticas = cache.estadisticas()
+    assert (estadisticas['entradas'], estadisticas['aciertos'], estadisticas['fallos']) == (0, 4, 3)
+    assert estadisticas['invalidaciones'] == 2
+
+def test_cuantizacion_comparte_la_entrada_y_no_toca_los_conteos():
+    cache = CachePredicciones(resolucion=0.5)
+    predecir = PredictorContado()
+    cache.predecir([_fila(30.1)], "v1", predecir)
+    resultados = cache.predecir([_fila(29.9), _fila(30.1, proyectos=11.0)], "v1", predecir)
+
+    assert resultados[0] == sum(_fila(30.0))
+    assert predecir.filas == [1, 1]
+
+def test_las_filas_con_nan_se_predicen_sin_guardarse():
+    cache = CachePredicciones()
+    predecir = PredictorContado()
+    filas = [_fila(np.nan), _fila(30), _fila(np.nan)]
+
+    for _ in range(3):
+        resultados = cache.predecir(filas, "v1", predecir)
+
+    assert resultados.tolist() == [-1.0, sum(_fila(30)), -1.0]
+    # Las filas con NaN se predicen en cada llamada junto a los fallos, en una sola llamada
+    assert predecir.filas == [3, 2, 2]
+    estadisticas = cache.estadisticas()
+    assert (estadisticas['entradas'], estadisticas['aciertos'], estadisticas['fallos']) == (1, 2, 1)
+
+def _par(pendiente):
+    X = np.vstack([np.zeros(6), np.ones(6)])
+    modelo = LinearRegression()
+    modelo.coef_ = np.full(6, float(pendiente))
+    modelo.intercept_ = 0.0
+    return modelo, StandardScaler().fit(X)
+
+def test_el_registro_no_responde_con_la_cache_de_la_version_anterior():
+    cache = CachePredicciones()
+    registro = RegistroModelosMemoria(cargador=lambda run_id: None, cache_predicciones=cache)
+    datos = np.array([_fila(30)])
+    registro.registrar("v1", *_par(1))
+    antes = registro.predecir(datos)
+    registro.predecir(datos)
+
+    registro.registrar("v2", *_par(2))
+    despues = registro.predecir(datos)
+
+    np.testing.assert_allclose(despues, registro.activa.predictor.predecir(datos))
+    assert despues[0] != antes[0]
+
+    # Volver a la versión anterior reutiliza sus entradas
+    registro.activar("v1")
+    np.testing.assert_array_equal(registro.predecir(datos), antes)
+    assert cache.estadisticas()['fallos'] == 2
+
+def test_el_registro_invalida_las_versiones_descartadas():
+    cache = CachePredicciones()
+    registro = RegistroModelosMemoria(max_versiones=1, cargador=lambda run_id: None, cache_predicciones=cache)
+    datos = np.array([_fila(30)])
+    registro.registrar("v1", *_par(1))
+    registro.predecir(datos)
+
+    registro.registrar("v2", *_par(2))
+
+    assert registro.versiones() == ["v2"]
+    assert cache.estadisticas()['invalidaciones'] == 1
+    assert cache.estadisticas()['entradas'] == 0
+
+def test_la_huella_se_calcula_una_vez_por_modelo(monkeypatch):
+    import cache_predicciones
+
+    modelo, scaler = _par(1)
+    construidos = []
+    desde_modelos = cache_predicciones.PredictorFusionado.desde_modelos
+
+    def contar(*args):
+        construidos.append(args)
+        return desde_modelos(*args)
+
+    monkeypatch.setattr(cache_predicciones.PredictorFusionado, 'desde_modelos', contar)
+    cache = CachePredicciones()
+    datos = np.array([_fila(30)])
+    primera = cache_predicciones.predecir_salarios_cacheado(modelo, scaler, datos, cache)
+    cache_predicciones.predecir_salarios_cacheado(modelo, scaler, datos, cache)
+    assert len(construidos) == 1
+
+    # Reentrenar el mismo objeto cambia la versión
+    X = np.vstack([np.zeros(6), np.full(6, 2.0)])
+    modelo.fit(X, np.array([0.0, 100.0]))
+    segunda = cache_predicciones.predecir_salarios_cacheado(modelo, scaler, datos, cache)
+    assert len(construidos) == 2
+    np.testing.assert_allclose(segunda, modelo.predict(scaler.transform(datos)))
+    assert segunda[0] != primera[0]
@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+import cache_preprocesamiento
+from cache_preprocesamiento import ARRAYS, huella_preprocesamiento, obtener_preprocesado, preprocesar_datos
+from generate_synthetic_data import generate_synthetic_salary_data
+from prediccion_lote import COLUMNAS_FEATURES
+
+@pytest.fixture
+def directorio_cache(tmp_path, monkeypatch):
+    directorio = tmp_path / "cache_preprocesamiento"
+    monkeypatch.setattr(cache_preprocesamiento, 'DIRECTORIO_CACHE', str(directorio))
+    return directorio
+
+@pytest.mark.parametrize("cambio", [{'n_samples': 500}, {'test_size': 0.3}, {'random_state': 7}])
+def test_la_huella_cambia_con_los_parametros(cambio):
+    base = {'n_samples': 1000, 'test_size': 0.2, 'random_state': 42}
+
+    assert huella_preprocesamiento(**base)[0] == huella_preprocesamiento(**base)[0]
+    assert huella_preprocesamiento(**base)[0] != huella_preprocesamiento(**{**base, **cambio})[0]
+
+def test_acierto_devuelve_los_mismos_arrays_y_scaler(directorio_cache, monkeypatch):
+    calculado = obtener_preprocesado(n_samples=300)
+
+    def sin_calcular(*args):
+        raise AssertionError("un acierto no debe recalcular el preprocesamiento")
+
+    monkeypatch.setattr(cache_preprocesamiento, '_calcular_preprocesado', sin_calcular)
+    recuperado = obtener_preprocesado(n_samples=300)
+
+    for nombre in ARRAYS:
+        assert isinstance(recuperado[nombre], np.memmap)
+        np.testing.assert_array_equal(recuperado[nombre], calculado[nombre])
+
+    scaler, original = recuperado['scaler'], calculado['scaler']
+    for atributo in ('mean_', 'scale_', 'var_', 'feature_names_in_'):
+        np.testing.assert_array_equal(getattr(scaler, atributo), getattr(original, atributo))
+    assert scaler.n_samples_seen_ == original.n_samples_seen_
+    data = generate_synthetic_salary_data(20)[COLUMNAS_FEATURES]
+    np.testing.assert_array_equal(scaler.transform(data), original.transform(data))
+
+def test_el_scaler_se_guarda_sin_pickle(directorio_cache):
+    preprocesar_datos(n_samples=200)
+
+    [entrada] = [d for d in os.listdir(directorio_cache) if not d.startswith(".")]
+    archivos = os.listdir(directorio_cache / entrada)
+    assert "scaler.npz" in archivos
+    assert not any(nombre.endswith(".pkl") for nombre in archivos)
+    with np.load(directorio_cache / entrada / "scaler.npz", allow_pickle=False) as datos:
+        assert set(datos.files) >= {'mean_', 'scale_'}
+
+def test_scaler_danado_se_recalcula(directorio_cache):
+    calculado = obtener_preprocesado(n_samples=200)
+    [entrada] = [d for d in os.listdir(directorio_cache) if not d.startswith(".")]
+    with open(directorio_cache / entrada / "scaler.npz", 'wb') as archivo:
+        archivo.write(b"no es un npz")
+
+    recuperado = obtener_preprocesado(n_samples=200)
+    np.testing.assert_array_equal(recuperado['scaler'].mean_, calculado['scaler'].mean_)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from categorias_salario import BANDAS_SALARIALES, BandasSalariales
+
+ETIQUETAS = BANDAS_SALARIALES.etiquetas
+
+@pytest.mark.parametrize("salario, etiqueta", [
+    (0.0, "Junior"),
+    (39999.99, "Junior"),
+    (40000.0, "Intermedio"),     # el umbral pertenece a la banda superior
+    (60000.0, "Senior"),
+    (80000.0, "Experto"),
+    (99999.99, "Experto"),
+    (100000.0, "Muy Experto"),
+    (1e9, "Muy Experto"),
+])
+def test_bordes_de_las_bandas(salario, etiqueta):
+    assert BANDAS_SALARIALES.etiqueta(salario) == etiqueta
+    assert BANDAS_SALARIALES.etiquetar(np.array([salario]))[0] == etiqueta
+
+def test_codigos_compactos():
+    salarios = np.array([-1.0, 40000.0, 60000.0, 80000.0, 100000.0])
+
+    codigos = BANDAS_SALARIALES.codificar(salarios)
+
+    assert codigos.dtype == np.uint8
+    assert codigos.tolist() == [0, 1, 2, 3, 4]
+
+def test_categorical_conserva_el_orden_de_las_etiquetas():
+    salarios = np.array([120000.0, 30000.0, 70000.0])
+
+    categorias = BANDAS_SALARIALES.como_categorical(salarios)
+
+    assert isinstance(categorias, pd.Categorical)
+    assert list(categorias.categories) == ETIQUETAS
+    assert list(categorias) == ["Muy Experto", "Junior", "Senior"]
+    assert categorias.codes.tolist() == [4, 0, 2]
+
+@pytest.mark.parametrize("umbrales, etiquetas", [
+    ([10, 5], ["a", "b", "c"]),
+    ([5, 5], ["a", "b", "c"]),
+    ([5, 10], ["a", "b"]),
+])
+def test_configuracion_invalida(umbrales, etiquetas):
+    with pytest.raises(ValueError):
+        BandasSalariales(umbrales, etiquetas)
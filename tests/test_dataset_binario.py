@@ -0,0 +1,86 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_binario import (
+    ARCHIVO_ESQUEMA,
+    TIPOS_COLUMNAS,
+    abrir_columnas_binario,
+    cargar_dataset_binario,
+    guardar_dataset_binario,
+    iterar_bloques_binario,
+    iterar_bloques_dataset,
+    leer_dataset,
+    leer_esquema
+)
+from generate_synthetic_data import COLUMNAS_DATOS, generate_synthetic_salary_data
+
+@pytest.fixture
+def dataset(tmp_path):
+    data = generate_synthetic_salary_data(1001)
+    ruta = str(tmp_path / "datos")
+    guardar_dataset_binario(data, ruta)
+    return data, ruta
+
+def test_ida_y_vuelta_conserva_tipos_y_valores(dataset):
+    data, ruta = dataset
+
+    cargado = cargar_dataset_binario(ruta)
+
+    assert list(cargado.columns) == COLUMNAS_DATOS
+    for columna in COLUMNAS_DATOS:
+        assert cargado[columna].dtype == np.dtype(TIPOS_COLUMNAS[columna])
+        np.testing.assert_array_equal(cargado[columna], data[columna].astype(TIPOS_COLUMNAS[columna]))
+    # El salario se guarda en float64: conserva los centavos
+    np.testing.assert_array_equal(cargado['salario'], data['salario'])
+    pd.testing.assert_frame_equal(leer_dataset(ruta), cargado)
+
+def test_esquema(dataset):
+    _, ruta = dataset
+
+    with open(os.path.join(ruta, ARCHIVO_ESQUEMA)) as archivo:
+        esquema = json.load(archivo)
+
+    assert esquema == leer_esquema(ruta)
+    assert esquema['n_filas'] == 1001
+    assert esquema['columnas'] == [{'nombre': c, 'tipo': TIPOS_COLUMNAS[c]} for c in COLUMNAS_DATOS]
+
+    esquema['version'] = 99
+    with open(os.path.join(ruta, ARCHIVO_ESQUEMA), 'w') as archivo:
+        json.dump(esquema, archivo)
+    with pytest.raises(ValueError):
+        leer_esquema(ruta)
+
+def test_columnas_mapeadas_en_solo_lectura(dataset):
+    _, ruta = dataset
+
+    columnas = abrir_columnas_binario(ruta)
+
+    for columna in columnas.values():
+        assert isinstance(columna, np.memmap)
+        assert not columna.flags.writeable
+    with pytest.raises(ValueError):
+        columnas['edad'][0] = 0
+
+@pytest.mark.parametrize("tamano_bloque", [1, 300, 1001, 5000])
+def test_bloques_con_tamano_que_no_divide_las_filas(dataset, tamano_bloque):
+    data, ruta = dataset
+
+    bloques = list(iterar_bloques_dataset(ruta, tamano_bloque))
+
+    assert [len(bloque) for bloque in bloques][:-1] == [tamano_bloque] * (len(bloques) - 1)
+    assert sum(len(bloque) for bloque in bloques) == 1001
+    juntos = pd.concat(bloques)
+    assert juntos.index.tolist() == list(range(1001))
+    pd.testing.assert_frame_equal(juntos, cargar_dataset_binario(ruta), check_dtype=False)
+
+def test_bloques_como_array(dataset):
+    _, ruta = dataset
+
+    bloques = list(iterar_bloques_binario(ruta, 300, como_array=True))
+
+    assert all(bloque.dtype == np.float64 and bloque.shape[1] == len(COLUMNAS_DATOS) for bloque in bloques)
+    np.testing.assert_array_equal(np.vstack(bloques), cargar_dataset_binario(ruta).to_numpy(dtype=np.float64))
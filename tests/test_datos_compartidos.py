@@ -0,0 +1,60 @@
+import errno
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+import datos_compartidos
+from datos_compartidos import ArraysCompartidos, abrir_arrays_compartidos
+
+ARRAYS = {'X': np.arange(12, dtype=np.float64).reshape(4, 3), 'y': np.arange(4, dtype=np.int64)}
+
+def _comprobar(compartidos):
+    abiertos = abrir_arrays_compartidos(compartidos.descriptor)
+    for nombre, array in ARRAYS.items():
+        np.testing.assert_array_equal(abiertos[nombre], array)
+        assert isinstance(abiertos[nombre], np.memmap) and not abiertos[nombre].flags.writeable
+
+def test_publica_en_el_directorio_base_si_cabe(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos_compartidos, 'DIRECTORIO_BASE', str(tmp_path))
+
+    with ArraysCompartidos(ARRAYS) as compartidos:
+        assert os.path.dirname(compartidos.directorio) == str(tmp_path)
+        _comprobar(compartidos)
+    assert not os.path.exists(compartidos.directorio)
+
+def test_usa_el_directorio_temporal_si_no_cabe(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos_compartidos, 'DIRECTORIO_BASE', str(tmp_path))
+    monkeypatch.setattr(datos_compartidos, '_espacio_libre', lambda directorio: 64)
+
+    with ArraysCompartidos(ARRAYS) as compartidos:
+        assert os.path.dirname(compartidos.directorio) == tempfile.gettempdir()
+        _comprobar(compartidos)
+
+def test_reintenta_en_el_directorio_temporal_tras_enospc(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos_compartidos, 'DIRECTORIO_BASE', str(tmp_path))
+    guardar = np.save
+
+    def save_sin_espacio(ruta, array):
+        if str(ruta).startswith(str(tmp_path)):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        guardar(ruta, array)
+
+    monkeypatch.setattr(datos_compartidos.np, 'save', save_sin_espacio)
+
+    with ArraysCompartidos(ARRAYS) as compartidos:
+        assert os.path.dirname(compartidos.directorio) == tempfile.gettempdir()
+        # El intento fallido no deja archivos a medias
+        assert os.listdir(tmp_path) == []
+
+def test_error_claro_si_no_hay_espacio_en_ningun_sitio(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos_compartidos, 'DIRECTORIO_BASE', str(tmp_path))
+
+    def save_sin_espacio(ruta, array):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(datos_compartidos.np, 'save', save_sin_espacio)
+
+    with pytest.raises(OSError, match="No se pudieron compartir los arrays"):
+        ArraysCompartidos(ARRAYS)
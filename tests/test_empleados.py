@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from empleados import Empleado, LoteEmpleados
+
+def test_los_conteos_enteros_se_aceptan_aunque_lleguen_como_float():
+    empleado = Empleado(30, 5, 16, 40, 10.0, np.float64(2))
+
+    assert empleado.proyectos_completados == 10
+    assert isinstance(empleado.certificaciones, int)
+
+@pytest.mark.parametrize("proyectos, certificaciones", [(3.7, 1), (3, 0.5), (float('nan'), 1), (3, float('inf'))])
+def test_los_conteos_no_enteros_se_rechazan(proyectos, certificaciones):
+    with pytest.raises(ValueError):
+        Empleado(30, 5, 16, 40, proyectos, certificaciones)
+
+def test_empleados_iguales_tienen_el_mismo_hash():
+    a = Empleado(30, 5, 16, 40, 10, 2)
+    b = Empleado.desde_secuencia([30.0, 5.0, 16.0, 40.0, 10.0, 2.0])
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b, Empleado(31, 5, 16, 40, 10, 2)}) == 2
+
+def test_lote_devuelve_los_mismos_empleados():
+    filas = [[25, 2, 14, 35, 5, 1], [30, 5, 16, 40, 10, 2]]
+    lote = LoteEmpleados.desde_filas(filas)
+
+    assert list(lote) == [Empleado(*fila) for fila in filas]
+    np.testing.assert_array_equal(np.asarray(lote), np.array(filas, dtype=np.float64))
+
+def test_lote_rechaza_conteos_no_enteros():
+    lote = LoteEmpleados.desde_filas([[25, 2, 14, 35, 5, 1]])
+
+    with pytest.raises(ValueError, match="proyectos_completados"):
+        lote.extender([[30, 5, 16, 40, 2.5, 2]])
+    with pytest.raises(ValueError, match="certificaciones"):
+        lote.agregar([30, 5, 16, 40, 2, 0.5])
+    # Las filas rechazadas no se añaden y el lote se sigue pudiendo recorrer
+    assert len(lote) == 1
+    assert list(lote) == [Empleado(25, 2, 14, 35, 5, 1)]
+
+def test_lote_admite_tramos():
+    filas = [[25, 2, 14, 35, 5, 1], [30, 5, 16, 40, 10, 2], [35, 8, 18, 45, 15, 3]]
+    lote = LoteEmpleados.desde_filas(filas)
+
+    tramo = lote[1:]
+    assert isinstance(tramo, LoteEmpleados)
+    assert list(tramo) == [Empleado(*fila) for fila in filas[1:]]
+    assert list(lote[::-2]) == [Empleado(*filas[2]), Empleado(*filas[0])]
+    # El tramo es una copia: modificar el original no lo cambia
+    lote.vaciar().agregar(filas[0])
+    assert tramo[0] == Empleado(*filas[1])
+    assert lote[-1] == Empleado(*filas[0])
@@ -0,0 +1,90 @@
+import warnings
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from entrenamiento_incremental import (
+    EstadisticosSuficientes, entrenar_modelo_incremental, evaluar_modelo_incremental
+)
+from generate_synthetic_data import generar_datos_sinteticos_por_bloques
+from prediccion_lote import COLUMNAS_FEATURES
+from predictor_fusionado import PredictorFusionado
+
+N_FILAS = 20000
+
+def _ajuste_en_memoria(matriz):
+    X, y = matriz[:, :-1], matriz[:, -1]
+    scaler = StandardScaler().fit(X)
+    modelo = LinearRegression().fit(scaler.transform(X), y)
+    return modelo, scaler
+
+def test_ajuste_incremental_igual_al_ajuste_en_memoria():
+    matriz = np.concatenate(list(generar_datos_sinteticos_por_bloques(N_FILAS, como_array=True)))
+    modelo_ref, scaler_ref = _ajuste_en_memoria(matriz)
+
+    modelo, scaler, estadisticos = entrenar_modelo_incremental(
+        generar_datos_sinteticos_por_bloques(N_FILAS, tamano_bloque=1234, como_array=True)
+    )
+
+    assert estadisticos.n == N_FILAS
+    np.testing.assert_allclose(scaler.mean_, scaler_ref.mean_, rtol=1e-10)
+    np.testing.assert_allclose(scaler.scale_, scaler_ref.scale_, rtol=1e-10)
+    np.testing.assert_allclose(modelo.coef_, modelo_ref.coef_, rtol=1e-8)
+    np.testing.assert_allclose(modelo.intercept_, modelo_ref.intercept_, rtol=1e-10)
+    np.testing.assert_allclose(
+        PredictorFusionado.desde_modelos(modelo, scaler).predecir(matriz[:, :-1]),
+        modelo_ref.predict(scaler_ref.transform(matriz[:, :-1])),
+        rtol=1e-8
+    )
+
+def test_ajuste_incremental_desde_dataframes():
+    matriz = np.concatenate(list(generar_datos_sinteticos_por_bloques(5000, como_array=True)))
+    modelo_ref, _ = _ajuste_en_memoria(matriz)
+    modelo, scaler, _ = entrenar_modelo_incremental(generar_datos_sinteticos_por_bloques(5000, tamano_bloque=999))
+    np.testing.assert_allclose(modelo.coef_, modelo_ref.coef_, rtol=1e-8)
+    assert list(scaler.feature_names_in_) == COLUMNAS_FEATURES
+
+def test_combinar_igual_a_una_sola_pasada():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(3000, 6)) * [10, 5, 2, 5, 10, 2] + [40, 10, 16, 42, 20, 3]
+    y = X @ rng.normal(size=6) + rng.normal(size=3000)
+
+    completo = EstadisticosSuficientes().actualizar(X, y)
+    partes = [EstadisticosSuficientes().actualizar(X[inicio:inicio + 700], y[inicio:inicio + 700])
+              for inicio in range(0, 3000, 700)]
+    combinado = EstadisticosSuficientes()
+    for parte in partes:
+        combinado.combinar(parte)
+
+    assert combinado.n == completo.n
+    np.testing.assert_allclose(combinado.media_x, completo.media_x, rtol=1e-12)
+    np.testing.assert_allclose(combinado.comomentos_xx, completo.comomentos_xx, rtol=1e-9)
+    np.testing.assert_allclose(combinado.comomentos_xy, completo.comomentos_xy, rtol=1e-9)
+
+def test_evaluacion_incremental():
+    modelo, scaler, _ = entrenar_modelo_incremental(generar_datos_sinteticos_por_bloques(5000, como_array=True))
+    predictor = PredictorFusionado.desde_modelos(modelo, scaler)
+    acumulador = evaluar_modelo_incremental(
+        predictor, generar_datos_sinteticos_por_bloques(5000, tamano_bloque=1000, como_array=True)
+    )
+    metricas = acumulador.metricas()
+    assert 0.5 < metricas['r2'] <= 1.0
+    assert metricas['rmse'] > 0
+
+def test_sin_nombres_de_columnas_si_se_entrena_con_matrices():
+    modelo, scaler, _ = entrenar_modelo_incremental(generar_datos_sinteticos_por_bloques(2000, como_array=True))
+    assert not hasattr(scaler, 'feature_names_in_')
+
+    X = np.concatenate(list(generar_datos_sinteticos_por_bloques(100, como_array=True)))[:, :-1]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        modelo.predict(scaler.transform(X))
+
+def test_combinar_conserva_los_nombres_de_columnas():
+    bloques = list(generar_datos_sinteticos_por_bloques(2000, tamano_bloque=1000))
+    combinado = EstadisticosSuficientes()
+    for bloque in bloques:
+        combinado.combinar(EstadisticosSuficientes().actualizar(bloque[COLUMNAS_FEATURES], bloque['salario']))
+    _, scaler = combinado.construir_modelos()
+    assert list(scaler.feature_names_in_) == COLUMNAS_FEATURES
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from empleados import Empleado
+from esquema_empleado import ESQUEMA_EMPLEADO
+from prediccion_lote import COLUMNAS_FEATURES
+
+VALIDA = [30.0, 5.0, 16.0, 40.0, 10.0, 2.0]
+
+def _con(indice, valor):
+    fila = list(VALIDA)
+    fila[indice] = valor
+    return fila
+
+def test_cada_violacion_activa_el_bit_de_su_columna():
+    matriz = np.array([
+        VALIDA,
+        _con(0, 18.0),            # edad por debajo del mínimo
+        _con(3, 61.0),            # horas por encima del máximo
+        _con(1, np.nan),          # no finito
+        _con(4, 3.7),             # conteo no entero
+        _con(5, -1.0),            # conteo negativo
+        [np.inf, 5.0, 16.0, 40.0, 10.0, 0.5],
+    ])
+
+    mascaras = ESQUEMA_EMPLEADO.validar(matriz)
+
+    assert mascaras.dtype == np.uint8
+    assert mascaras.tolist() == [0, 1 << 0, 1 << 3, 1 << 1, 1 << 4, 1 << 5, (1 << 0) | (1 << 5)]
+    np.testing.assert_array_equal(ESQUEMA_EMPLEADO.filas_validas(matriz), mascaras == 0)
+
+def test_los_limites_son_inclusivos_y_los_conteos_no_tienen_maximo():
+    assert ESQUEMA_EMPLEADO.validar(np.array([[22.0, 0.0, 12.0, 60.0, 10_000.0, 0.0]])).tolist() == [0]
+
+def test_acepta_dataframes_y_empleados():
+    data = pd.DataFrame([VALIDA, _con(0, 70.0)], columns=COLUMNAS_FEATURES)
+
+    assert ESQUEMA_EMPLEADO.validar(data).tolist() == [0, 1]
+    assert ESQUEMA_EMPLEADO.validar(Empleado(*VALIDA)).tolist() == [0]
+
+def test_describir_y_contar_violaciones():
+    mascaras = ESQUEMA_EMPLEADO.validar(np.array([_con(0, 18.0), _con(4, 3.7), [18.0, 5.0, 16.0, 40.0, 3.7, 2.0]]))
+
+    assert [campo.nombre for campo in ESQUEMA_EMPLEADO.describir(mascaras[2])] == ['edad', 'proyectos_completados']
+    conteo = ESQUEMA_EMPLEADO.contar_violaciones(mascaras)
+    assert conteo['edad'] == 2
+    assert conteo['proyectos_completados'] == 2
+    assert sum(conteo.values()) == 4
+
+def test_recortar_deja_filas_validas():
+    matriz = np.array([_con(0, 18.0), _con(3, 61.0), _con(4, 3.7), _con(5, -1.0)])
+
+    recortada = ESQUEMA_EMPLEADO.recortar(matriz)
+
+    assert ESQUEMA_EMPLEADO.filas_validas(recortada).all()
+    assert recortada[:, 0].tolist() == [22.0, 30.0, 30.0, 30.0]
+    assert recortada[2, 4] == 4.0
+    # Sin out, la entrada no se modifica
+    assert matriz[0, 0] == 18.0
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from generacion_paralela import generar_datos_paralelo
+
+def _contenido(directorio):
+    contenido = {}
+    for raiz, _, archivos in os.walk(directorio):
+        for nombre in archivos:
+            ruta = os.path.join(raiz, nombre)
+            with open(ruta, 'rb') as archivo:
+                contenido[os.path.relpath(ruta, directorio)] = archivo.read()
+    return contenido
+
+@pytest.mark.parametrize("formato", ["csv", "binario"])
+def test_mismos_archivos_con_cualquier_numero_de_procesos(tmp_path, formato):
+    opciones = dict(semilla=7, filas_por_particion=4000, tamano_bloque=1500, formato=formato)
+    generar_datos_paralelo(10000, tmp_path / "uno", n_procesos=1, **opciones)
+    generar_datos_paralelo(10000, tmp_path / "tres", n_procesos=3, **opciones)
+
+    uno = _contenido(tmp_path / "uno")
+    assert len([nombre for nombre in uno if nombre.startswith("parte-")]) >= 3
+    assert uno == _contenido(tmp_path / "tres")
+
+def test_formato_no_soportado(tmp_path):
+    with pytest.raises(ValueError):
+        generar_datos_paralelo(10, tmp_path, formato='parquet')
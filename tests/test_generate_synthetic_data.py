@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from generate_synthetic_data import (
+    COLUMNAS_DATOS, FILAS_POR_FRAGMENTO, LIMITES_FEATURES, generar_datos_sinteticos_por_bloques
+)
+
+# Cruza el límite entre el primer y el segundo fragmento
+N_FILAS = FILAS_POR_FRAGMENTO + 5000
+
+def _concatenar(bloques):
+    return np.concatenate(list(bloques))
+
+def test_salida_invariante_al_tamano_de_bloque():
+    referencia = _concatenar(generar_datos_sinteticos_por_bloques(N_FILAS, tamano_bloque=N_FILAS, como_array=True))
+    assert referencia.shape == (N_FILAS, len(COLUMNAS_DATOS))
+    for tamano_bloque in (1000, 7777, FILAS_POR_FRAGMENTO):
+        bloques = _concatenar(generar_datos_sinteticos_por_bloques(N_FILAS, tamano_bloque=tamano_bloque, como_array=True))
+        np.testing.assert_array_equal(bloques, referencia)
+
+def test_subrango_igual_al_tramo_del_dataset():
+    referencia = _concatenar(generar_datos_sinteticos_por_bloques(N_FILAS, tamano_bloque=20000, como_array=True))
+    tramo = _concatenar(generar_datos_sinteticos_por_bloques(
+        N_FILAS, tamano_bloque=3000, como_array=True, fila_inicial=60000, fila_final=68000
+    ))
+    np.testing.assert_array_equal(tramo, referencia[60000:68000])
+
+def test_dataframes_con_indice_y_tipos():
+    bloques = list(generar_datos_sinteticos_por_bloques(2500, tamano_bloque=1000))
+    data = pd.concat(bloques)
+    assert list(data.columns) == COLUMNAS_DATOS
+    assert (data.index == pd.RangeIndex(2500)).all()
+    assert data['proyectos_completados'].dtype == np.int64
+    for columna, (minimo, maximo) in LIMITES_FEATURES.items():
+        assert data[columna].min() >= minimo
+        if maximo is not None:
+            assert data[columna].max() <= maximo
+
+def test_semilla_distinta_cambia_los_datos():
+    a = _concatenar(generar_datos_sinteticos_por_bloques(1000, semilla=1, como_array=True))
+    b = _concatenar(generar_datos_sinteticos_por_bloques(1000, semilla=2, como_array=True))
+    assert not np.array_equal(a, b)
+
+def test_tamano_bloque_invalido():
+    with pytest.raises(ValueError):
+        next(generar_datos_sinteticos_por_bloques(10, tamano_bloque=0))
@@ -0,0 +1,52 @@
+import threading
+
+import matplotlib
+import mlflow
+import numpy as np
+import pytest
+
+matplotlib.use("Agg")
+
+from graficos import graficar_predicciones_vs_reales, registrar_grafico_predicciones
+from registro_buffer import BufferRegistroMLflow
+
+FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+
+def _datos(n):
+    rng = np.random.default_rng(0)
+    y_real = rng.uniform(30000, 120000, n)
+    return y_real, y_real + rng.normal(0, 5000, n)
+
+@pytest.mark.parametrize("modo", ["muestra", "histograma", "auto"])
+def test_modos_escriben_un_png(tmp_path, modo):
+    ruta = tmp_path / f"{modo}.png"
+
+    assert graficar_predicciones_vs_reales(*_datos(20000), str(ruta), modo=modo, max_puntos=500, celdas=20) \
+        == str(ruta)
+    assert ruta.read_bytes().startswith(FIRMA_PNG)
+
+def test_modo_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        graficar_predicciones_vs_reales(*_datos(10), str(tmp_path / "x.png"), modo="barras")
+
+def test_grafico_en_segundo_plano(mlflow_local):
+    hilos = []
+
+    class Registro(BufferRegistroMLflow):
+        def en_segundo_plano(self, funcion, *args, **kwargs):
+            def registrar_hilo():
+                hilos.append(threading.current_thread())
+                return funcion(*args, **kwargs)
+            return super().en_segundo_plano(registrar_hilo)
+
+    with mlflow.start_run() as run, Registro(run.info.run_id) as registro:
+        futuro = registrar_grafico_predicciones(registro, *_datos(10000), modo='histograma')
+        futuro.result(timeout=60)
+        ruta = registro.ruta_temporal('predicciones_vs_reales.png')
+        with open(ruta, 'rb') as archivo:
+            assert archivo.read().startswith(FIRMA_PNG)
+
+    assert futuro.done() and futuro.exception() is None
+    assert hilos and hilos[0] is not threading.main_thread()
+    artefactos = [artefacto.path for artefacto in mlflow_local.list_artifacts(run.info.run_id)]
+    assert 'predicciones_vs_reales.png' in artefactos
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+import instrumentacion
+from instrumentacion import ExportadorJSON, ExportadorMLflow, ExportadorPrometheus, Trazador, medir, tramo
+
+class RegistroFalso:
+    def __init__(self):
+        self.metricas = {}
+
+    def log_metrics(self, metricas, step=0):
+        self.metricas.update(metricas)
+
+@pytest.fixture
+def trazador_activo():
+    exportador = ExportadorMLflow()
+    trazador = instrumentacion.configurar([exportador])
+    yield trazador
+    instrumentacion.configurar([])
+
+def test_trazador_inactivo_no_mide():
+    trazador = Trazador()
+    with trazador.tramo("a"):
+        pass
+    assert trazador.resumen() == {}
+
+def test_medir_y_tramo_acumulan(trazador_activo):
+    @medir("prueba.funcion")
+    def funcion():
+        return 42
+
+    assert funcion() == 42
+    assert funcion() == 42
+    with tramo("prueba.tramo"):
+        pass
+
+    resumen = trazador_activo.resumen()
+    assert resumen["prueba.funcion"]["llamadas"] == 2
+    assert resumen["prueba.tramo"]["llamadas"] == 1
+    assert resumen["prueba.funcion"]["max_s"] <= resumen["prueba.funcion"]["total_s"]
+
+def test_exportador_mlflow_usa_el_registro(trazador_activo):
+    trazador_activo.registrar("etapa", 1.5)
+    registro = RegistroFalso()
+    trazador_activo.exportar(registro)
+    assert registro.metricas == {"tiempo_etapa_s": 1.5}
+
+def test_exportadores_de_archivo(tmp_path):
+    ruta_json = str(tmp_path / "tiempos.jsonl")
+    ruta_prom = str(tmp_path / "tiempos.prom")
+    trazador = Trazador([ExportadorJSON(ruta_json), ExportadorPrometheus(ruta_prom)])
+    trazador.registrar("etapa", 0.25)
+    trazador.exportar()
+    trazador.exportar()
+
+    with open(ruta_json) as archivo:
+        lineas = [json.loads(linea) for linea in archivo]
+    assert len(lineas) == 2 and lineas[0]["tramos"]["etapa"]["total_s"] == 0.25
+    with open(ruta_prom) as archivo:
+        assert 'salarios_tramo_llamadas_total{tramo="etapa"} 1' in archivo.read()
+
+def test_experimento_exporta_los_tramos_en_segundo_plano(mlflow_local, trazador_activo):
+    from mlflow_regression_example import experimento_mlflow
+
+    experimento_mlflow()
+
+    [run] = mlflow_local.search_runs(
+        [mlflow_local.get_experiment_by_name("Prediccion_Salarios_Regresion_Lineal").experiment_id]
+    )
+    metricas = run.data.metrics
+    # El gráfico se dibuja y el modelo se sube en hilos del buffer: sus tramos pertenecen a este run
+    assert "tiempo_grafico.predicciones_vs_reales_s" in metricas
+    assert metricas["tiempo_experimento.registro_modelos_s"] >= metricas["tiempo_registro.log_model_s"] / 2
+    assert trazador_activo.resumen() == {}
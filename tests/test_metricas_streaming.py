@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from metricas_streaming import AcumuladorMetricas
+
+def _datos(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    y_real = rng.normal(70000, 20000, n)
+    y_pred = y_real + rng.normal(0, 5000, n)
+    return y_real, y_pred
+
+def _por_bloques(y_real, y_pred, tamano_bloque, **opciones):
+    acumulador = AcumuladorMetricas(**opciones)
+    for inicio in range(0, len(y_real), tamano_bloque):
+        acumulador.actualizar(y_real[inicio:inicio + tamano_bloque], y_pred[inicio:inicio + tamano_bloque])
+    return acumulador
+
+def test_metricas_iguales_a_sklearn():
+    y_real, y_pred = _datos(25000)
+    metricas = _por_bloques(y_real, y_pred, 3000).metricas()
+    assert metricas['mse'] == pytest.approx(mean_squared_error(y_real, y_pred), rel=1e-10)
+    assert metricas['rmse'] == pytest.approx(np.sqrt(mean_squared_error(y_real, y_pred)), rel=1e-10)
+    assert metricas['mae'] == pytest.approx(mean_absolute_error(y_real, y_pred), rel=1e-10)
+    assert metricas['r2'] == pytest.approx(r2_score(y_real, y_pred), rel=1e-10)
+
+def test_cuantiles_exactos_con_menos_filas_que_la_muestra():
+    y_real, y_pred = _datos(5000)
+    acumulador = _por_bloques(y_real, y_pred, 700)
+    errores = np.abs(y_real - y_pred)
+    metricas = acumulador.metricas()
+    for cuantil in (0.5, 0.9, 0.99):
+        assert metricas[f"error_abs_p{cuantil * 100:g}"] == pytest.approx(np.quantile(errores, cuantil))
+    np.testing.assert_allclose(acumulador.cuantiles_residuo([0.1, 0.5]), np.quantile(y_real - y_pred, [0.1, 0.5]))
+
+def test_cuantiles_muestreados_deterministas_y_cercanos():
+    y_real, y_pred = _datos(200000)
+    errores = np.abs(y_real - y_pred)
+    primera = _por_bloques(y_real, y_pred, 30000).metricas()
+    segunda = _por_bloques(y_real, y_pred, 30000).metricas()
+    # Misma semilla por defecto: mismos cuantiles en cada ejecución
+    assert primera == segunda
+    for cuantil in (0.5, 0.9):
+        assert primera[f"error_abs_p{cuantil * 100:g}"] == pytest.approx(np.quantile(errores, cuantil), rel=0.03)
+
+def test_combinar_igual_a_una_sola_pasada():
+    y_real, y_pred = _datos(9000)
+    completo = _por_bloques(y_real, y_pred, 9000).metricas()
+    combinado = AcumuladorMetricas()
+    for i, inicio in enumerate(range(0, 9000, 2000)):
+        parte = AcumuladorMetricas(semilla=[42, i]).actualizar(y_real[inicio:inicio + 2000], y_pred[inicio:inicio + 2000])
+        combinado.combinar(parte)
+    for nombre, valor in combinado.metricas().items():
+        assert valor == pytest.approx(completo[nombre], rel=1e-9)
+
+def test_y_constante_y_errores():
+    assert AcumuladorMetricas().actualizar([5.0, 5.0], [5.0, 5.0]).metricas()['r2'] == 1.0
+    with pytest.raises(ValueError):
+        AcumuladorMetricas().metricas()
+    with pytest.raises(ValueError):
+        AcumuladorMetricas().actualizar([1.0, 2.0], [1.0])
@@ -0,0 +1,48 @@
+import mlflow
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from cache_artefactos import ARTEFACTO_MODELO, ARTEFACTO_PIPELINE, ARTEFACTO_SCALER
+from cache_modelos import cargar_par_desde_mlflow
+from mlflow_regression_example import crear_pipeline
+from prediccion_lote import predecir_salarios_lote
+from predictor_fusionado import PredictorFusionado
+
+@pytest.fixture
+def entrenados():
+    rng = np.random.default_rng(3)
+    X = rng.normal(loc=[40, 10, 16, 42, 20, 3], scale=[10, 5, 2, 5, 10, 2], size=(200, 6))
+    y = X @ np.array([500.0, 2500.0, 1800.0, 300.0, 150.0, 900.0])
+    scaler = StandardScaler().fit(X)
+    modelo = LinearRegression().fit(scaler.transform(X), y)
+    return modelo, scaler, X
+
+def test_run_con_pipeline_se_carga_como_pipeline(mlflow_local, entrenados):
+    modelo, scaler, X = entrenados
+    with mlflow.start_run() as run:
+        mlflow.sklearn.log_model(crear_pipeline(scaler, modelo), ARTEFACTO_PIPELINE)
+
+    pipeline, sin_scaler = cargar_par_desde_mlflow(run.info.run_id)
+    assert isinstance(pipeline, Pipeline)
+    assert sin_scaler is None
+
+    esperado = modelo.predict(scaler.transform(X))
+    np.testing.assert_allclose(predecir_salarios_lote(pipeline, None, X), esperado, rtol=1e-10)
+    np.testing.assert_allclose(predecir_salarios_lote(pipeline, None, X, tamano_bloque=64), esperado, rtol=1e-10)
+    np.testing.assert_allclose(PredictorFusionado.desde_modelos(pipeline).predecir(X), esperado, rtol=1e-10)
+
+def test_run_con_modelos_separados(mlflow_local, entrenados):
+    modelo, scaler, X = entrenados
+    with mlflow.start_run() as run:
+        mlflow.sklearn.log_model(modelo, ARTEFACTO_MODELO)
+        mlflow.sklearn.log_model(scaler, ARTEFACTO_SCALER)
+
+    modelo_cargado, scaler_cargado = cargar_par_desde_mlflow(run.info.run_id)
+    assert isinstance(modelo_cargado, LinearRegression)
+    np.testing.assert_allclose(scaler_cargado.mean_, scaler.mean_)
+    np.testing.assert_allclose(
+        predecir_salarios_lote(modelo_cargado, scaler_cargado, X), modelo.predict(scaler.transform(X))
+    )
@@ -0,0 +1,20 @@
+import numpy as np
+
+from prediccion_rapida import MODULOS_PROHIBIDOS, PRESUPUESTO_IMPORTACION_MS, _leer_bloques, medir_importacion
+
+def test_importacion_dentro_del_presupuesto_y_sin_modulos_pesados():
+    # Primera importación para compilar los .pyc: la medida no debe incluir la compilación
+    medir_importacion()
+    milisegundos, importados = medir_importacion()
+
+    assert "numpy" in importados
+    for modulo in MODULOS_PROHIBIDOS:
+        assert modulo not in importados, f"prediccion_rapida importa {modulo}"
+    assert 0 < milisegundos < PRESUPUESTO_IMPORTACION_MS
+
+def test_leer_bloques_ignora_cabecera_y_lineas_vacias():
+    lineas = ["edad,experiencia_anos,educacion_anos,horas,proyectos,certificaciones\n", "\n",
+              "28,4,16,42,8,2\n", "[30, 5, 16, 40, 10, 3]\n", "31 6 17 41 11 4\n"]
+    bloques = list(_leer_bloques(lineas, None, filas_por_bloque=2))
+    assert [bloque.shape for bloque in bloques] == [(2, 6), (1, 6)]
+    np.testing.assert_array_equal(bloques[1][0], [31, 6, 17, 41, 11, 4])
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from prediccion_lote import COLUMNAS_FEATURES, predecir_salarios_lote
+from predictor_fusionado import PredictorFusionado
+from registro_modelos_memoria import RegistroModelosMemoria
+
+@pytest.fixture
+def modelos():
+    rng = np.random.default_rng(0)
+    X = rng.normal(loc=[40, 10, 16, 42, 20, 3], scale=[10, 5, 2, 5, 10, 2], size=(500, 6))
+    y = X @ np.array([500.0, 2500.0, 1800.0, 300.0, 150.0, 900.0]) + rng.normal(0, 1000, 500)
+    scaler = StandardScaler().fit(X)
+    modelo = LinearRegression().fit(scaler.transform(X), y)
+    return modelo, scaler, X
+
+def test_fusionado_igual_a_scaler_y_regresion(modelos):
+    modelo, scaler, X = modelos
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    np.testing.assert_allclose(fusionado.predecir(X), modelo.predict(scaler.transform(X)), rtol=1e-10)
+
+def test_fusionado_sin_media(modelos):
+    _, _, X = modelos
+    y = X.sum(axis=1)
+    scaler = StandardScaler(with_mean=False).fit(X)
+    modelo = LinearRegression().fit(scaler.transform(X), y)
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    np.testing.assert_allclose(fusionado.predecir(X), modelo.predict(scaler.transform(X)), rtol=1e-10)
+
+def test_fusionado_dataframe_y_fila(modelos):
+    modelo, scaler, X = modelos
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    esperado = predecir_salarios_lote(modelo, scaler, X)
+    # Columnas desordenadas y una columna extra: se seleccionan por nombre
+    data = pd.DataFrame(X, columns=COLUMNAS_FEATURES).assign(salario=0.0)
+    fusionado.columnas = list(COLUMNAS_FEATURES)
+    np.testing.assert_allclose(fusionado.predecir(data.iloc[:, ::-1]), esperado, rtol=1e-10)
+    assert fusionado.predecir(X[0]).shape == (1,)
+
+def test_fusionado_en_bloques(modelos):
+    modelo, scaler, X = modelos
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    np.testing.assert_allclose(fusionado.predecir_en_bloques(X, 64), fusionado.predecir(X))
+
+def test_fusionado_guardar_y_cargar(modelos, tmp_path):
+    modelo, scaler, X = modelos
+    fusionado = PredictorFusionado.desde_modelos(modelo, scaler)
+    cargado = PredictorFusionado.cargar(fusionado.guardar(tmp_path / "predictor.npz"))
+    np.testing.assert_array_equal(cargado.predecir(X), fusionado.predecir(X))
+
+def test_fusionado_rechaza_numero_de_features(modelos):
+    modelo, scaler, X = modelos
+    with pytest.raises(ValueError):
+        PredictorFusionado.desde_modelos(modelo, scaler).predecir(X[:, :5])
+
+def test_registro_predice_por_bloques(modelos):
+    modelo, scaler, X = modelos
+    registro = RegistroModelosMemoria(cargador=lambda run_id: None)
+    registro.registrar("v1", modelo, scaler)
+    try:
+        np.testing.assert_allclose(
+            registro.predecir(X, tamano_bloque=100), modelo.predict(scaler.transform(X)), rtol=1e-10
+        )
+    finally:
+        registro.cerrar()
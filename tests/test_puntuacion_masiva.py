@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from categorias_salario import BANDAS_SALARIALES
+from prediccion_lote import COLUMNAS_FEATURES
+from predictor_fusionado import PredictorFusionado
+from puntuacion_masiva import puntuar_archivo
+
+PREDICTOR = PredictorFusionado(np.array([500.0, 2500.0, 1500.0, 100.0, 500.0, 1000.0]), 20000.0, COLUMNAS_FEATURES)
+
+def _empleados(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    data = pd.DataFrame({
+        'edad': rng.uniform(22, 65, n).round(1),
+        'experiencia_anos': rng.uniform(0, 35, n).round(1),
+        'educacion_anos': rng.uniform(12, 22, n).round(1),
+        'horas_trabajo': rng.uniform(30, 60, n).round(1),
+        'proyectos_completados': rng.integers(0, 40, n),
+        'certificaciones': rng.integers(0, 8, n)
+    })
+    data.insert(0, 'id', np.arange(n))
+    return data
+
+def _escribir(data, ruta):
+    if str(ruta).endswith('.jsonl'):
+        data.to_json(ruta, orient='records', lines=True)
+    else:
+        data.to_csv(ruta, index=False)
+
+def _leer(ruta):
+    if str(ruta).endswith('.jsonl'):
+        lineas = open(ruta).read().splitlines()
+        return pd.DataFrame([json.loads(linea) for linea in lineas])
+    return pd.read_csv(ruta)
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+@pytest.mark.parametrize("tamano_bloque", [7, 25, 1000])
+def test_la_salida_no_depende_del_tamano_de_bloque(tmp_path, extension, tamano_bloque):
+    data = _empleados(25)
+    entrada, salida = tmp_path / f"entrada{extension}", tmp_path / f"salida{extension}"
+    _escribir(data, entrada)
+
+    filas, _, violaciones = puntuar_archivo(PREDICTOR, entrada, str(salida), tamano_bloque=tamano_bloque)
+
+    resultado = _leer(salida)
+    esperado = PREDICTOR.predecir(data[COLUMNAS_FEATURES]).round(2)
+    assert filas == 25 and violaciones == {}
+    assert resultado['id'].tolist() == list(range(25))
+    np.testing.assert_allclose(resultado['salario_predicho'], esperado)
+    assert resultado['categoria'].tolist() == BANDAS_SALARIALES.etiquetar(esperado).tolist()
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_bloque_con_todas_las_filas_rechazadas(tmp_path, extension):
+    data = _empleados(12)
+    # El segundo bloque (filas 4-7) queda entero fuera de rango
+    data.loc[4:7, 'edad'] = 100.0
+    entrada, salida = tmp_path / f"entrada{extension}", tmp_path / f"salida{extension}"
+    _escribir(data, entrada)
+
+    filas, _, violaciones = puntuar_archivo(PREDICTOR, entrada, str(salida), tamano_bloque=4,
+                                            filas_invalidas='rechazar')
+
+    assert filas == 8
+    assert violaciones['edad'] == 4 and violaciones['filas'] == 4
+    lineas = open(salida).read().splitlines()
+    assert all(linea.strip() for linea in lineas)
+    assert _leer(salida)['id'].tolist() == [0, 1, 2, 3, 8, 9, 10, 11]
+
+def test_primer_bloque_rechazado_conserva_la_cabecera_csv(tmp_path):
+    data = _empleados(6)
+    data.loc[0:2, 'horas_trabajo'] = 80.0
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    _escribir(data, entrada)
+
+    puntuar_archivo(PREDICTOR, entrada, str(salida), tamano_bloque=3, filas_invalidas='rechazar')
+
+    assert _leer(salida)['id'].tolist() == [3, 4, 5]
+
+def test_recortar_escribe_los_valores_recortados(tmp_path):
+    data = _empleados(5)
+    data.loc[1, 'edad'] = 100.0
+    data.loc[2, 'proyectos_completados'] = -3
+    data.loc[3, 'horas_trabajo'] = np.nan
+    entrada, salida = tmp_path / "entrada.csv", tmp_path / "salida.csv"
+    _escribir(data, entrada)
+
+    filas, _, violaciones = puntuar_archivo(PREDICTOR, entrada, str(salida), tamano_bloque=2,
+                                            filas_invalidas='recortar')
+
+    resultado = _leer(salida)
+    assert filas == 4
+    assert violaciones['filas'] == 2 and violaciones['no_finitas'] == 1
+    assert resultado['id'].tolist() == [0, 1, 2, 4]
+    assert resultado.loc[1, 'edad'] == 65.0
+    assert resultado.loc[2, 'proyectos_completados'] == 0
+    assert resultado['proyectos_completados'].dtype.kind == 'i'
+    # La predicción corresponde a los valores escritos
+    np.testing.assert_allclose(resultado['salario_predicho'],
+                               PREDICTOR.predecir(resultado[COLUMNAS_FEATURES]).round(2))
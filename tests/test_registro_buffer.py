@@ -0,0 +1,69 @@
+import json
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from registro_buffer import MAX_METRICAS_POR_LOTE, BufferRegistroMLflow
+
+class ClienteFalso:
+    def __init__(self):
+        self.lotes = []
+
+    def log_batch(self, run_id, metrics, params, tags):
+        self.lotes.append((len(metrics), len(params), len(tags)))
+
+def test_vaciar_agrupa_en_lotes():
+    cliente = ClienteFalso()
+    registro = BufferRegistroMLflow("run", umbral_vaciado=10 ** 9, cliente=cliente)
+    registro.log_metrics({f"m{i}": i for i in range(MAX_METRICAS_POR_LOTE + 5)})
+    registro.log_params({"a": 1, "b": 2})
+    registro.cerrar()
+    assert cliente.lotes == [(MAX_METRICAS_POR_LOTE - 2, 2, 0), (7, 0, 0)]
+
+def test_log_model_registra_metadatos_del_run(mlflow_local):
+    modelo = LinearRegression().fit(np.arange(20.0).reshape(10, 2), np.arange(10.0))
+    with mlflow.start_run() as run, BufferRegistroMLflow(run.info.run_id) as registro:
+        registro.log_params({"alpha": 1})
+        registro.log_model_sklearn(modelo, "modelo", registered_model_name="modelo_pruebas")
+
+    datos = mlflow_local.get_run(run.info.run_id).data
+    assert datos.params == {"alpha": "1"}
+    historial = json.loads(datos.tags["mlflow.log-model.history"])
+    assert [entrada["artifact_path"] for entrada in historial] == ["modelo"]
+    assert mlflow_local.get_latest_versions("modelo_pruebas")[0].run_id == run.info.run_id
+
+    cargado = mlflow.sklearn.load_model(f"runs:/{run.info.run_id}/modelo")
+    np.testing.assert_allclose(cargado.coef_, modelo.coef_)
+
+def test_excepcion_en_el_bloque_se_propaga_sin_registrar(mlflow_local):
+    with pytest.raises(ZeroDivisionError):
+        with mlflow.start_run() as run, BufferRegistroMLflow(run.info.run_id) as registro:
+            registro.log_params({"alpha": 1})
+            registro.log_metrics({"rmse": 1.0})
+            # Una subida que además falla no debe ocultar la excepción original
+            registro.en_segundo_plano(lambda: 1 / "x")
+            1 / 0
+
+    datos = mlflow_local.get_run(run.info.run_id).data
+    assert datos.params == {}
+    assert datos.metrics == {}
+
+def test_error_de_subida_se_propaga_al_cerrar(mlflow_local):
+    with pytest.raises(TypeError):
+        with mlflow.start_run() as run, BufferRegistroMLflow(run.info.run_id) as registro:
+            registro.log_params({"alpha": 1})
+            registro.en_segundo_plano(lambda: 1 / "x")
+    assert mlflow_local.get_run(run.info.run_id).data.params == {"alpha": "1"}
+
+def test_log_model_fuera_del_run_activo(mlflow_local):
+    modelo = LinearRegression().fit(np.arange(20.0).reshape(10, 2), np.arange(10.0))
+    with mlflow.start_run() as run:
+        pass
+    with BufferRegistroMLflow(run.info.run_id) as registro:
+        registro.log_model_sklearn(modelo, "modelo")
+
+    historial = json.loads(mlflow_local.get_run(run.info.run_id).data.tags["mlflow.log-model.history"])
+    assert historial[0]["run_id"] == run.info.run_id
+    assert mlflow.active_run() is None
@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+import prediccion_simple
+from registro_modelos_memoria import RegistroModelosMemoria, interpretar_referencia
+
+def _modelo_y_scaler(pendiente):
+    X = np.arange(12, dtype=np.float64).reshape(-1, 6)
+    scaler = StandardScaler().fit(np.vstack([X, X + 1]))
+    modelo = LinearRegression()
+    modelo.coef_ = np.full(6, float(pendiente))
+    modelo.intercept_ = 0.0
+    return modelo, scaler
+
+@pytest.mark.parametrize("referencia, esperado", [
+    ("prediccion_salarios/3", {'nombre_modelo': 'prediccion_salarios', 'version': '3'}),
+    ("models:/prediccion_salarios/3", {'nombre_modelo': 'prediccion_salarios', 'version': '3'}),
+    ("models:/prediccion_salarios/Production", {'nombre_modelo': 'prediccion_salarios', 'etapa': 'Production'}),
+    ("prediccion_salarios:Staging", {'nombre_modelo': 'prediccion_salarios', 'etapa': 'Staging'}),
+    ("models:/prediccion_salarios/latest", {'nombre_modelo': 'prediccion_salarios'}),
+    ("models:/prediccion_salarios@campeon", {'nombre_modelo': 'prediccion_salarios', 'alias': 'campeon'}),
+    ("fd1c19a5dee949ad950d2b98b19ea57b", None),
+])
+def test_interpretar_referencia(referencia, esperado):
+    assert interpretar_referencia(referencia) == esperado
+
+def test_registrar_activa_y_descarta_las_versiones_antiguas():
+    registro = RegistroModelosMemoria(max_versiones=2, cargador=lambda run_id: None)
+    for nombre in ("a", "b", "c"):
+        registro.registrar(nombre, *_modelo_y_scaler(1))
+
+    assert registro.versiones() == ["b", "c"]
+    assert registro.activa.nombre == "c"
+
+    registro.activar("b")
+    registro.registrar("d", *_modelo_y_scaler(1), activar=False)
+    # La versión activa nunca se descarta aunque sea la más antigua
+    assert registro.versiones() == ["b", "d"]
+    assert registro.activa.nombre == "b"
+    with pytest.raises(KeyError):
+        registro.activar("a")
+
+def test_se_predice_con_la_version_activa_mientras_se_entrena_otra():
+    registro = RegistroModelosMemoria(cargador=lambda run_id: None)
+    registro.registrar("inicial", *_modelo_y_scaler(1))
+    datos = np.ones((3, 6))
+    esperado_inicial = registro.predecir(datos)
+
+    liberar = threading.Event()
+
+    def entrenar():
+        liberar.wait(5)
+        return _modelo_y_scaler(2)
+
+    futuro = registro.entrenar_en_segundo_plano(entrenar)
+    np.testing.assert_array_equal(registro.predecir(datos), esperado_inicial)
+    liberar.set()
+    version = futuro.result(5)
+    registro.cerrar()
+
+    assert registro.activa is version
+    assert version.origen == {'local': True}
+    assert not np.array_equal(registro.predecir(datos), esperado_inicial)
+
+def test_reentrenar_informa_despues_de_activar_la_nueva_version(monkeypatch):
+    predictor = prediccion_simple.PredictorSalarios()
+    monkeypatch.setattr(predictor, "_entrenar", lambda: (*_modelo_y_scaler(1), 0.9, 1000.0))
+
+    mensajes = []
+    monkeypatch.setattr(
+        prediccion_simple, "print",
+        lambda mensaje: mensajes.append((mensaje, predictor.registro.activa)),
+        raising=False
+    )
+    version = predictor.reentrenar_en_segundo_plano().result(5)
+    predictor.registro.cerrar()
+
+    [(mensaje, activa_al_informar)] = mensajes
+    assert "✅ Nuevo modelo activo" in mensaje
+    assert activa_al_informar is version
+
+def test_reentrenar_informa_del_error(monkeypatch):
+    predictor = prediccion_simple.PredictorSalarios()
+
+    def fallar():
+        raise RuntimeError("sin datos")
+
+    monkeypatch.setattr(predictor, "_entrenar", fallar)
+    mensajes = []
+    monkeypatch.setattr(prediccion_simple, "print", mensajes.append, raising=False)
+    futuro = predictor.reentrenar_en_segundo_plano()
+    predictor.registro.cerrar()
+
+    assert isinstance(futuro.exception(), RuntimeError)
+    assert mensajes == ["\n❌ Error al reentrenar: sin datos"]
+    assert predictor.registro.activa is None
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from predictor_fusionado import PredictorFusionado
+from servidor_prediccion import MAX_CUERPO, ServidorPrediccion
+
+PESOS = np.array([100.0, 2000.0, 1500.0, 50.0, 500.0, 1000.0])
+SESGO = 30000.0
+
+async def _peticion(puerto, crudo):
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    writer.write(crudo)
+    await writer.drain()
+    respuesta = await reader.read()
+    writer.close()
+    cabecera, _, cuerpo = respuesta.partition(b"\r\n\r\n")
+    return int(cabecera.split()[1]), json.loads(cuerpo)
+
+def _post(cuerpo, longitud=None):
+    longitud = len(cuerpo) if longitud is None else longitud
+    return (f"POST /predecir HTTP/1.1\r\nContent-Length: {longitud}\r\nConnection: close\r\n\r\n").encode() + cuerpo
+
+async def _con_servidor(peticiones):
+    servidor = ServidorPrediccion(PredictorFusionado(PESOS, SESGO), max_lote=8, max_espera=0.001)
+    servidor.agrupador.iniciar()
+    tcp = await asyncio.start_server(servidor.manejar_conexion, "127.0.0.1", 0)
+    puerto = tcp.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.gather(*[_peticion(puerto, crudo) for crudo in peticiones])
+    finally:
+        tcp.close()
+        await tcp.wait_closed()
+        await servidor.agrupador.detener()
+
+def test_prediccion_con_micro_lotes():
+    filas = [[28, 4, 16, 42, 8, 2], [35, 10, 18, 40, 20, 4], [24, 1, 14, 35, 3, 1]]
+    respuestas = asyncio.run(_con_servidor([_post(json.dumps({"datos": fila}).encode()) for fila in filas]))
+    for (estado, contenido), fila in zip(respuestas, filas):
+        assert estado == 200
+        assert contenido['salario_predicho'] == pytest.approx(float(np.dot(fila, PESOS) + SESGO))
+
+@pytest.mark.parametrize("longitud", ["abc", "-5", "1.5", str(MAX_CUERPO + 1)])
+def test_content_length_invalido_devuelve_400(longitud):
+    [(estado, contenido)] = asyncio.run(_con_servidor([_post(b"", longitud)]))
+    assert estado == 400
+    assert 'error' in contenido
+
+@pytest.mark.parametrize("cuerpo", [b"no es json", b'{"datos": [1, 2, 3]}', b'{"datos": [1, 2, 3, 4, 5, NaN]}',
+                                    b'{"datos": [30, 5, 16, 40, 2.5, 1]}'])
+def test_cuerpo_invalido_devuelve_400(cuerpo):
+    [(estado, _)] = asyncio.run(_con_servidor([_post(cuerpo)]))
+    assert estado == 400
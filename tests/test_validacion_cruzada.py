@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+
+from generate_synthetic_data import generate_synthetic_salary_data
+from prediccion_lote import COLUMNAS_FEATURES
+from validacion_cruzada import validacion_cruzada
+
+def _rmse_pliegues_sklearn(X, y, k, semilla):
+    # Mismos pliegues: tramos consecutivos de la permutación, como KFold sobre los datos barajados
+    permutacion = np.random.default_rng(semilla).permutation(len(y))
+    X, y = X[permutacion], y[permutacion]
+    rmses = []
+    for entrenamiento, prueba in KFold(k).split(X):
+        scaler = StandardScaler().fit(X[entrenamiento])
+        modelo = LinearRegression().fit(scaler.transform(X[entrenamiento]), y[entrenamiento])
+        residuos = y[prueba] - modelo.predict(scaler.transform(X[prueba]))
+        rmses.append(np.sqrt(np.mean(residuos ** 2)))
+    return rmses
+
+def test_pliegues_iguales_a_kfold_con_sklearn():
+    data = generate_synthetic_salary_data(1003)
+    X = data[COLUMNAS_FEATURES].to_numpy(dtype=np.float64)
+    y = data['salario'].to_numpy(dtype=np.float64)
+
+    resultado = validacion_cruzada(X, y, k=4, semilla=7, n_procesos=2, tamano_bloque=100)
+
+    esperados = _rmse_pliegues_sklearn(X, y, 4, 7)
+    np.testing.assert_allclose([m['rmse'] for m in resultado['pliegues']], esperados, rtol=1e-8)
+    assert resultado['media']['rmse'] == pytest.approx(np.mean(esperados))
+
+def test_lee_el_dataset_indicado(tmp_path):
+    data = generate_synthetic_salary_data(500)
+    data['salario'] = data['salario'] * 2
+    ruta = tmp_path / "datos.csv"
+    data.to_csv(ruta, index=False)
+
+    desde_archivo = validacion_cruzada(k=3, ruta_datos=str(ruta), n_procesos=1)
+    sinteticos = validacion_cruzada(k=3, n_samples=500, n_procesos=1)
+    assert desde_archivo['global']['rmse'] == pytest.approx(2 * sinteticos['global']['rmse'], rel=1e-8)
+
+def test_k_invalido():
+    with pytest.raises(ValueError):
+        validacion_cruzada(np.zeros((3, 6)), np.zeros(3), k=5)
+
+def test_experimento_valida_el_dataset_del_run(mlflow_local, tmp_path):
+    from mlflow_regression_example import experimento_mlflow
+
+    data = generate_synthetic_salary_data(400)
+    data['salario'] = data['salario'] * 3
+    ruta = tmp_path / "datos.csv"
+    data.to_csv(ruta, index=False)
+
+    experimento_mlflow(k_pliegues=3, ruta_datos=str(ruta))
+
+    [run] = mlflow_local.search_runs(
+        [mlflow_local.get_experiment_by_name("Prediccion_Salarios_Regresion_Lineal").experiment_id]
+    )
+    esperado = validacion_cruzada(k=3, ruta_datos=str(ruta), semilla=42, n_procesos=1)
+    assert run.data.metrics['cv_rmse_media'] == pytest.approx(esperado['media']['rmse'])
+    assert run.data.params['n_samples_train'] == '320'
+
+def test_dataset_binario_se_mapea_en_los_workers(tmp_path, monkeypatch):
+    import validacion_cruzada as modulo
+    from dataset_binario import cargar_dataset_binario, guardar_dataset_binario
+
+    ruta = str(tmp_path / "datos")
+    guardar_dataset_binario(generate_synthetic_salary_data(700), ruta)
+    data = cargar_dataset_binario(ruta)
+    X = data[COLUMNAS_FEATURES].to_numpy(dtype=np.float64)
+    y = data['salario'].to_numpy(dtype=np.float64)
+    esperado = validacion_cruzada(X, y, k=3, n_procesos=2, tamano_bloque=64)
+
+    def sin_cargar(ruta):
+        raise AssertionError("el proceso principal no debe cargar el dataset binario")
+
+    monkeypatch.setattr(modulo, 'leer_dataset', sin_cargar)
+    resultado = validacion_cruzada(k=3, ruta_datos=ruta, n_procesos=2, tamano_bloque=64)
+
+    np.testing.assert_allclose([m['rmse'] for m in resultado['pliegues']],
+                               [m['rmse'] for m in esperado['pliegues']], rtol=1e-10)
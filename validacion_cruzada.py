@@ -0,0 +1,210 @@
+import argparse
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dataset_binario import abrir_columnas_binario, es_dataset_binario, leer_dataset, leer_esquema
+from datos_compartidos import ArraysCompartidos, abrir_arrays_compartidos
+from entrenamiento_incremental import EstadisticosSuficientes
+from instrumentacion import medir
+from metricas_streaming import AcumuladorMetricas
+from prediccion_lote import COLUMNAS_FEATURES
+from predictor_fusionado import PredictorFusionado
+
+# Filas procesadas a la vez dentro de cada pliegue (acota la memoria de los workers)
+TAMANO_BLOQUE = 1000000
+
+# Arrays compartidos abiertos en cada proceso worker (ver _inicializar_worker)
+_datos_worker = None
+
+def _inicializar_worker(descriptor, ruta_binario=None, columna_objetivo='salario'):
+    global _datos_worker
+    warnings.filterwarnings('ignore')
+    _datos_worker = abrir_arrays_compartidos(descriptor)
+    if ruta_binario is not None:
+        # Dataset binario: cada worker mapea las columnas del disco, sin copias intermedias
+        columnas = abrir_columnas_binario(ruta_binario, mmap=True)
+        _datos_worker['columnas_X'] = [columnas[columna] for columna in COLUMNAS_FEATURES]
+        _datos_worker['y'] = columnas[columna_objetivo]
+
+def _filas_X(indices):
+    if 'X' in _datos_worker:
+        return _datos_worker['X'][indices]
+    columnas = _datos_worker['columnas_X']
+    X = np.empty((len(indices), len(columnas)), dtype=np.float64)
+    for i, columna in enumerate(columnas):
+        X[:, i] = columna[indices]
+    return X
+
+def _bloques_pliegue(pliegue, tamano_bloque):
+    """
+    Recorre las filas de un pliegue en bloques (X, y); las filas de cada pliegue son un
+    tramo contiguo de la permutación compartida
+    """
+    y = _datos_worker['y']
+    indices = _datos_worker['permutacion'][_datos_worker['limites'][pliegue]:_datos_worker['limites'][pliegue + 1]]
+    for inicio in range(0, len(indices), tamano_bloque):
+        # Ordenar los índices del bloque hace el acceso al memmap secuencial
+        bloque = np.sort(indices[inicio:inicio + tamano_bloque])
+        yield _filas_X(bloque), np.asarray(y[bloque], dtype=np.float64)
+
+def _estadisticos_pliegue(pliegue, tamano_bloque):
+    estadisticos = EstadisticosSuficientes(len(COLUMNAS_FEATURES))
+    for X, y in _bloques_pliegue(pliegue, tamano_bloque):
+        estadisticos.actualizar(X, y)
+    return pliegue, estadisticos
+
+def _evaluar_pliegue(pliegue, pesos, sesgo, tamano_bloque, semilla):
+    predictor = PredictorFusionado(pesos, sesgo)
+    # Semilla propia por pliegue: las muestras de residuos se combinan después
+    acumulador = AcumuladorMetricas(semilla=[semilla, pliegue])
+    for X, y in _bloques_pliegue(pliegue, tamano_bloque):
+        acumulador.actualizar(y, predictor.predecir(X))
+    return pliegue, acumulador
+
+def _cargar_matrices(ruta_datos, n_samples, columna_objetivo):
+    if ruta_datos is None:
+        from generate_synthetic_data import generate_synthetic_salary_data
+        data = generate_synthetic_salary_data(n_samples)
+    else:
+        data = leer_dataset(ruta_datos)
+    return data[COLUMNAS_FEATURES].to_numpy(dtype=np.float64), data[columna_objetivo].to_numpy(dtype=np.float64)
+
+@medir("validacion_cruzada.ejecutar")
+def validacion_cruzada(X=None, y=None, k=5, ruta_datos=None, n_samples=1000, semilla=42, n_procesos=None,
+                       tamano_bloque=TAMANO_BLOQUE, columna_objetivo='salario'):
+    """
+    Validación cruzada k-fold de la regresión lineal con pliegues en paralelo
+
+    Las filas se barajan una vez y cada pliegue es un tramo de la permutación. Con un dataset
+    binario (dataset_binario) los workers mapean sus columnas directamente del disco y el
+    proceso principal no las carga; en otro caso X e y se publican con ArraysCompartidos y
+    se suelta la copia en memoria del proceso principal. Los workers no copian los datos.
+
+    En lugar de reajustar k veces sobre (k-1)/k de las filas, cada worker calcula los
+    estadísticos suficientes (EstadisticosSuficientes) de su pliegue y los de entrenamiento
+    del pliegue i se obtienen combinando los de los demás. Cada pliegue tiene así su propio
+    StandardScaler, ajustado solo con sus filas de entrenamiento (sin fuga de datos de test),
+    y el coste total es dos pasadas sobre los datos sea cual sea k.
+
+    Args:
+        X, y: Matriz de features y objetivo; si no se indican se leen de ruta_datos o se
+              generan n_samples filas sintéticas
+        k: Número de pliegues
+
+    Returns:
+        Diccionario con 'pliegues' (métricas de cada pliegue), 'media' y 'desviacion' de cada
+        métrica entre pliegues y 'global' (métricas de todas las predicciones fuera de pliegue)
+    """
+    ruta_binario = None
+    if X is None and ruta_datos is not None and es_dataset_binario(ruta_datos):
+        ruta_binario = ruta_datos
+        n_filas = leer_esquema(ruta_datos)['n_filas']
+        arrays = {}
+    else:
+        if X is None:
+            X, y = _cargar_matrices(ruta_datos, n_samples, columna_objetivo)
+        arrays = {'X': np.asarray(X, dtype=np.float64), 'y': np.asarray(y, dtype=np.float64)}
+        n_filas = len(arrays['y'])
+    if not 2 <= k <= n_filas:
+        raise ValueError(f"k debe estar entre 2 y el número de filas ({n_filas}), no {k}")
+
+    arrays['permutacion'] = np.random.default_rng(semilla).permutation(n_filas)
+    # Como KFold: los primeros n_filas % k pliegues tienen una fila más
+    tamanos = np.full(k, n_filas // k)
+    tamanos[:n_filas % k] += 1
+    arrays['limites'] = np.concatenate([[0], np.cumsum(tamanos)])
+
+    compartidos = ArraysCompartidos(arrays)
+    # Los workers leen la copia compartida: el proceso principal ya no necesita la suya
+    del arrays, X, y
+    with compartidos, ProcessPoolExecutor(
+        max_workers=n_procesos,
+        initializer=_inicializar_worker,
+        initargs=(compartidos.descriptor, ruta_binario, columna_objetivo)
+    ) as pool:
+        # 1. Estadísticos suficientes de cada pliegue (una pasada)
+        estadisticos = dict(
+            futuro.result()
+            for futuro in [pool.submit(_estadisticos_pliegue, i, tamano_bloque) for i in range(k)]
+        )
+
+        # 2. Modelo de cada pliegue con los estadísticos del resto (sin tocar los datos)
+        predictores = []
+        for i in range(k):
+            entrenamiento = EstadisticosSuficientes(len(COLUMNAS_FEATURES))
+            for j in range(k):
+                if j != i:
+                    entrenamiento.combinar(estadisticos[j])
+            modelo, scaler = entrenamiento.construir_modelos()
+            predictores.append(PredictorFusionado.desde_modelos(modelo, scaler))
+
+        # 3. Evaluación de cada pliegue (segunda pasada)
+        acumuladores = dict(
+            futuro.result()
+            for futuro in [
+                pool.submit(_evaluar_pliegue, i, predictores[i].pesos, predictores[i].sesgo, tamano_bloque, semilla)
+                for i in range(k)
+            ]
+        )
+
+    pliegues = [acumuladores[i].metricas() for i in range(k)]
+    acumulado = AcumuladorMetricas(semilla=semilla)
+    for i in range(k):
+        acumulado.combinar(acumuladores[i])
+
+    return {
+        'pliegues': pliegues,
+        'media': {nombre: float(np.mean([m[nombre] for m in pliegues])) for nombre in pliegues[0]},
+        'desviacion': {nombre: float(np.std([m[nombre] for m in pliegues])) for nombre in pliegues[0]},
+        'global': acumulado.metricas()
+    }
+
+def registrar_validacion_cruzada(registro, resultado, k, semilla=42):
+    """
+    Registra en el run las métricas de cada pliegue (cv_<métrica> con step = pliegue) y las
+    agregadas (cv_<métrica>_media, cv_<métrica>_desviacion)
+
+    Args:
+        registro: BufferRegistroMLflow del run (o cualquier objeto con log_params/log_metrics)
+    """
+    registro.log_params({'cv_k': k, 'cv_semilla': semilla})
+    for pliegue, metricas in enumerate(resultado['pliegues']):
+        registro.log_metrics({f"cv_{nombre}": valor for nombre, valor in metricas.items()}, step=pliegue)
+    registro.log_metrics({f"cv_{nombre}_media": valor for nombre, valor in resultado['media'].items()})
+    registro.log_metrics({f"cv_{nombre}_desviacion": valor for nombre, valor in resultado['desviacion'].items()})
+
+def main():
+    parser = argparse.ArgumentParser(description="Validación cruzada k-fold con pliegues en paralelo")
+    parser.add_argument("--k", type=int, default=5, help="Número de pliegues")
+    parser.add_argument("--datos", default=None, help="Dataset (CSV o binario); por defecto datos sintéticos")
+    parser.add_argument("--n-samples", type=int, default=1000, help="Filas sintéticas si no se indica --datos")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos worker (por defecto, todos)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla para barajar las filas")
+    parser.add_argument("--mlflow", action="store_true", help="Registrar las métricas en un run de MLflow")
+    args = parser.parse_args()
+
+    print(f"=== VALIDACIÓN CRUZADA: {args.k} pliegues en {args.procesos or os.cpu_count()} procesos ===")
+    resultado = validacion_cruzada(
+        k=args.k, ruta_datos=args.datos, n_samples=args.n_samples, semilla=args.semilla, n_procesos=args.procesos
+    )
+
+    for pliegue, metricas in enumerate(resultado['pliegues']):
+        print(f"Pliegue {pliegue}: RMSE={metricas['rmse']:.2f} R²={metricas['r2']:.4f}")
+    print(f"\nRMSE: {resultado['media']['rmse']:.2f} ± {resultado['desviacion']['rmse']:.2f}")
+    print(f"R²: {resultado['media']['r2']:.4f} ± {resultado['desviacion']['r2']:.4f}")
+
+    if args.mlflow:
+        import mlflow
+        from registro_buffer import BufferRegistroMLflow
+
+        mlflow.set_experiment("Prediccion_Salarios_Regresion_Lineal")
+        with mlflow.start_run(run_name="validacion_cruzada") as run, \
+                BufferRegistroMLflow(run.info.run_id) as registro:
+            registrar_validacion_cruzada(registro, resultado, args.k, args.semilla)
+        print(f"Run ID: {run.info.run_id}")
+
+if __name__ == "__main__":
+    main()